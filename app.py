@@ -1,187 +1,176 @@
 import tkinter as tk
 from tkinter import Text, messagebox, ttk, simpledialog
 import os
-import requests
+import sys
 import time  # Added for delays
-import pyperclip  # Added for clipboard access
-import pyautogui  # Added for simulating key presses
 from pynput import keyboard  # Added for global hotkey listening
 import threading  # Added for running listener in a separate thread
-from screeninfo import get_monitors  # Added for multi-monitor support
-import win32gui
-import win32con
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import windll, wintypes, byref
 import ctypes
 import base64
-import pystray
-from PIL import Image
-
-class RoundedButton:
-    def __init__(self, parent, text, command, bg_color, hover_color, text_color='white', width=80, height=35, corner_radius=8):
-        self.parent = parent
-        self.text = text
-        self.command = command
-        self.bg_color = bg_color
-        self.hover_color = hover_color
-        self.text_color = text_color
-        self.width = width
-        self.height = height
-        self.corner_radius = corner_radius
-        self.is_hovered = False
-        
-        # Create high-DPI canvas for better quality
-        scale_factor = 2  # 2x resolution for better quality
-        self.scale = scale_factor
-        canvas_width = (width + 4) * scale_factor
-        canvas_height = (height + 4) * scale_factor
-        
-        self.canvas = tk.Canvas(parent, width=width + 4, height=height + 4, 
-                               highlightthickness=0, relief='flat', borderwidth=0)
-        # Try to match parent's transparent background
-        try:
-            self.canvas.configure(bg='black')
-        except:
-            self.canvas.configure(bg=parent.cget('bg'))
-        
-        # Draw the button
-        self.draw_button()
-        
-        # Bind events
-        self.canvas.bind('<Button-1>', self.on_click)
-        self.canvas.bind('<Enter>', self.on_enter)
-        self.canvas.bind('<Leave>', self.on_leave)
-        
-    def draw_button(self):
-        self.canvas.delete("all")
-        
-        # Choose color based on hover state
-        current_color = self.hover_color if self.is_hovered else self.bg_color
-        
-        # Button coordinates (leaving space for shadow)
-        x1, y1 = 2, 2
-        x2, y2 = self.width, self.height
-        r = self.corner_radius
-        
-        # Draw shadow only when not hovered - make it more subtle
-        if not self.is_hovered:
-            shadow_offset = 1
-            sx1, sy1 = x1 + shadow_offset, y1 + shadow_offset
-            sx2, sy2 = x2 + shadow_offset, y2 + shadow_offset
-            shadow_color = '#000000'  # Pure black for better contrast
-            
-            # Shadow rectangles
-            self.canvas.create_rectangle(sx1 + r, sy1, sx2 - r, sy2, fill=shadow_color, outline='', width=0)
-            self.canvas.create_rectangle(sx1, sy1 + r, sx2, sy2 - r, fill=shadow_color, outline='', width=0)
-            
-            # Shadow corners - use smaller radius for tighter shadow
-            shadow_r = r - 1
-            self.canvas.create_oval(sx1, sy1, sx1 + 2*shadow_r, sy1 + 2*shadow_r, fill=shadow_color, outline='', width=0)
-            self.canvas.create_oval(sx2 - 2*shadow_r, sy1, sx2, sy1 + 2*shadow_r, fill=shadow_color, outline='', width=0)
-            self.canvas.create_oval(sx1, sy2 - 2*shadow_r, sx1 + 2*shadow_r, sy2, fill=shadow_color, outline='', width=0)
-            self.canvas.create_oval(sx2 - 2*shadow_r, sy2 - 2*shadow_r, sx2, sy2, fill=shadow_color, outline='', width=0)
-        
-        # Draw main button with anti-aliasing effect using multiple layers
-        # Base layer
-        self.canvas.create_rectangle(x1 + r, y1, x2 - r, y2, fill=current_color, outline='', width=0)
-        self.canvas.create_rectangle(x1, y1 + r, x2, y2 - r, fill=current_color, outline='', width=0)
-        
-        # Perfect rounded corners using ovals
-        self.canvas.create_oval(x1, y1, x1 + 2*r, y1 + 2*r, fill=current_color, outline='', width=0)
-        self.canvas.create_oval(x2 - 2*r, y1, x2, y1 + 2*r, fill=current_color, outline='', width=0)
-        self.canvas.create_oval(x1, y2 - 2*r, x1 + 2*r, y2, fill=current_color, outline='', width=0)
-        self.canvas.create_oval(x2 - 2*r, y2 - 2*r, x2, y2, fill=current_color, outline='', width=0)
-        
-        # Add subtle border for definition
-        border_color = self._darken_color(current_color, 0.2)
-        border_width = 1
-        
-        # Border rectangles
-        self.canvas.create_rectangle(x1 + r, y1, x2 - r, y1 + border_width, fill=border_color, outline='')
-        self.canvas.create_rectangle(x1 + r, y2 - border_width, x2 - r, y2, fill=border_color, outline='')
-        self.canvas.create_rectangle(x1, y1 + r, x1 + border_width, y2 - r, fill=border_color, outline='')
-        self.canvas.create_rectangle(x2 - border_width, y1 + r, x2, y2 - r, fill=border_color, outline='')
-        
-        # Add text with better positioning
-        text_x = (x1 + x2) // 2
-        text_y = (y1 + y2) // 2
-        
-        # Use better font with anti-aliasing
-        self.canvas.create_text(text_x, text_y, text=self.text, 
-                               fill=self.text_color, font=('Segoe UI', 9, 'bold'), anchor='center')
-    
-    def _darken_color(self, color, factor):
-        """Darken a hex color by a given factor"""
-        if color.startswith('#'):
-            color = color[1:]
-        
-        r = int(color[0:2], 16)
-        g = int(color[2:4], 16)
-        b = int(color[4:6], 16)
-        
-        r = max(0, int(r * (1 - factor)))
-        g = max(0, int(g * (1 - factor)))
-        b = max(0, int(b * (1 - factor)))
-        
-        return f"#{r:02x}{g:02x}{b:02x}"
-    
-    def on_click(self, event):
-        if self.command:
-            self.command()
-    
-    def on_enter(self, event):
-        self.is_hovered = True
-        self.draw_button()
-        self.canvas.configure(cursor='hand2')
-    
-    def on_leave(self, event):
-        self.is_hovered = False
-        self.draw_button()
-        self.canvas.configure(cursor='')
-    
-    def pack(self, **kwargs):
-        self.canvas.pack(**kwargs)
+from lazy_import import LazyModule, preload
+from engine import CorrectionEngine
+from correction_cache import default_cache_dir
+from chunking import estimate_tokens
+from latency import LatencyTracker
+from clipboard import capture_copy, default_backend
+from hotkeys import ChordMatcher, key_code, load_bindings
+from log import get_logger, setup_logging, shutdown_logging
+from widgets import RoundedButton
+from monitors import MonitorLayout
+from single_instance import InstanceGuard
+
+log = get_logger(__name__)
+
+# Heavy modules are imported on first use, or by a background preload right after
+# the hotkey listener starts; pystray and PIL are only imported by the tray thread
+pyautogui = LazyModule("pyautogui")  # simulating key presses
+win32gui = LazyModule("win32gui")
+win32con = LazyModule("win32con")
+
+TRAY_ICON_ASSET = "tray_icon.png"
+
+
+def resource_path(*parts):
+    """Path of a bundled resource, also inside a PyInstaller one-file build"""
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, *parts)
+
 
 class TypoFixApp:
-    def __init__(self, root):
+    def __init__(self, root, instance_guard=None):
         self.root = root
+        self.instance_guard = instance_guard
         root.title("TypoFix")
 
         # Embedded API Key (encoded for basic obfuscation)
         self.api_key = self.get_embedded_api_key()
 
         if not self.api_key:
-            print("ERROR: Could not initialize API key.")
+            log.error("Could not initialize API key.")
             messagebox.showerror("Error", "Failed to initialize TypoFix. Please try running as administrator.")
             self.root.quit()
             return
         else:
-            print("TypoFix initialized successfully.")
+            log.info("TypoFix initialized successfully.")
 
         # Hide the main window
         root.withdraw()
 
-        # API Configuration
-        self.gemini_api_base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent"
+        # Per-stage latency histograms for the hotkey-to-paste pipeline
+        self.latency = LatencyTracker()
+        self.hotkey_started = None
+        self.pipeline_mode = ""
+        
+        # --- Hotkey Setup ---
+        # The keyboard listener goes live first; actions wait on self.ready until startup completes
+        self.ready = threading.Event()
+        self.simulating_paste = False
+        # Chords (Ctrl+Alt+T and Shift+C by default) are configurable in hotkeys.json
+        self.hotkeys_path = os.path.join(default_cache_dir(), "hotkeys.json")
+        self.chord_matcher = ChordMatcher(load_bindings(self.hotkeys_path))
+        # The pynput callbacks only enqueue events; matching and the capture pipeline
+        # run on the hotkey worker so the OS keyboard hook never waits on us
+        self.key_events = queue.SimpleQueue()
+        self.hotkey_debounce_seconds = 0.4
+        self.last_hotkey_at = 0.0
+        self.listener_callback_budget_ms = 2
+        self.listener_overruns = 0
+        self.start_hotkey_listener()
+
+        # Clipboard access; captures wait for the clipboard to change instead of sleeping
+        self.clipboard = default_backend()
+        self.clipboard_capture_timeout = 1.0
+        
+        # Detection, Fix and Rewrite (Gemini plus the offline fast paths) live in the
+        # GUI-free engine; its parts are aliased here for the widget code
+        self.engine = CorrectionEngine(self.api_key, latency=self.latency)
+        self.transport = self.engine.transport
+        self.transport.start()
+        self.correction_cache = self.engine.cache
+        self.in_flight = self.engine.in_flight
+        self.local_corrector = self.engine.local_corrector
+        
+        # Opt-in: confident offline corrections of plain typos are pasted without calling Gemini
+        self.local_fix_enabled = False
+        # Larger selections skip the local path and go straight to Gemini
+        self.local_fix_max_tokens = 300
+        
+        # Progressive Fix: paste the local result at once, then offer (or auto-apply)
+        # the Gemini result if it arrives within the budget
+        self.progressive_fix = False
+        self.progressive_auto_swap = False
+        self.progressive_upgrade_budget_seconds = 5
+        self.progressive_versions = None
+        self.progressive_counter = 0
+        self.upgrade_offer = None
+        self.upgrade_offer_timer = None
+        self.upgrade_offer_seconds = 6
         
         # --- Widget and State Management ---
         self.floating_widget = None
         self.text_to_correct_for_widget = None
-        self.simulating_paste = False
         self.selection_rect = None
         self.widget_timeout_timer = None
         self.widget_timeout_seconds = 4
         self.widget_is_hovered = False
         self.original_window_handle = None
+        self.widget_position = None
+        # Monitor topology is enumerated once and refreshed only when displays change
+        self.monitor_layout = MonitorLayout()
+        
+        # --- Background Work ---
+        # Detection and correction run here so the Tk mainloop never blocks on the network
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="typofix-worker")
+        self.request_counter = 0
+        self.active_request_id = None
+        self.active_future = None
+        self.widget_busy = False
+        # The offline dictionary is only compiled/mapped when a local Fix mode is on
+        if self.local_fix_enabled or self.progressive_fix:
+            self._preload_local_corrector()
+        self.executor.submit(self.monitor_layout.monitors)
+        self.preview_width = 420
+        self.preview_max_height = 320
+        
+        # --- Speculative Prefetch (opt-in) ---
+        # Start the Fix request (and optionally Rewrite) as soon as text is captured,
+        # so a click can use a finished or in-flight result
+        self.speculative_prefetch = False
+        self.speculative_rewrite = False
+        self.speculative_futures = {}
+        self.speculative_text = None
+        self.speculation_lock = threading.Lock()
+        self.speculation_stats = {"started": 0, "hits": 0, "wasted": 0, "cancelled": 0}
 
-        # --- System Tray Setup ---
-        self.setup_system_tray()
+        # --- Combined Fix + Rewrite (opt-in) ---
+        # When the widget opens, one JSON request fetches both candidates and the
+        # language, so either button answers without another round trip; off by
+        # default because it is sent even when the user cancels
+        self.combined_prefetch = False
+        self.combined_future = None
+        self.combined_text = None
 
-        # --- Hotkey Setup ---
-        self.hotkey_combination = {keyboard.Key.ctrl, keyboard.Key.alt, keyboard.KeyCode.from_char('t')}  # Ctrl + Alt + T
-        self.shift_c_combination = {keyboard.Key.shift, keyboard.KeyCode.from_char('c')}  # Shift + C
-        self.current_hotkey_keys = set()
-        self.start_hotkey_listener()
-        print(f"TypoFix is ready! Highlight text and press CTRL+ALT+T or SHIFT+C to correct typos or improve clarity.")
+        # The widget is built once here and only shown/hidden per hotkey
+        self.widget_visible = False
+        self._build_floating_widget()
+
+        # --- System Tray Setup ---
+        # Built and run on its own thread so pystray/PIL never delay startup
+        threading.Thread(target=self.setup_system_tray, name="typofix-tray", daemon=True).start()
+        
+        # Load the remaining heavy modules before the first hotkey needs them
+        self.executor.submit(self._preload_modules)
+        
+        # Hotkeys captured while starting up are handled from here on
+        self.ready.set()
+        
+        # Later launches forward their command here instead of starting a second hook
+        if self.instance_guard:
+            self.instance_guard.serve(self.handle_instance_command)
+        log.info("TypoFix is ready! Highlight text and press %s to correct typos or improve clarity.", self._hotkey_names())
 
     def get_embedded_api_key(self):
         """Get the embedded API key"""
@@ -200,7 +189,7 @@ class TypoFixApp:
                 return None
                 
         except Exception as e:
-            print(f"Error decoding API key: {e}")
+            log.warning("Error decoding API key: %s", e)
             messagebox.showerror("Error", "Failed to initialize TypoFix. Please try running as administrator.")
             return None
 
@@ -246,9 +235,9 @@ class TypoFixApp:
                         pass
                         
             except ImportError:
-                print("COM/UI Automation not available, using fallback method")
+                log.debug("COM/UI Automation not available, using fallback method")
             except Exception as e:
-                print(f"UI Automation error: {e}")
+                log.debug("UI Automation error: %s", e)
             
             # Method 2: Enhanced caret position detection
             try:
@@ -260,7 +249,7 @@ class TypoFixApp:
                 if caret_pos and caret_pos != (0, 0):
                     # Convert to screen coordinates
                     screen_pos = win32gui.ClientToScreen(hwnd, caret_pos)
-                    print(f"Got caret position: {screen_pos}")
+                    log.debug("Got caret position: %s", screen_pos)
                     return screen_pos
                 
                 # Method 3: Try to get cursor position from focused window
@@ -277,223 +266,147 @@ class TypoFixApp:
                     window_rect = win32gui.GetWindowRect(hwnd)
                     if (window_rect[0] <= point.x <= window_rect[2] and 
                         window_rect[1] <= point.y <= window_rect[3]):
-                        print(f"Using cursor position inside active window: ({point.x}, {point.y})")
+                        log.debug("Using cursor position inside active window: (%s, %s)", point.x, point.y)
                         return (point.x, point.y)
                 
                 # Method 4: Get approximate position from window center
                 rect = win32gui.GetWindowRect(hwnd)
                 window_center_x = rect[0] + (rect[2] - rect[0]) // 2
                 window_top_area = rect[1] + 100  # Approximate content area
-                print(f"Using window-based approximation: ({window_center_x}, {window_top_area})")
+                log.debug("Using window-based approximation: (%s, %s)", window_center_x, window_top_area)
                 return (window_center_x, window_top_area)
                 
             except Exception as e:
-                print(f"Enhanced position detection error: {e}")
+                log.debug("Enhanced position detection error: %s", e)
             
         except Exception as e:
-            print(f"Could not get text selection position: {e}")
+            log.warning("Could not get text selection position: %s", e)
         
         # Final fallback to mouse position
         mouse_pos = pyautogui.position()
-        print(f"Using mouse position as final fallback: {mouse_pos}")
+        log.debug("Using mouse position as final fallback: %s", mouse_pos)
         return mouse_pos
 
     def start_hotkey_listener(self):
+        worker_thread = threading.Thread(target=self._process_key_events, name="typofix-hotkeys", daemon=True)
+        worker_thread.start()
         listener_thread = threading.Thread(target=self._run_listener, daemon=True)
         listener_thread.start()
 
     def _on_press(self, key):
-        try:
-            # More robust key detection - ignore all keys when simulating actions
-            if hasattr(self, 'simulating_paste') and self.simulating_paste:
-                return
-
-            # Handle Ctrl key detection
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r or key == keyboard.Key.ctrl:
-                self.current_hotkey_keys.add(keyboard.Key.ctrl)
-                print(f"DEBUG: Ctrl key detected and added to set. CurrentSet: {self.current_hotkey_keys}")
-            
-            # Handle Alt key detection
-            elif key == keyboard.Key.alt_l or key == keyboard.Key.alt_r or key == keyboard.Key.alt:
-                self.current_hotkey_keys.add(keyboard.Key.alt)
-                print(f"DEBUG: Alt key detected and added to set. CurrentSet: {self.current_hotkey_keys}")
-            
-            # Handle Shift key detection
-            elif key == keyboard.Key.shift_l or key == keyboard.Key.shift_r or key == keyboard.Key.shift:
-                self.current_hotkey_keys.add(keyboard.Key.shift)
-                print(f"DEBUG: Shift key detected and added to set. CurrentSet: {self.current_hotkey_keys}")
-            
-            # Handle T key detection
-            elif hasattr(key, 'char') and key.char and key.char.lower() == 't':
-                self.current_hotkey_keys.add(keyboard.KeyCode.from_char('t'))
-                print(f"DEBUG: T key detected and added to set. CurrentSet: {self.current_hotkey_keys}")
-            
-            # Handle C key detection
-            elif hasattr(key, 'char') and key.char and key.char.lower() == 'c':
-                self.current_hotkey_keys.add(keyboard.KeyCode.from_char('c'))
-                print(f"DEBUG: C key detected and added to set. CurrentSet: {self.current_hotkey_keys}")
-            
-            # Check if we have the complete hotkey combination (Ctrl + Alt + T) or (Shift + C)
-            if (self.hotkey_combination.issubset(self.current_hotkey_keys) or 
-                self.shift_c_combination.issubset(self.current_hotkey_keys)):
-                combination_name = "Ctrl+Alt+T" if self.hotkey_combination.issubset(self.current_hotkey_keys) else "Shift+C"
-                print(f"DEBUG: {combination_name} hotkey combination DETECTED! CurrentSet: {self.current_hotkey_keys}")
-                self._handle_hotkey_action()
-                
-        except Exception as e:
-            print(f"DEBUG: Error in _on_press: {e}")
+        # Runs on the OS keyboard hook thread: enqueue and return immediately
+        self._enqueue_key_event(True, key)
 
     def _on_release(self, key):
-        try:
-            # Ignore all keys when simulating actions
-            if hasattr(self, 'simulating_paste') and self.simulating_paste:
-                return
+        self._enqueue_key_event(False, key)
 
-            # Handle Ctrl key release
-            if key == keyboard.Key.ctrl_l or key == keyboard.Key.ctrl_r or key == keyboard.Key.ctrl:
-                try:
-                    self.current_hotkey_keys.discard(keyboard.Key.ctrl)
-                    print(f"DEBUG: Ctrl key released. CurrentSet: {self.current_hotkey_keys}")
-                except:
-                    pass
-            
-            # Handle Alt key release
-            elif key == keyboard.Key.alt_l or key == keyboard.Key.alt_r or key == keyboard.Key.alt:
-                try:
-                    self.current_hotkey_keys.discard(keyboard.Key.alt)
-                    print(f"DEBUG: Alt key released. CurrentSet: {self.current_hotkey_keys}")
-                except:
-                    pass
-            
-            # Handle Shift key release
-            elif key == keyboard.Key.shift_l or key == keyboard.Key.shift_r or key == keyboard.Key.shift:
-                try:
-                    self.current_hotkey_keys.discard(keyboard.Key.shift)
-                    print(f"DEBUG: Shift key released. CurrentSet: {self.current_hotkey_keys}")
-                except:
-                    pass
-            
-            # Handle T key release
-            elif hasattr(key, 'char') and key.char and key.char.lower() == 't':
-                try:
-                    self.current_hotkey_keys.discard(keyboard.KeyCode.from_char('t'))
-                    print(f"DEBUG: T key released. CurrentSet: {self.current_hotkey_keys}")
-                except:
-                    pass
-            
-            # Handle C key release
-            elif hasattr(key, 'char') and key.char and key.char.lower() == 'c':
-                try:
-                    self.current_hotkey_keys.discard(keyboard.KeyCode.from_char('c'))
-                    print(f"DEBUG: C key released. CurrentSet: {self.current_hotkey_keys}")
-                except:
-                    pass
-                    
-        except Exception as e:
-            print(f"DEBUG: Error in _on_release: {e}")
+    def _enqueue_key_event(self, pressed, key):
+        started = time.perf_counter_ns()
+        # Ignore our own simulated Ctrl+C / Ctrl+V
+        if self.simulating_paste:
+            return
+        self.key_events.put((pressed, key_code(key)))
+        elapsed = time.perf_counter_ns() - started
+        self.latency.record_ns("listener_callback", elapsed)
+        if elapsed > self.listener_callback_budget_ms * 1_000_000:
+            # Reported by the worker so the hook thread never formats or prints
+            self.key_events.put(("overrun", elapsed))
+
+    def _process_key_events(self):
+        """Hotkey worker: track pressed keys, debounce matches and run the capture pipeline"""
+        while True:
+            pressed, code = self.key_events.get()
+            try:
+                if pressed == "overrun":
+                    self.listener_overruns += 1
+                    log.warning("Keyboard hook callback took %.2f ms (budget %s ms, %s overruns)", code / 1e6, self.listener_callback_budget_ms, self.listener_overruns)
+                elif not pressed:
+                    self.chord_matcher.release(code)
+                else:
+                    action = self.chord_matcher.press(code)
+                    if action is None:
+                        continue
+                    now = time.monotonic()
+                    if now - self.last_hotkey_at < self.hotkey_debounce_seconds:
+                        continue
+                    self.last_hotkey_at = now
+                    self.ready.wait()
+                    self._handle_hotkey_action(action)
+                    # Key repeats queued while the capture ran are stale
+                    self.last_hotkey_at = time.monotonic()
+            except Exception as e:
+                log.warning("Error handling key event: %s", e)
+
+    def _hotkey_names(self):
+        """Configured chords for display, e.g. 'CTRL+ALT+T or SHIFT+C'"""
+        return " or ".join(chord.upper() for chord in self.chord_matcher.chords())
 
     def _run_listener(self):
         with keyboard.Listener(on_press=self._on_press, on_release=self._on_release) as listener:
             listener.join()
 
-    def _handle_hotkey_action(self):
-        print("Hotkey detected (Ctrl+Alt+T or Shift+C)!") 
-        if self.floating_widget: # Prevent multiple widgets if one exists
-            print("INFO: Widget already exists. Ignoring hotkey.")
-            self.current_hotkey_keys.clear()
+    def _handle_hotkey_action(self, action="widget"):
+        log.info("Hotkey detected (%s)!", action)
+        if self.widget_visible: # Prevent multiple widgets if one exists
+            log.info("Widget already exists. Ignoring hotkey.")
+            self.chord_matcher.reset()
             return
         
+        self.hotkey_started = time.perf_counter()
         try:
             # Capture the original window handle BEFORE we do anything else
             try:
                 self.original_window_handle = win32gui.GetForegroundWindow()
-                print(f"DEBUG: Captured original window handle: {self.original_window_handle}")
+                log.debug("Captured original window handle: %s", self.original_window_handle)
             except Exception as e:
-                print(f"DEBUG: Could not capture original window: {e}")
+                log.warning("Could not capture original window: %s", e)
                 self.original_window_handle = None
             
             # Get text selection position first
-            self.selection_rect = self.get_text_selection_position()
+            with self.latency.span("selection_position"):
+                self.selection_rect = self.get_text_selection_position()
             
-            # Simulate Ctrl+C to copy any selected text
-            print("Simulating Ctrl+C to copy selected text...")
-            self.simulating_paste = True  # Prevent our listener from interfering
-            pyautogui.hotkey('ctrl', 'c')
-            self.simulating_paste = False
+            # Simulate Ctrl+C and read the clipboard as soon as the copy lands
+            log.debug("Simulating Ctrl+C to copy selected text...")
             
-            # Wait for clipboard to update
-            time.sleep(0.3) 
-            copied_text = pyperclip.paste()
+            def send_copy():
+                with self.latency.span("copy_hotkey"):
+                    self.simulating_paste = True  # Prevent our listener from interfering
+                    pyautogui.hotkey('ctrl', 'c')
+                    self.simulating_paste = False
+            
+            with self.latency.span("clipboard_wait"):
+                copied_text, changed = capture_copy(self.clipboard, send_copy,
+                                                    self.clipboard_capture_timeout)
+            if not changed:
+                log.debug("Clipboard did not change before the deadline, using its current content")
             
             if copied_text and copied_text.strip():
-                print(f"Captured text from clipboard: '{copied_text}'")
+                log.debug("Captured text from clipboard: '%s'", copied_text)
                 self.text_to_correct_for_widget = copied_text
-                self.root.after(0, self._show_floating_correction_widget)
+                if self.speculative_prefetch:
+                    self._start_speculation(copied_text)
+                if action == "fix":
+                    self.root.after(0, self._fix_and_paste)
+                elif action == "rewrite":
+                    self.root.after(0, self._rewrite_and_paste)
+                else:
+                    self.root.after(0, self._show_floating_correction_widget)
             else:
-                print("No text found on clipboard - please highlight text first.")
+                log.info("No text found on clipboard - please highlight text first.")
 
         except Exception as e:
-            print(f"Error in hotkey action: {e}")
+            log.warning("Error in hotkey action: %s", e)
         
-        self.root.after(50, self.current_hotkey_keys.clear)
+        # Releases of the simulated Ctrl+C were dropped, so start from a clean key set
+        self.chord_matcher.reset()
 
-    def _show_floating_correction_widget(self):
-        print("DEBUG: _show_floating_correction_widget called")
-        
-        # Destroy any existing widget
-        if self.floating_widget and self.floating_widget.winfo_exists():
-            self.floating_widget.destroy()
-        
-        # Create a new Toplevel window (now with 3 buttons)
+    def _build_floating_widget(self):
+        """Create the widget window and its buttons once; hotkeys only move and show it"""
         self.floating_widget = tk.Toplevel(self.root)
+        self.floating_widget.withdraw()
         self.floating_widget.title("")  # No title for minimal look
         
-        # Widget dimensions - wider to accommodate 3 buttons
-        widget_width = 280  # Wider for three buttons
-        widget_height = 50   # Same height
-        
-        # Use text selection position instead of mouse position
-        if self.selection_rect:
-            base_x, base_y = self.selection_rect
-            print(f"Using detected selection position: ({base_x}, {base_y})")
-        else:
-            base_x, base_y = pyautogui.position()
-            print(f"No selection detected, using mouse position: ({base_x}, {base_y})")
-        
-        # Position widget above the selected text with better logic
-        pos_x = base_x - widget_width // 2  # Center horizontally on selection
-        pos_y = base_y - widget_height - 20  # Position above the selection with more space
-        
-        # Keep widget on screen with improved bounds checking
-        monitors = get_monitors()
-        active_monitor = monitors[0]  # Default to primary
-        for m in monitors:
-            if m.x <= base_x < m.x + m.width and m.y <= base_y < m.y + m.height:
-                active_monitor = m
-                break
-        
-        print(f"Active monitor: {active_monitor.x}, {active_monitor.y}, {active_monitor.width}x{active_monitor.height}")
-        
-        # Adjust position to keep widget fully on screen
-        if pos_x + widget_width > active_monitor.x + active_monitor.width:
-            pos_x = active_monitor.x + active_monitor.width - widget_width - 10
-            print("Adjusted X position to fit on screen (right edge)")
-        if pos_x < active_monitor.x:
-            pos_x = active_monitor.x + 10
-            print("Adjusted X position to fit on screen (left edge)")
-        
-        # For Y position, if there's no room above, show below
-        if pos_y < active_monitor.y + 10:
-            pos_y = base_y + 25  # Show below selection if no room above
-            print("Not enough room above, showing below selection")
-        
-        # Final bounds check for Y
-        if pos_y + widget_height > active_monitor.y + active_monitor.height:
-            pos_y = active_monitor.y + active_monitor.height - widget_height - 10
-            print("Adjusted Y position to fit on screen (bottom edge)")
-        
-        self.floating_widget.geometry(f"{widget_width}x{widget_height}+{pos_x}+{pos_y}")
-        
         # Minimal widget styling - transparent background
         self.floating_widget.configure(bg='black')  # Will be made transparent
         self.floating_widget.attributes('-topmost', True)  # Keep on top
@@ -557,136 +470,575 @@ class TypoFixApp:
         )
         self.cancel_button.pack(side='left')
         
-        print(f"DEBUG: Widget with 3 buttons created at ({pos_x}, {pos_y}) with size ({widget_width}, {widget_height})")
-        
-        # Bring to front and focus
-        self.floating_widget.lift()
-        self.floating_widget.focus_force()
+        # Streaming preview, packed only while a response is arriving
+        self.preview_label = tk.Label(
+            self.floating_widget,
+            text="",
+            bg='#1e1e1e',
+            fg='white',
+            font=('Segoe UI', 9),
+            justify='left',
+            anchor='nw',
+            wraplength=self.preview_width - 20,
+            padx=8,
+            pady=6,
+        )
+        self.preview_visible = False
         
         # Bind mouse enter/leave events for hover detection
         self.floating_widget.bind('<Enter>', lambda e: self._on_widget_enter())
         self.floating_widget.bind('<Leave>', lambda e: self._on_widget_leave())
         button_frame.bind('<Enter>', lambda e: self._on_widget_enter())
         button_frame.bind('<Leave>', lambda e: self._on_widget_leave())
+        log.debug("Floating widget built")
+
+    def _reset_widget(self):
+        """Return the widget to its idle look: compact, buttons enabled, no preview"""
+        self.fix_button.reset("✓ Fix")
+        self.rewrite_button.reset("📝 Rewrite")
+        self.cancel_button.reset()
+        self.floating_widget.configure(cursor='')
+        if self.preview_visible:
+            self.preview_label.pack_forget()
+            self.preview_label.configure(text="")
+            self.preview_visible = False
+
+    def _hide_widget(self):
+        """Hide the widget and clear per-use state; the window itself is kept for reuse"""
+        if self.widget_visible:
+            self.floating_widget.withdraw()
+            self.widget_visible = False
+            self._reset_widget()
+        self.widget_is_hovered = False
+        self.original_window_handle = None
+
+    def _show_floating_correction_widget(self):
+        log.debug("_show_floating_correction_widget called")
+        show_started = time.perf_counter()
+        
+        # Fetch both candidates now so Fix and Rewrite are instant when clicked
+        if self.combined_prefetch:
+            self._start_combined_request(self.text_to_correct_for_widget)
+        
+        # Widget dimensions - wider to accommodate 3 buttons
+        widget_width = 280  # Wider for three buttons
+        widget_height = 50   # Same height
+        
+        # Use text selection position instead of mouse position
+        if self.selection_rect:
+            base_x, base_y = self.selection_rect
+            log.debug("Using detected selection position: (%s, %s)", base_x, base_y)
+        else:
+            base_x, base_y = pyautogui.position()
+            log.debug("No selection detected, using mouse position: (%s, %s)", base_x, base_y)
+        
+        # Position widget above the selected text, kept inside the active monitor's work area
+        pos_x, pos_y = self.monitor_layout.place(base_x, base_y, widget_width, widget_height)
+        
+        self._reset_widget()
+        self.floating_widget.geometry(f"{widget_width}x{widget_height}+{pos_x}+{pos_y}")
+        self.widget_position = (pos_x, pos_y)
+        
+        # Bring to front and focus
+        self.floating_widget.deiconify()
+        self.floating_widget.lift()
+        self.floating_widget.focus_force()
+        self.widget_visible = True
+        log.debug("Widget shown at (%s, %s) with size (%s, %s)", pos_x, pos_y, widget_width, widget_height)
         
         # Start the auto-close timer (will only start if not hovered)
         self._start_widget_timer()
+        
+        self.latency.record("widget_show", time.perf_counter() - show_started)
+        if self.hotkey_started is not None:
+            self.latency.record("hotkey_to_widget", time.perf_counter() - self.hotkey_started)
 
     def _fix_and_paste(self):
         """Handle the Fix button click"""
-        print("DEBUG: _fix_and_paste() called!")
+        log.debug("_fix_and_paste() called!")
         
         # Stop the timer immediately when button is clicked
         self._stop_widget_timer()
         
         text_to_correct = self.text_to_correct_for_widget
-        print(f"DEBUG: Text to correct: '{text_to_correct}' (length: {len(text_to_correct) if text_to_correct else 0})")
+        log.debug("Text to correct: '%s' (length: %s)", text_to_correct, len(text_to_correct) if text_to_correct else 0)
         
         if not text_to_correct or not text_to_correct.strip():
-            print("DEBUG: No text to correct")
+            log.debug("No text to correct")
             self._cancel_widget()
             return
 
-        print("DEBUG: Processing text correction...")
+        log.debug("Processing text correction...")
         
-        # Call Gemini API for typo fixing
-        corrected_text = self._call_gemini_api_fix(text_to_correct)
-        print(f"DEBUG: API returned corrected text: '{corrected_text}'")
-
-        if corrected_text and corrected_text.strip():
-            print(f"DEBUG: Corrected text: '{corrected_text}'")
-            
-            # Copy corrected text to clipboard
-            try:
-            pyperclip.copy(corrected_text)
-            print("DEBUG: Corrected text copied to clipboard.")
-            
-            # Verify clipboard
-            new_clipboard = pyperclip.paste()
-            print(f"DEBUG: New clipboard content: '{new_clipboard}'")
-            
-            # Close widget and paste
-            self._close_and_paste()
-            except Exception as e:
-                print(f"DEBUG: Error copying to clipboard: {e}")
-                self._cancel_widget()
-        else:
-            print("DEBUG: Failed to correct text - API returned None/empty")
-            self._cancel_widget()
+        # A Gemini answer that has already arrived beats any offline guess
+        ready_text = self._ready_combined_result("fix", text_to_correct)
+        if ready_text is not None and not self.widget_busy:
+            self._paste_result("fix", ready_text)
+            return
+        
+        # Progressive mode (local result now, Gemini's version offered when it arrives)
+        # or instant offline fix: the local candidate is computed on the worker pool
+        if (self.progressive_fix or self.local_fix_enabled) and not self.widget_busy:
+            if self._start_local_fix(text_to_correct):
+                return
+        
+        # Call Gemini API for typo fixing on a worker thread
+        self._submit_correction("fix", self.engine.fix, text_to_correct)
 
     def _rewrite_and_paste(self):
         """Handle the Rewrite button click"""
-        print("DEBUG: _rewrite_and_paste() called!")
+        log.debug("_rewrite_and_paste() called!")
         
         # Stop the timer immediately when button is clicked
         self._stop_widget_timer()
         
         text_to_rewrite = self.text_to_correct_for_widget
-        print(f"DEBUG: Text to rewrite: '{text_to_rewrite}' (length: {len(text_to_rewrite) if text_to_rewrite else 0})")
+        log.debug("Text to rewrite: '%s' (length: %s)", text_to_rewrite, len(text_to_rewrite) if text_to_rewrite else 0)
         
         if not text_to_rewrite or not text_to_rewrite.strip():
-            print("DEBUG: No text to rewrite")
+            log.debug("No text to rewrite")
             self._cancel_widget()
             return
 
-        print("DEBUG: Processing text rewriting for clarity...")
+        log.debug("Processing text rewriting for clarity...")
         
-        # Call Gemini API for rewriting
-        rewritten_text = self._call_gemini_api_rewrite(text_to_rewrite)
-        print(f"DEBUG: API returned rewritten text: '{rewritten_text}'")
+        # Call Gemini API for rewriting on a worker thread
+        self._submit_correction("rewrite", self.engine.rewrite, text_to_rewrite)
 
-        if rewritten_text and rewritten_text.strip():
-            print(f"DEBUG: Rewritten text: '{rewritten_text}'")
-            
-            # Copy rewritten text to clipboard
+    def _start_local_fix(self, text):
+        """
+        Compute the offline candidate on the worker pool; False if the local path doesn't apply.
+
+        Large selections and a dictionary that is still being compiled go straight to
+        Gemini, so a click never waits on the local corrector.
+        """
+        if estimate_tokens(text) > self.local_fix_max_tokens:
+            log.debug("Selection too large for the local fix, asking Gemini")
+            return False
+        if not self.local_corrector.ready("English"):
+            log.debug("Offline dictionary not loaded yet, asking Gemini")
+            return False
+        
+        self.request_counter += 1
+        request_id = self.request_counter
+        self.active_request_id = request_id
+        self._set_widget_busy("fix")
+        started = time.perf_counter()
+        
+        def local_candidate():
             try:
-            pyperclip.copy(rewritten_text)
-            print("DEBUG: Rewritten text copied to clipboard.")
-            
-            # Verify clipboard
-            new_clipboard = pyperclip.paste()
-            print(f"DEBUG: New clipboard content: '{new_clipboard}'")
-            
-            # Close widget and paste
-            self._close_and_paste()
+                return self.engine.local_fix_candidate(text)
+            finally:
+                self.latency.record("local_fix", time.perf_counter() - started, "fix")
+        
+        future = self.executor.submit(local_candidate)
+        self.active_future = future
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_local_candidate, request_id, text, f)
+        )
+        return True
+
+    def _on_local_candidate(self, request_id, text, future):
+        """Paste a confident local candidate, or send the text to Gemini (runs on the Tk thread)"""
+        if request_id != self.active_request_id:
+            log.debug("Discarding stale local candidate for request #%s", request_id)
+            return
+        self.active_request_id = None
+        self.active_future = None
+        self.widget_busy = False
+        
+        try:
+            local_text, confidence = future.result()
+        except Exception as e:
+            log.warning("Local correction failed: %s", e)
+            local_text, confidence = None, 0.0
+        if local_text is None or confidence < self.local_corrector.confidence_threshold:
+            # A doubtful local guess could stay in the document if a progressive upgrade
+            # never lands, so it goes through the normal Gemini path instead
+            log.debug("Local candidate not used (confidence %.2f), asking Gemini", confidence)
+            self._submit_correction("fix", self.engine.fix, text)
+            return
+        
+        if self.progressive_fix:
+            self._start_progressive_fix(text, local_text)
+        else:
+            log.debug("Using local correction: '%s'", local_text)
+            self._paste_result("fix", local_text)
+
+    def _start_progressive_fix(self, text, local_text):
+        """Paste the confident local correction now and fetch the Gemini version in the background"""
+        self.progressive_counter += 1
+        token = self.progressive_counter
+        self.progressive_versions = {
+            "token": token,
+            "original": text,
+            "local": local_text,
+            "cloud": None,
+            "window": self.original_window_handle,
+            "started": time.monotonic(),
+        }
+        log.debug("Progressive fix #%s: pasting local result, upgrading from Gemini", token)
+        
+        future = self.executor.submit(self.engine.fix, text)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_progressive_upgrade, token, f)
+        )
+        self._paste_result("fix", local_text)
+
+    def _on_progressive_upgrade(self, token, future):
+        """Offer or apply the Gemini result for a progressive fix (runs on the Tk thread)"""
+        versions = self.progressive_versions
+        if not versions or versions["token"] != token:
+            return
+        
+        elapsed = time.monotonic() - versions["started"]
+        if elapsed > self.progressive_upgrade_budget_seconds:
+            log.debug("Gemini upgrade arrived after %.1fs (budget %ss), keeping local result", elapsed, self.progressive_upgrade_budget_seconds)
+            return
+        try:
+            cloud_text = None if future.cancelled() else future.result()
+        except Exception as e:
+            log.warning("Progressive upgrade failed: %s", e)
+            cloud_text = None
+        if not cloud_text or not cloud_text.strip() or cloud_text == versions["local"]:
+            log.debug("Gemini agrees with the local fix, nothing to upgrade")
+            return
+        
+        versions["cloud"] = cloud_text
+        log.debug("Gemini upgrade ready after %.1fs: '%s'", elapsed, cloud_text)
+        if self.progressive_auto_swap:
+            self._swap_in_cloud_result()
+        else:
+            self._show_upgrade_offer()
+
+    def _show_upgrade_offer(self):
+        """Show a small prompt offering to replace the pasted local fix with Gemini's"""
+        self._close_upgrade_offer()
+        if self.widget_visible:
+            return  # a new hotkey is already in progress
+        
+        offer = tk.Toplevel(self.root)
+        offer.overrideredirect(True)
+        offer.attributes('-topmost', True)
+        offer.configure(bg='black')
+        try:
+            offer.wm_attributes('-transparentcolor', 'black')
+        except:
+            offer.configure(bg='#1a1a1a')
+        x, y = self.widget_position or self.root.winfo_pointerxy()
+        offer.geometry(f"130x50+{x}+{y}")
+        
+        button = RoundedButton(
+            offer,
+            text="✨ Use AI fix",
+            command=self._swap_in_cloud_result,
+            bg_color='#8e44ad',  # Purple
+            hover_color='#9b59b6',
+            text_color='white',
+            width=110,
+            height=35,
+            corner_radius=8
+        )
+        button.pack(padx=5, pady=5)
+        
+        self.upgrade_offer = offer
+        self.upgrade_offer_timer = self.root.after(
+            self.upgrade_offer_seconds * 1000, self._close_upgrade_offer
+        )
+
+    def _close_upgrade_offer(self):
+        if self.upgrade_offer_timer:
+            self.root.after_cancel(self.upgrade_offer_timer)
+            self.upgrade_offer_timer = None
+        if self.upgrade_offer and self.upgrade_offer.winfo_exists():
+            self.upgrade_offer.destroy()
+        self.upgrade_offer = None
+
+    def _swap_in_cloud_result(self):
+        """Undo the local paste and paste the Gemini version; both are already in memory"""
+        self._close_upgrade_offer()
+        versions = self.progressive_versions
+        if not versions or not versions["cloud"]:
+            return
+        
+        log.debug("Swapping local fix for the Gemini version")
+        self.simulating_paste = True
+        try:
+            window = versions["window"]
+            if window and win32gui.IsWindow(window) and win32gui.GetForegroundWindow() != window:
+                win32gui.SetForegroundWindow(window)
+                time.sleep(0.1)
+            # Undo restores the original selection, so the paste replaces it again
+            pyautogui.hotkey('ctrl', 'z')
+            self.clipboard.write(versions["cloud"])
+            pyautogui.hotkey('ctrl', 'v')
+        except Exception as e:
+            log.warning("Error swapping in Gemini result: %s", e)
+        finally:
+            self.simulating_paste = False
+        self.progressive_versions = None
+
+    def _submit_correction(self, mode, api_call, text):
+        """Run an API call on the worker pool and deliver its result on the Tk thread"""
+        if self.widget_busy:
+            log.debug("A request is already running for this widget, ignoring %s", mode)
+            return
+        
+        self.request_counter += 1
+        request_id = self.request_counter
+        self.active_request_id = request_id
+        self._set_widget_busy(mode)
+        
+        future = self._take_speculative_future(mode, text)
+        if future is None:
+            on_partial = lambda partial: self.root.after(0, self._update_stream_preview, request_id, partial)
+            api_call = self._combined_call(mode, api_call, text) or api_call
+            future = self.executor.submit(api_call, text, on_partial)
+        self.active_future = future
+        # The done-callback runs on the worker thread; hop back onto Tk with root.after
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_correction_done, request_id, mode, f)
+        )
+        log.debug("Submitted %s request #%s to worker pool", mode, request_id)
+
+    def _on_correction_done(self, request_id, mode, future):
+        """Handle a finished API call (runs on the Tk thread)"""
+        if request_id != self.active_request_id:
+            log.debug("Discarding stale %s result for request #%s", mode, request_id)
+            return
+        self.active_request_id = None
+        self.active_future = None
+        self.widget_busy = False
+        
+        if future.cancelled():
+            log.debug("%s request #%s was cancelled", mode, request_id)
+            return
+        
+        try:
+            result_text = future.result()
+        except Exception as e:
+            log.warning("Unexpected error in %s worker: %s", mode, e)
+            result_text = None
+        log.debug("API returned %s text: '%s'", mode, result_text)
+        self._paste_result(mode, result_text)
+
+    def _paste_result(self, mode, result_text):
+        """Copy a finished result to the clipboard and paste it, or close the widget on failure"""
+        self.pipeline_mode = mode
+        if result_text and result_text.strip():
+            # Copy result to clipboard
+            try:
+                self.clipboard.write(result_text)
+                log.debug("%s text copied to clipboard.", mode.capitalize())
+                
+                # Close widget and paste
+                self._close_and_paste()
             except Exception as e:
-                print(f"DEBUG: Error copying to clipboard: {e}")
+                log.warning("Error copying to clipboard: %s", e)
                 self._cancel_widget()
         else:
-            print("DEBUG: Failed to rewrite text - API returned None/empty")
+            log.warning("Failed to %s text - API returned None/empty", mode)
             self._cancel_widget()
 
+    def _set_widget_busy(self, mode):
+        """Show a busy state on the widget while a request is in flight"""
+        self.widget_busy = True
+        self._stop_widget_timer()
+        if not self.widget_visible:
+            return
+        busy_button = self.fix_button if mode == "fix" else self.rewrite_button
+        busy_button.set_text("⏳ Working")
+        self.fix_button.set_enabled(False)
+        self.rewrite_button.set_enabled(False)
+        self.floating_widget.configure(cursor='watch')
+
+    def _start_speculation(self, text):
+        """Submit speculative Fix (and optionally Rewrite) requests for freshly captured text"""
+        self._cancel_speculation()
+        modes = [("fix", self.engine.fix)]
+        if self.speculative_rewrite:
+            modes.append(("rewrite", self.engine.rewrite))
+        with self.speculation_lock:
+            self.speculative_text = text
+            for mode, api_call in modes:
+                self.speculative_futures[mode] = self.executor.submit(api_call, text)
+                self.speculation_stats["started"] += 1
+        log.debug("Speculatively started %s for captured text", ', '.join(mode for mode, _ in modes))
+
+    def _take_speculative_future(self, mode, text):
+        """Claim the speculative future for this mode if it was started for the same text"""
+        with self.speculation_lock:
+            if self.speculative_text != text:
+                return None
+            future = self.speculative_futures.pop(mode, None)
+            if future is not None:
+                self.speculation_stats["hits"] += 1
+                state = "finished" if future.done() else "in flight"
+                log.debug("Using speculative %s result (%s)", mode, state)
+            return future
+
+    def _cancel_speculation(self):
+        """Cancel unclaimed speculative work, counting calls that already hit the network"""
+        with self.speculation_lock:
+            futures = list(self.speculative_futures.values())
+            self.speculative_futures = {}
+            self.speculative_text = None
+            for future in futures:
+                if future.cancel():
+                    self.speculation_stats["cancelled"] += 1
+                else:
+                    # Already running or done: the API call was made for nothing
+                    self.speculation_stats["wasted"] += 1
+        if futures:
+            log.debug("Speculation stats: %s", self.speculation_summary())
+
+    def speculation_summary(self):
+        """Human-readable speculation hit rate and waste counters"""
+        stats = self.speculation_stats
+        started = stats["started"]
+        hit_rate = stats["hits"] / started if started else 0.0
+        return (f"{stats['hits']}/{started} used ({hit_rate:.0%} hit rate), "
+                f"{stats['wasted']} wasted calls, {stats['cancelled']} cancelled before sending")
+
+    def toggle_speculative_prefetch(self):
+        """Tray toggle for speculative prefetch"""
+        self.speculative_prefetch = not self.speculative_prefetch
+        if not self.speculative_prefetch:
+            self._cancel_speculation()
+        log.info("Speculative prefetch %s.", 'enabled' if self.speculative_prefetch else 'disabled')
+
+    def _start_combined_request(self, text):
+        """Submit one request for both the Fix and Rewrite candidates of the captured text"""
+        self._cancel_combined_request()
+        if not text or not text.strip() or estimate_tokens(text) > self.engine.chunk_max_tokens:
+            return  # Large selections keep the chunked per-button requests
+        self.combined_text = text
+        self.combined_future = self.executor.submit(self.engine.fix_and_rewrite, text)
+
+    def _cancel_combined_request(self):
+        """Drop the combined request (cancelled if it hasn't started yet)"""
+        if self.combined_future is not None:
+            self.combined_future.cancel()
+        self.combined_future = None
+        self.combined_text = None
+
+    def _combined_call(self, mode, api_call, text):
+        """
+        Wrap api_call so it answers from the combined request for this text.
+
+        Falls back to api_call when the combined request failed or was not made.
+        """
+        combined_future = self.combined_future
+        if combined_future is None or self.combined_text != text:
+            return None
+
+        def answer(text, on_partial=None):
+            try:
+                candidates = combined_future.result()
+            except Exception as e:
+                log.debug("Combined request unavailable: %s", e)
+                candidates = None
+            if candidates and candidates.get(mode):
+                log.debug("Answering %s from the combined request", mode)
+                return candidates[mode]
+            return api_call(text, on_partial)
+        return answer
+
+    def _ready_combined_result(self, mode, text):
+        """The combined request's answer for text if it has already arrived, else None"""
+        combined_future = self.combined_future
+        if (combined_future is None or self.combined_text != text or not combined_future.done()
+                or combined_future.cancelled() or combined_future.exception() is not None):
+            return None
+        candidates = combined_future.result()
+        return candidates.get(mode) if candidates else None
+
+    def toggle_combined_prefetch(self):
+        """Tray toggle for the combined Fix + Rewrite request"""
+        self.combined_prefetch = not self.combined_prefetch
+        if not self.combined_prefetch:
+            self._cancel_combined_request()
+        log.info("Combined Fix + Rewrite request %s.", 'enabled' if self.combined_prefetch else 'disabled')
+
+    def _update_stream_preview(self, request_id, partial_text):
+        """Show streamed text as it grows in an expanded widget (runs on the Tk thread)"""
+        if request_id != self.active_request_id:
+            return
+        if not self.widget_visible:
+            return
+        
+        if not self.preview_visible:
+            self.preview_label.pack(side='top', fill='x', padx=5, pady=(0, 5))
+            self.preview_visible = True
+        
+        # Only the tail is shown for long rewrites
+        if len(partial_text) > 600:
+            partial_text = "…" + partial_text[-600:]
+        self.preview_label.configure(text=partial_text)
+        
+        # Grow the widget to fit the preview, anchored at its current position
+        self.floating_widget.update_idletasks()
+        height = min(50 + self.preview_label.winfo_reqheight() + 5, self.preview_max_height)
+        x, y = self.floating_widget.winfo_x(), self.floating_widget.winfo_y()
+        self.floating_widget.geometry(f"{self.preview_width}x{height}+{x}+{y}")
+
+    def _preload_local_corrector(self):
+        """Compile/map the offline dictionary in the background ahead of the first local Fix"""
+        self.executor.submit(self.local_corrector.preload, "English")
+
+    def toggle_local_fix(self):
+        """Tray toggle for pasting confident offline corrections without calling Gemini"""
+        self.local_fix_enabled = not self.local_fix_enabled
+        if self.local_fix_enabled:
+            self._preload_local_corrector()
+        log.info("Instant offline fix %s.", 'enabled' if self.local_fix_enabled else 'disabled')
+
+    def toggle_progressive_fix(self):
+        """Tray toggle for progressive (local first, Gemini upgrade) Fix"""
+        self.progressive_fix = not self.progressive_fix
+        if self.progressive_fix:
+            self._preload_local_corrector()
+        log.info("Progressive fix %s.", 'enabled' if self.progressive_fix else 'disabled')
+
+    def _discard_active_request(self):
+        """Forget the in-flight request so its result is ignored when it arrives"""
+        if self.active_future is not None:
+            self.active_future.cancel()  # only succeeds if it hasn't started yet
+        self.active_future = None
+        self.active_request_id = None
+        self.widget_busy = False
+
     def _close_and_paste(self):
         """Close widget and simulate paste"""
-        print("DEBUG: _close_and_paste() called!")
+        log.debug("_close_and_paste() called!")
         
         self._stop_widget_timer()
-        if self.floating_widget:
-            print("DEBUG: Destroying widget")
-            self.floating_widget.destroy()
-            self.floating_widget = None
-        self.widget_is_hovered = False
-        self.original_window_handle = None
+        self._discard_active_request()
+        self._cancel_speculation()
+        self._cancel_combined_request()
+        log.debug("Hiding widget")
+        self._hide_widget()
         
         # Add a longer delay and better focus handling
-        print("DEBUG: Starting paste simulation")
+        log.debug("Starting paste simulation")
+        paste_started = time.perf_counter()
         self.simulating_paste = True
         try:
-            print("DEBUG: Waiting 0.5 seconds before paste...")
+            log.debug("Waiting 0.5 seconds before paste...")
             time.sleep(0.5)  # Longer delay to ensure widget is fully closed
             
             # Try to focus back to the original window we captured
             focus_restored = False
             if self.original_window_handle:
                 try:
-                    print(f"DEBUG: Trying to restore focus to original window: {self.original_window_handle}")
+                    log.debug("Trying to restore focus to original window: %s", self.original_window_handle)
                     
                     # Get window title for debugging
                     try:
                         window_title = win32gui.GetWindowText(self.original_window_handle)
-                        print(f"DEBUG: Original window title: '{window_title}'")
+                        log.debug("Original window title: '%s'", window_title)
                     except:
-                        print("DEBUG: Could not get original window title")
+                        log.warning("Could not get original window title")
                     
                     # Check if the window is still valid
                     if win32gui.IsWindow(self.original_window_handle):
@@ -716,26 +1068,26 @@ class TypoFixApp:
                             current_foreground = win32gui.GetForegroundWindow()
                             if current_foreground == self.original_window_handle:
                                 focus_restored = True
-                                print("DEBUG: Successfully restored focus to original window")
+                                log.debug("Successfully restored focus to original window")
                             else:
-                                print(f"DEBUG: Focus restoration failed - current foreground: {current_foreground}, expected: {self.original_window_handle}")
+                                log.warning("Focus restoration failed - current foreground: %s, expected: %s", current_foreground, self.original_window_handle)
                         except Exception as e:
-                            print(f"DEBUG: Error in focus restoration methods: {e}")
+                            log.warning("Error in focus restoration methods: %s", e)
                     else:
-                        print("DEBUG: Original window handle is no longer valid")
+                        log.debug("Original window handle is no longer valid")
                 except Exception as e:
-                    print(f"DEBUG: Could not restore focus to original window: {e}")
+                    log.warning("Could not restore focus to original window: %s", e)
             
             # If focus restoration failed, try more aggressive methods
             if not focus_restored:
-                print("DEBUG: Primary focus restoration failed, trying aggressive methods...")
+                log.warning("Primary focus restoration failed, trying aggressive methods...")
                 try:
                     # Method 1: Try to find windows with the same class name or title
                     if self.original_window_handle:
                         try:
                             class_name = win32gui.GetClassName(self.original_window_handle)
                             window_title = win32gui.GetWindowText(self.original_window_handle)
-                            print(f"DEBUG: Looking for similar windows - Class: '{class_name}', Title: '{window_title}'")
+                            log.debug("Looking for similar windows - Class: '%s', Title: '%s'", class_name, window_title)
                             
                             # Find other windows with same class
                             def enum_windows_callback(hwnd, results):
@@ -756,18 +1108,18 @@ class TypoFixApp:
                             if similar_windows:
                                 for hwnd, title in similar_windows:
                                     try:
-                                        print(f"DEBUG: Trying similar window: {hwnd} - '{title}'")
-                    win32gui.SetForegroundWindow(hwnd)
+                                        log.debug("Trying similar window: %s - '%s'", hwnd, title)
+                                        win32gui.SetForegroundWindow(hwnd)
                                         time.sleep(0.2)
                                         current_foreground = win32gui.GetForegroundWindow()
                                         if current_foreground == hwnd:
                                             focus_restored = True
-                                            print(f"DEBUG: Successfully focused similar window: '{title}'")
+                                            log.debug("Successfully focused similar window: '%s'", title)
                                             break
                                     except:
                                         continue
-            except Exception as e:
-                            print(f"DEBUG: Error in similar window search: {e}")
+                        except Exception as e:
+                            log.warning("Error in similar window search: %s", e)
                     
                     # Final fallback: just try to avoid the terminal
                     if not focus_restored:
@@ -775,13 +1127,13 @@ class TypoFixApp:
                         try:
                             current_title = win32gui.GetWindowText(current_hwnd)
                             current_class = win32gui.GetClassName(current_hwnd)
-                            print(f"DEBUG: Current foreground window: '{current_title}' (class: '{current_class}')")
+                            log.debug("Current foreground window: '%s' (class: '%s')", current_title, current_class)
                             
                             # If current window is a terminal/command prompt, try to find a better target
                             if any(term in current_class.lower() for term in ['console', 'cmd', 'powershell', 'terminal']) or \
                                any(term in current_title.lower() for term in ['powershell', 'command prompt', 'cmd', 'terminal', 'windows powershell']):
-                                print("DEBUG: Current window is a terminal, aborting paste operation")
-                                print(f"DEBUG: Terminal detected - Class: '{current_class}', Title: '{current_title}'")
+                                log.debug("Current window is a terminal, aborting paste operation")
+                                log.debug("Terminal detected - Class: '%s', Title: '%s'", current_class, current_title)
                                 # Show a notification that we're not pasting to prevent terminal pasting
                                 try:
                                     import tkinter.messagebox as msgbox
@@ -790,308 +1142,96 @@ class TypoFixApp:
                                     pass
                                 return
                         except Exception as e:
-                            print(f"DEBUG: Error checking current window: {e}")
+                            log.warning("Error checking current window: %s", e)
                             
                 except Exception as e:
-                    print(f"DEBUG: Error in aggressive focus methods: {e}")
+                    log.warning("Error in aggressive focus methods: %s", e)
             
-            print("DEBUG: Simulating Ctrl+V...")
+            log.debug("Simulating Ctrl+V...")
             pyautogui.hotkey('ctrl', 'v')
-            print("DEBUG: Paste action simulated successfully")
+            log.debug("Paste action simulated successfully")
             
             # Wait a bit more to ensure paste completes
             time.sleep(0.3)
             
         except Exception as e:
-            print(f"DEBUG: Error simulating paste: {e}")
+            log.warning("Error simulating paste: %s", e)
         finally:
             self.simulating_paste = False
-            print("DEBUG: Paste simulation completed")
+            log.debug("Paste simulation completed")
+            finished = time.perf_counter()
+            self.latency.record("paste", finished - paste_started, self.pipeline_mode)
+            if self.hotkey_started is not None:
+                self.latency.record("hotkey_to_paste", finished - self.hotkey_started, self.pipeline_mode)
+                self.hotkey_started = None
 
     def _cancel_widget(self):
         """Cancel and close the widget"""
         self._stop_widget_timer()
-        if self.floating_widget:
-             self.floating_widget.destroy()
-        self.floating_widget = None
-        self.widget_is_hovered = False
-        self.original_window_handle = None
-        print("Widget cancelled")
-
-    def _detect_language(self, text):
-        """Detect the language of the input text using Gemini API"""
-        print(f"DEBUG: Detecting language for text: '{text[:50]}...'")
-
-        api_url = f"{self.gemini_api_base_url}?key={self.api_key}"
-        
-        prompt = f"""Detect the language of the following text and respond with ONLY the language name in English (e.g., "Romanian", "English", "Spanish", "French", etc.).
-
-Text: "{text}"
-
-Language:"""
-        
-        payload = {
-            "contents": [{
-                "parts": [{
-                    "text": prompt
-                }]
-            }]
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        try:
-            response = requests.post(api_url, json=payload, headers=headers, timeout=15)
-            
-            if response.status_code != 200:
-                print(f"DEBUG: Language detection API error - Status: {response.status_code}")
-                return "Unknown"
-            
-            response_data = response.json()
-            if 'candidates' in response_data and len(response_data['candidates']) > 0:
-                candidate = response_data['candidates'][0]
-                if 'content' in candidate and 'parts' in candidate['content']:
-                    parts = candidate['content']['parts']
-                    if len(parts) > 0 and 'text' in parts[0]:
-                        detected_language = parts[0]['text'].strip()
-                        # Clean up the response
-                        detected_language = detected_language.replace("Language:", "").strip()
-                        if detected_language.startswith('"') and detected_language.endswith('"'):
-                            detected_language = detected_language[1:-1]
-                        
-                        print(f"DEBUG: Detected language: '{detected_language}'")
-                        return detected_language
-            
-            print("DEBUG: Could not detect language, defaulting to Unknown")
-            return "Unknown"
-            
-        except Exception as e:
-            print(f"DEBUG: Language detection error: {e}")
-            return "Unknown"
-
-    def _call_gemini_api_fix(self, text_to_correct):
-        """Calls the Gemini API to fix typos in the provided text."""
-        print(f"DEBUG: _call_gemini_api_fix() called with text: '{text_to_correct}'")
-        
-        # First detect the language
-        detected_language = self._detect_language(text_to_correct)
-        print(f"DEBUG: Language detected as: {detected_language}")
-        
-        api_url = f"{self.gemini_api_base_url}?key={self.api_key}"
-        
-        # Enhanced prompt with language detection
-        prompt = f"""The following text is written in {detected_language}. Fix any typos, spelling errors, and grammar mistakes while keeping the text EXACTLY in {detected_language}. 
-
-IMPORTANT REQUIREMENTS:
-- Keep the text in {detected_language} language - DO NOT translate to any other language
-- Fix only spelling errors, typos, and obvious grammar mistakes
-- Preserve the original meaning, style, and tone completely
-- Maintain the exact same format (line breaks, paragraphs, etc.)
-- Return ONLY the corrected text with no explanations or additional words
-- If there are no errors, return the original text exactly as provided
-
-Text to correct: "{text_to_correct}"
-
-Corrected text in {detected_language}:"""
-        
-        payload = {
-            "contents": [{
-                "parts": [{
-                    "text": prompt
-                }]
-            }]
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        print(f"DEBUG: Making API request with language-aware prompt...")
-        
-        try:
-            response = requests.post(api_url, json=payload, headers=headers, timeout=30)
-            print(f"DEBUG: Response status code: {response.status_code}")
-            
-            if response.status_code != 200:
-                print(f"DEBUG: API error - Status: {response.status_code}")
-                print(f"DEBUG: API error - Response: {response.text}")
-                return None
-            
-            response.raise_for_status()
-            
-            response_data = response.json()
-            print(f"DEBUG: Response data keys: {list(response_data.keys())}")
-            
-            if 'candidates' in response_data and len(response_data['candidates']) > 0:
-                candidate = response_data['candidates'][0]
-                
-                if 'content' in candidate and 'parts' in candidate['content']:
-                    parts = candidate['content']['parts']
-                    
-                    if len(parts) > 0 and 'text' in parts[0]:
-                        corrected_text = parts[0]['text'].strip()
-                        print(f"DEBUG: Raw API response text: '{corrected_text}'")
-                        
-                        # Clean up the response
-                        corrected_text = corrected_text.replace(f"Corrected text in {detected_language}:", "").strip()
-                        corrected_text = corrected_text.replace("Corrected text:", "").strip()
-                        if corrected_text.startswith('"') and corrected_text.endswith('"'):
-                            corrected_text = corrected_text[1:-1]
-                        
-                        print(f"DEBUG: Final corrected text: '{corrected_text}'")
-                        return corrected_text
-            
-            print("DEBUG: Failed to extract text from Gemini API response")
-            return None
-            
-        except requests.exceptions.Timeout:
-            print("DEBUG: API request timed out")
-            return None
-        except requests.exceptions.ConnectionError:
-            print("DEBUG: API connection error")
-            return None
-        except requests.exceptions.RequestException as e:
-            print(f"DEBUG: API request error: {e}")
-            return None
-        except Exception as e:
-            print(f"DEBUG: Unexpected error during API call: {e}")
-            return None
-
-    def _call_gemini_api_rewrite(self, text_to_rewrite):
-        """Calls the Gemini API to rewrite text for better clarity and logic."""
-        print(f"DEBUG: _call_gemini_api_rewrite() called with text: '{text_to_rewrite}'")
-        
-        # First detect the language
-        detected_language = self._detect_language(text_to_rewrite)
-        print(f"DEBUG: Language detected as: {detected_language}")
-        
-        api_url = f"{self.gemini_api_base_url}?key={self.api_key}"
-        
-        # Enhanced prompt with language detection
-        prompt = f"""The following text is written in {detected_language}. Rewrite it to improve word placement, sentence structure, and logical flow while keeping it EXACTLY in {detected_language}.
-
-CRITICAL REQUIREMENTS:
-- Keep the text in {detected_language} language - DO NOT translate to any other language
-- Preserve ALL original information, facts, and meaning completely
-- Maintain the EXACT same format (paragraphs, line breaks, structure)
-- Only improve word order, sentence structure, and logical flow
-- Do not add or remove any information whatsoever
-- Keep the same writing style and tone
-- Return ONLY the rewritten text with no explanations or commentary
-- If the text is already well-structured, return it with minimal changes
-
-Original text in {detected_language}: "{text_to_rewrite}"
-
-Rewritten text in {detected_language}:"""
-        
-        payload = {
-            "contents": [{
-                "parts": [{
-                    "text": prompt
-                }]
-            }]
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        print(f"DEBUG: Making rewrite API request with language-aware prompt...")
-        
-        try:
-            response = requests.post(api_url, json=payload, headers=headers, timeout=30)
-            print(f"DEBUG: Response status code: {response.status_code}")
-            
-            if response.status_code != 200:
-                print(f"DEBUG: API error - Status: {response.status_code}")
-                print(f"DEBUG: API error - Response: {response.text}")
-                return None
-            
-            response.raise_for_status()
-            
-            response_data = response.json()
-            print(f"DEBUG: Response data keys: {list(response_data.keys())}")
-            
-            if 'candidates' in response_data and len(response_data['candidates']) > 0:
-                candidate = response_data['candidates'][0]
-                
-                if 'content' in candidate and 'parts' in candidate['content']:
-                    parts = candidate['content']['parts']
-                    
-                    if len(parts) > 0 and 'text' in parts[0]:
-                        rewritten_text = parts[0]['text'].strip()
-                        print(f"DEBUG: Raw API response text: '{rewritten_text}'")
-                        
-                        # Clean up the response
-                        rewritten_text = rewritten_text.replace(f"Rewritten text in {detected_language}:", "").strip()
-                        rewritten_text = rewritten_text.replace("Rewritten text:", "").strip()
-                        if rewritten_text.startswith('"') and rewritten_text.endswith('"'):
-                            rewritten_text = rewritten_text[1:-1]
-                        
-                        print(f"DEBUG: Final rewritten text: '{rewritten_text}'")
-                        return rewritten_text
-            
-            print("DEBUG: Failed to extract text from Gemini API response")
-            return None
-            
-        except requests.exceptions.Timeout:
-            print("DEBUG: API request timed out")
-            return None
-        except requests.exceptions.ConnectionError:
-            print("DEBUG: API connection error")
-            return None
-        except requests.exceptions.RequestException as e:
-            print(f"DEBUG: API request error: {e}")
-            return None
-        except Exception as e:
-            print(f"DEBUG: Unexpected error during API call: {e}")
-            return None
+        self._discard_active_request()
+        self._cancel_speculation()
+        self._cancel_combined_request()
+        self._hide_widget()
+        log.debug("Widget cancelled")
 
     def _start_widget_timer(self):
-        """Start the widget timeout timer only if not hovered"""
+        """Start the widget timeout timer only if not hovered or busy"""
         self._stop_widget_timer()
-        if not self.widget_is_hovered:
+        if self.widget_busy:
+            log.debug("Widget timer not started - request in progress")
+        elif not self.widget_is_hovered:
             self.widget_timeout_timer = self.root.after(
                 self.widget_timeout_seconds * 1000, 
                 self._auto_close_widget
             )
-            print(f"DEBUG: Widget timer started - will auto-close in {self.widget_timeout_seconds} seconds")
+            log.debug("Widget timer started - will auto-close in %s seconds", self.widget_timeout_seconds)
         else:
-            print("DEBUG: Widget timer not started - widget is being hovered")
+            log.debug("Widget timer not started - widget is being hovered")
 
     def _stop_widget_timer(self):
         """Stop the widget timeout timer"""
         if self.widget_timeout_timer:
             self.root.after_cancel(self.widget_timeout_timer)
             self.widget_timeout_timer = None
-            print("DEBUG: Widget timer stopped")
+            log.debug("Widget timer stopped")
 
     def _on_widget_enter(self):
         """Called when mouse enters the widget area"""
         self.widget_is_hovered = True
         self._stop_widget_timer()
-        print("DEBUG: Mouse entered widget - timer stopped")
+        log.debug("Mouse entered widget - timer stopped")
 
     def _on_widget_leave(self):
         """Called when mouse leaves the widget area"""
         self.widget_is_hovered = False
         self._start_widget_timer()
-        print("DEBUG: Mouse left widget - timer started")
+        log.debug("Mouse left widget - timer started")
 
     def _auto_close_widget(self):
         """Automatically close the widget after timeout"""
-        print("DEBUG: Auto-closing widget due to inactivity timeout")
-        if self.floating_widget and self.floating_widget.winfo_exists():
-            self.floating_widget.destroy()
-            self.floating_widget = None
+        log.debug("Auto-closing widget due to inactivity timeout")
+        self._discard_active_request()
+        self._cancel_speculation()
+        self._cancel_combined_request()
         self.widget_timeout_timer = None
-        self.widget_is_hovered = False
-        self.original_window_handle = None
+        self._hide_widget()
+
+    def _preload_modules(self):
+        """Import deferred modules in the background so the first hotkey doesn't pay for them"""
+        started = time.perf_counter()
+        preload(pyautogui, win32gui, win32con, "comtypes.client")
+        log.debug("Deferred modules loaded in %.0f ms", (time.perf_counter() - started) * 1000)
 
     def create_tray_icon(self):
-        """Create a simple icon for the system tray"""
+        """Load the prerendered tray icon, drawing one only if the asset is missing"""
+        from PIL import Image
+        try:
+            image = Image.open(resource_path("assets", TRAY_ICON_ASSET))
+            image.load()
+            return image
+        except OSError as e:
+            log.warning("Tray icon asset unavailable, drawing it instead: %s", e)
+        
         # Create a 64x64 icon with a "T" for TypoFix
         size = (64, 64)
         image = Image.new('RGBA', size, (76, 175, 80, 255))  # Green background
@@ -1123,8 +1263,10 @@ Rewritten text in {detected_language}:"""
         return image
 
     def setup_system_tray(self):
-        """Setup the system tray icon with context menu"""
+        """Setup the system tray icon with context menu and run it (blocks; call on a thread)"""
         try:
+            import pystray
+            
             # Create the tray icon
             icon_image = self.create_tray_icon()
             
@@ -1133,9 +1275,32 @@ Rewritten text in {detected_language}:"""
                 pystray.MenuItem("TypoFix - AI Text Correction", lambda: None, enabled=False),
                 pystray.Menu.SEPARATOR,
                 pystray.MenuItem("Status: Running", lambda: None, enabled=False),
-                pystray.MenuItem("Usage: Highlight text → Ctrl+Alt+T or Shift+C", lambda: None, enabled=False),
+                pystray.MenuItem(f"Usage: Highlight text → {self._hotkey_names()}", lambda: None, enabled=False),
                 pystray.Menu.SEPARATOR,
                 pystray.MenuItem("Show Instructions", self.show_instructions),
+                pystray.MenuItem(
+                    "Speculative Prefetch",
+                    self.toggle_speculative_prefetch,
+                    checked=lambda item: self.speculative_prefetch,
+                ),
+                pystray.MenuItem(
+                    "Fix + Rewrite in One Request",
+                    self.toggle_combined_prefetch,
+                    checked=lambda item: self.combined_prefetch,
+                ),
+                pystray.MenuItem(
+                    "Instant Offline Fix",
+                    self.toggle_local_fix,
+                    checked=lambda item: self.local_fix_enabled,
+                ),
+                pystray.MenuItem(
+                    "Progressive Fix (local first)",
+                    self.toggle_progressive_fix,
+                    checked=lambda item: self.progressive_fix,
+                ),
+                pystray.MenuItem("Clear Correction Cache", self.clear_correction_cache),
+                pystray.MenuItem("Latency Summary", self.show_latency_summary),
+                pystray.MenuItem("Export Latency Data", self.export_latency_data),
                 pystray.Menu.SEPARATOR,
                 pystray.MenuItem("Exit TypoFix", self.quit_application)
             )
@@ -1144,18 +1309,15 @@ Rewritten text in {detected_language}:"""
             self.tray_icon = pystray.Icon(
                 "TypoFix",
                 icon_image,
-                "TypoFix - AI Text Correction Tool\nRunning in background\nHighlight text → Ctrl+Alt+T or Shift+C",
+                f"TypoFix - AI Text Correction Tool\nRunning in background\nHighlight text → {self._hotkey_names()}",
                 menu
             )
             
-            # Run the tray icon in a separate thread
-            tray_thread = threading.Thread(target=self.tray_icon.run, daemon=True)
-            tray_thread.start()
-            
-            print("System tray icon created successfully.")
+            log.info("System tray icon created successfully.")
+            self.tray_icon.run()
             
         except Exception as e:
-            print(f"Could not create system tray icon: {e}")
+            log.warning("Could not create system tray icon: %s", e)
             # Continue without tray icon if it fails
 
     def show_instructions(self):
@@ -1163,7 +1325,7 @@ Rewritten text in {detected_language}:"""
         instructions = """TypoFix - How to Use:
 
 1. Highlight any text in any application
-2. Press CTRL+ALT+T or SHIFT+C to activate TypoFix
+2. Press {hotkeys} to activate TypoFix
 3. A widget will appear with three buttons:
    • ✓ Fix - Corrects typos and spelling
    • 📝 Rewrite - Improves clarity and logic
@@ -1177,20 +1339,73 @@ The app runs in the background and works in:
 • Text editors and any other application
 
 TypoFix preserves the original language and format 
-while improving your text."""
+while improving your text.
+
+Hotkeys can be changed in:
+{hotkeys_path}""".format(hotkeys=self._hotkey_names(), hotkeys_path=self.hotkeys_path)
 
         # Create a simple info dialog
         messagebox.showinfo("TypoFix - Instructions", instructions)
 
+    def handle_instance_command(self, command):
+        """Run a command forwarded by another launch (called on the IPC thread)"""
+        if command == "show":
+            self.root.after(0, self.show_instructions)
+        elif command == "correct":
+            self.executor.submit(self.correct_clipboard)
+        elif command == "quit":
+            self.root.after(0, self.quit_application)
+        return "accepted"
+
+    def correct_clipboard(self):
+        """Fix the text currently on the clipboard and copy the result back"""
+        text = self.clipboard.read()
+        if not text or not text.strip():
+            log.info("Clipboard is empty - nothing to correct.")
+            return
+        corrected_text = self.engine.fix(text)
+        if corrected_text and corrected_text.strip():
+            self.clipboard.write(corrected_text)
+            log.info("Corrected clipboard text (%s chars).", len(corrected_text))
+        else:
+            log.warning("Could not correct clipboard text.")
+
+    def show_latency_summary(self):
+        """Show p50/p95/p99 per pipeline stage and mode"""
+        summary = f"{self.latency.summary_text()}\n\nGemini requests: {self.in_flight.summary()}"
+        messagebox.showinfo("TypoFix - Latency Summary", summary)
+
+    def export_latency_data(self):
+        """Append the latency histograms as JSON lines to the cache directory"""
+        try:
+            path = self.latency.export_jsonl(os.path.join(default_cache_dir(), "latency.jsonl"))
+            log.info("Latency data exported to %s", path)
+            return path
+        except OSError as e:
+            log.warning("Could not export latency data: %s", e)
+            return None
+
+    def clear_correction_cache(self):
+        """Remove all cached Fix/Rewrite results"""
+        try:
+            self.correction_cache.clear()
+            log.info("Correction cache cleared.")
+        except Exception as e:
+            log.warning("Could not clear correction cache: %s", e)
+
     def quit_application(self):
         """Quit the application completely"""
         try:
-            print("Shutting down TypoFix...")
+            log.info("Shutting down TypoFix...")
             
             # Stop widget timer
             self._stop_widget_timer()
             
-            # Close floating widget if open
+            # Drop queued API work
+            if hasattr(self, 'executor'):
+                self.executor.shutdown(wait=False, cancel_futures=True)
+            
+            # Destroy the floating widget
             if self.floating_widget:
                 self.floating_widget.destroy()
             
@@ -1198,17 +1413,69 @@ while improving your text."""
             if hasattr(self, 'tray_icon'):
                 self.tray_icon.stop()
             
+            # Release pooled API connections
+            if hasattr(self, 'transport'):
+                self.transport.close()
+            
+            # Keep this session's latency histograms
+            if hasattr(self, 'latency'):
+                self.export_latency_data()
+            
+            if hasattr(self, 'in_flight'):
+                log.info("Gemini requests: %s", self.in_flight.summary())
+            
+            # Flush and close the persistent cache
+            if hasattr(self, 'correction_cache'):
+                self.correction_cache.close()
+            
+            # Let the next launch become the running instance
+            if self.instance_guard:
+                self.instance_guard.close()
+            
+            # Write out queued log records
+            shutdown_logging()
+            
             # Quit the main application
             self.root.quit()
             self.root.destroy()
             
         except Exception as e:
-            print(f"Error during shutdown: {e}")
+            log.warning("Error during shutdown: %s", e)
         finally:
             # Force exit if normal shutdown fails
             os._exit(0)
 
+def parse_arguments(argv=None):
+    """Command forwarded to an already running instance (default: show instructions)"""
+    import argparse
+    parser = argparse.ArgumentParser(description="TypoFix - AI text correction from any application")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--show", dest="command", action="store_const", const="show",
+                       help="show the usage instructions (default when TypoFix is already running)")
+    group.add_argument("--correct-clipboard", dest="command", action="store_const", const="correct",
+                       help="fix the text on the clipboard and copy the result back")
+    group.add_argument("--quit", dest="command", action="store_const", const="quit",
+                       help="stop the running instance")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    arguments = parse_arguments()
+    guard = InstanceGuard(default_cache_dir())
+    if not guard.acquire():
+        # Already running: hand the command over instead of starting a second hook
+        try:
+            guard.forward(arguments.command or "show")
+        except OSError as e:
+            if sys.stderr:  # None in the windowed build
+                sys.stderr.write(f"TypoFix is already running but did not respond: {e}\n")
+            sys.exit(1)
+        sys.exit(0)
+    if arguments.command == "quit":
+        sys.exit(0)  # Nothing to stop
+    setup_logging(default_cache_dir())
     main_root = tk.Tk()
-    app = TypoFixApp(main_root)
+    app = TypoFixApp(main_root, instance_guard=guard)
+    if arguments.command == "correct":
+        app.executor.submit(app.correct_clipboard)
     main_root.mainloop()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Redraw cost of RoundedButton hover state changes
+
+Alternates a button between hovered and idle and reports microseconds per
+state change, including the Tk idle redraw. "recolour" is the current
+itemconfigure path; "rebuild" deletes and recreates every canvas item per
+change, which is what hover used to do. Needs a display.
+
+Usage:
+    python benchmarks/bench_button_redraw.py [--changes N] [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from widgets import RoundedButton  # noqa: E402
+
+
+def recolour(button):
+    if button.is_hovered:
+        button.on_leave(None)
+    else:
+        button.on_enter(None)
+
+
+def rebuild(button):
+    button.is_hovered = not button.is_hovered
+    button.draw_button()
+
+
+def measure(root, button, change, count, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(count):
+            change(button)
+            root.update_idletasks()
+        samples.append((time.perf_counter() - started) / count * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--changes", type=int, default=2000, help="state changes per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per strategy")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available: {e}")
+        return 1
+    root.geometry("+40+40")
+    button = RoundedButton(root, text="✓ Fix", command=None,
+                           bg_color='#27ae60', hover_color='#2ecc71')
+    button.pack(padx=10, pady=10)
+    root.update()
+
+    print(f"{args.changes} state changes x {args.repeat} runs, "
+          f"{len(button.canvas.find_all())} canvas items per button")
+    print(f"{'Strategy':<12}{'median us/change':>18}{'best us/change':>16}")
+    for label, change in (("recolour", recolour), ("rebuild", rebuild)):
+        samples = measure(root, button, change, args.changes, args.repeat)
+        print(f"{label:<12}{statistics.median(samples):>18.1f}{min(samples):>16.1f}")
+    root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
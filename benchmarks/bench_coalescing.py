@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Duplicate-request coalescing against a local fake Gemini server
+
+Bursts of identical requests (the same snippet hammered from several places at
+once) are sent concurrently, once directly and once through InFlightRequests,
+and the report shows how many requests reached the server and the per-call
+latency. Each burst uses a new text, so bursts never coalesce with each other.
+
+Usage:
+    python benchmarks/bench_coalescing.py [--bursts 20] [--burst-size 8] [--latency-ms 150]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from coalescing import InFlightRequests  # noqa: E402
+from correction_cache import make_cache_key  # noqa: E402
+from fake_gemini import FakeGeminiServer, FaultPlan  # noqa: E402
+from gemini_client import GeminiTransport, extract_response_text  # noqa: E402
+
+MODEL = "gemini-1.5-flash-latest"
+
+
+def fetch(transport, url, text):
+    response = transport.post(url, json={"contents": [{"parts": [{"text": text}]}]}, timeout=10)
+    try:
+        return extract_response_text(response.json())
+    finally:
+        response.close()
+
+
+def run(server, transport, bursts, burst_size, coalesce):
+    in_flight = InFlightRequests()
+    url = server.model_url(MODEL)
+    before = server.plan.requests
+    times = []
+
+    def one_call(text):
+        started = time.perf_counter()
+        if coalesce:
+            key = make_cache_key("fix", MODEL, "English", text)
+            in_flight.run(key, lambda _: fetch(transport, url, text))
+        else:
+            fetch(transport, url, text)
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=burst_size) as pool:
+        for burst in range(bursts):
+            text = f"Teh quick brown fox #{coalesce}-{burst}"
+            times.extend(pool.map(one_call, [text] * burst_size))
+    return server.plan.requests - before, times, in_flight
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bursts", type=int, default=20)
+    parser.add_argument("--burst-size", type=int, default=8, help="identical concurrent calls per burst")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="fake server response time")
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(plan=FaultPlan(latency_ms=args.latency_ms)).start()
+    # Pool as large as a burst, so the direct run is not throttled by the client
+    transport = GeminiTransport(server.model_url(MODEL), pool_size=args.burst_size)
+    try:
+        print(f"{args.bursts} bursts x {args.burst_size} identical calls, "
+              f"{args.latency_ms:.0f} ms server latency")
+        print(f"{'Strategy':<12}{'calls':>8}{'sent':>8}{'p50 ms':>10}{'p95 ms':>10}")
+        for label, coalesce in (("direct", False), ("coalesced", True)):
+            sent, times, in_flight = run(server, transport, args.bursts, args.burst_size, coalesce)
+            ordered = sorted(times)
+            p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+            print(f"{label:<12}{len(times):>8}{sent:>8}{statistics.median(times):>10.1f}{p95:>10.1f}")
+        print(f"\nCounters: {in_flight.summary()}")
+    finally:
+        transport.close()
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
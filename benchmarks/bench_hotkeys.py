@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Per-keystroke cost of hotkey matching
+
+Replays a synthetic typing stream (mostly letters, occasional Shift, Ctrl
+shortcuts and hotkey chords) through the ChordMatcher and through the previous
+set-based issubset matching, and reports nanoseconds per key event. The
+normalization from pynput-like key objects to integer codes is measured
+separately, since it runs on the keyboard hook thread.
+
+Usage:
+    python benchmarks/bench_hotkeys.py [--events N] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hotkeys import DEFAULT_BINDINGS, ChordMatcher, key_code  # noqa: E402
+
+# Stand-ins for pynput.keyboard.Key members and KeyCode instances
+SpecialKey = namedtuple("SpecialKey", ["name"])
+CharKey = namedtuple("CharKey", ["char", "vk"])
+
+CTRL = SpecialKey("ctrl_l")
+ALT = SpecialKey("alt_l")
+SHIFT = SpecialKey("shift")
+
+
+def typing_stream(count, seed=7):
+    """(pressed, key) events resembling ordinary typing with a few shortcuts"""
+    rng = random.Random(seed)
+    letters = "etaoinshrdlucmfwypvbgkjqxz      ,."
+    events = []
+    while len(events) < count:
+        roll = rng.random()
+        char = rng.choice(letters)
+        key = CharKey(char, ord(char.upper()) if char.isalnum() else None)
+        if roll < 0.03:
+            sequence = [CTRL, CharKey("\x03", 0x43)]  # Ctrl+C
+            modifiers = [CTRL]
+        elif roll < 0.04:
+            sequence = [CTRL, ALT, CharKey("\x14", 0x54)]  # Ctrl+Alt+T
+            modifiers = [CTRL, ALT]
+        elif roll < 0.10:
+            sequence = [SHIFT, CharKey(char.upper(), key.vk)]
+            modifiers = [SHIFT]
+        else:
+            sequence = [key]
+            modifiers = []
+        for item in sequence:
+            events.append((True, item))
+        for item in reversed(sequence):
+            if item not in modifiers:
+                events.append((False, item))
+        for item in reversed(modifiers):
+            events.append((False, item))
+    return events[:count]
+
+
+def legacy_matcher():
+    """The previous matching: named key sets and issubset checks on every press"""
+    hotkey = {"ctrl", "alt", "t"}
+    shift_c = {"shift", "c"}
+    current = set()
+
+    def name(key):
+        if isinstance(key, SpecialKey):
+            return key.name.split("_")[0]
+        return key.char.lower() if key.char else None
+
+    def press(key):
+        n = name(key)
+        if n in ("ctrl", "alt", "shift", "t", "c"):
+            current.add(n)
+        return hotkey.issubset(current) or shift_c.issubset(current)
+
+    def release(key):
+        current.discard(name(key))
+
+    return press, release
+
+
+def run_chords(events, repeat):
+    codes = [(pressed, key_code(key)) for pressed, key in events]
+    samples = []
+    matches = 0
+    for _ in range(repeat):
+        matcher = ChordMatcher(DEFAULT_BINDINGS)
+        press, release = matcher.press, matcher.release
+        matches = 0
+        started = time.perf_counter_ns()
+        for pressed, code in codes:
+            if pressed:
+                if press(code) is not None:
+                    matches += 1
+            else:
+                release(code)
+        samples.append((time.perf_counter_ns() - started) / len(codes))
+    return samples, matches
+
+
+def run_normalize(events, repeat):
+    keys = [key for _, key in events]
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        for key in keys:
+            key_code(key)
+        samples.append((time.perf_counter_ns() - started) / len(keys))
+    return samples
+
+
+def run_legacy(events, repeat):
+    samples = []
+    matches = 0
+    for _ in range(repeat):
+        press, release = legacy_matcher()
+        matches = 0
+        started = time.perf_counter_ns()
+        for pressed, key in events:
+            if pressed:
+                if press(key):
+                    matches += 1
+            else:
+                release(key)
+        samples.append((time.perf_counter_ns() - started) / len(events))
+    return samples, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200_000, help="key events per run")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per implementation")
+    args = parser.parse_args()
+
+    events = typing_stream(args.events)
+    chord_samples, chord_matches = run_chords(events, args.repeat)
+    normalize_samples = run_normalize(events, args.repeat)
+    legacy_samples, legacy_matches = run_legacy(events, args.repeat)
+
+    print(f"{len(events)} key events x {args.repeat} runs")
+    print(f"{'Implementation':<28}{'median ns/event':>16}{'best ns/event':>15}{'matches':>9}")
+    for label, samples, matches in (
+        ("ChordMatcher (int codes)", chord_samples, chord_matches),
+        ("key_code normalization", normalize_samples, "-"),
+        ("legacy set issubset", legacy_samples, legacy_matches),
+    ):
+        print(f"{label:<28}{statistics.median(samples):>16.1f}{min(samples):>15.1f}{matches:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark the offline language identifier against the Gemini detection call
+
+Uses the sample texts from test_scenarios.md. The API path only runs when a
+GEMINI_API_KEY is available in the environment (or a .env file).
+
+Usage:
+    python benchmarks/bench_language_id.py [--repeat N] [--skip-api]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from language_id import LanguageIdentifier  # noqa: E402
+
+KNOWN_LANGUAGES = ("English", "Spanish", "French", "German", "Romanian")
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent"
+
+
+def load_samples(path):
+    """Return (expected_language, text) pairs from the fenced blocks in test_scenarios.md"""
+    samples = []
+    heading = ""
+    in_block = False
+    block = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("```"):
+                if in_block:
+                    text = "\n".join(block).strip()
+                    expected = _expected_language(heading)
+                    if text and expected:
+                        samples.append((expected, text))
+                    block = []
+                in_block = not in_block
+            elif in_block:
+                block.append(line)
+            elif re.match(r"^\*\*.+\*\*$", line.strip()):
+                heading = line.strip("* :")
+    return samples
+
+
+def _expected_language(heading):
+    if "Mixed" in heading:
+        return None  # no single correct answer
+    for language in KNOWN_LANGUAGES:
+        if language in heading:
+            return language
+    return "English"
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(name, results):
+    latencies = [latency for _, _, latency in results]
+    correct = sum(1 for expected, detected, _ in results if expected == detected)
+    print(f"\n{name}")
+    print(f"  accuracy: {correct}/{len(results)} ({correct / len(results):.0%})")
+    print(f"  latency:  mean {statistics.mean(latencies) * 1e6:,.1f} us, "
+          f"p50 {_percentile(latencies, 50) * 1e6:,.1f} us, "
+          f"p95 {_percentile(latencies, 95) * 1e6:,.1f} us")
+
+
+def bench_local(samples, repeat):
+    identifier = LanguageIdentifier()
+    identifier.identify("warm up")  # profiles are built lazily on first use
+    results = []
+    deferred = 0
+    for expected, text in samples:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            language, confidence = identifier.identify(text)
+        latency = (time.perf_counter() - started) / repeat
+        if confidence < identifier.confidence_threshold:
+            deferred += 1
+        results.append((expected, language, latency))
+        print(f"  {expected:<8} -> {language:<8} ({confidence:.2f})  {text[:50]!r}")
+    _report("Local n-gram identifier", results)
+    print(f"  below confidence threshold (would ask Gemini): {deferred}/{len(samples)}")
+
+
+def bench_api(samples, api_key):
+    from gemini_client import GeminiTransport, detect_language_remote
+
+    transport = GeminiTransport(GEMINI_URL)
+    transport.warm_up()
+    api_url = f"{GEMINI_URL}?key={api_key}"
+    results = []
+    for expected, text in samples:
+        started = time.perf_counter()
+        language = detect_language_remote(transport, api_url, text)
+        results.append((expected, language, time.perf_counter() - started))
+    transport.close()
+    _report("Gemini API detection", results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1000, help="local iterations per sample")
+    parser.add_argument("--skip-api", action="store_true", help="only benchmark the local path")
+    args = parser.parse_args()
+
+    samples = load_samples(os.path.join(ROOT, "test_scenarios.md"))
+    print(f"Loaded {len(samples)} labelled samples from test_scenarios.md")
+    bench_local(samples, args.repeat)
+
+    if args.skip_api:
+        return
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("\nGEMINI_API_KEY not set - skipping the API comparison")
+        return
+    bench_api(samples, api_key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Input tokens and response parsing cost: legacy inline prompts vs. the prompt layer
+
+For every sample in test_scenarios.md, builds the request the app used to send
+(requirements repeated inline, language named several times) and the one it
+sends now (prompts.build_payload: fixed systemInstruction + short user turn),
+and reports input tokens per request for fix, rewrite and detect. Token counts
+are local estimates (chunking.estimate_tokens); with GEMINI_API_KEY set, the
+countTokens endpoint is used for exact numbers instead.
+
+Also times the client-side clean-up of an answer: the old str.replace and
+quote-stripping chain vs. one json.loads.
+
+Usage:
+    python benchmarks/bench_prompt_tokens.py [--skip-api] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_language_id import load_samples  # noqa: E402
+from chunking import estimate_tokens  # noqa: E402
+from prompts import build_payload, parse_response  # noqa: E402
+
+MODEL = "gemini-1.5-flash-latest"
+COUNT_TOKENS_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{MODEL}:countTokens"
+
+
+# The prompts app.py sent before the prompt layer, kept here as the baseline
+def legacy_fix(text, language):
+    return f"""The following text is written in {language}. Fix any typos, spelling errors, and grammar mistakes while keeping the text EXACTLY in {language}.
+
+IMPORTANT REQUIREMENTS:
+- Keep the text in {language} language - DO NOT translate to any other language
+- Fix only spelling errors, typos, and obvious grammar mistakes
+- Preserve the original meaning, style, and tone completely
+- Maintain the exact same format (line breaks, paragraphs, etc.)
+- Return ONLY the corrected text with no explanations or additional words
+- If there are no errors, return the original text exactly as provided
+
+Text to correct: "{text}"
+
+Corrected text in {language}:"""
+
+
+def legacy_rewrite(text, language):
+    return f"""The following text is written in {language}. Rewrite it to improve word placement, sentence structure, and logical flow while keeping it EXACTLY in {language}.
+
+CRITICAL REQUIREMENTS:
+- Keep the text in {language} language - DO NOT translate to any other language
+- Preserve ALL original information, facts, and meaning completely
+- Maintain the EXACT same format (paragraphs, line breaks, structure)
+- Only improve word order, sentence structure, and logical flow
+- Do not add or remove any information whatsoever
+- Keep the same writing style and tone
+- Return ONLY the rewritten text with no explanations or commentary
+- If the text is already well-structured, return it with minimal changes
+
+Original text in {language}: "{text}"
+
+Rewritten text in {language}:"""
+
+
+def legacy_detect(text, language):
+    return f"""Detect the language of the following text and respond with ONLY the language name in English (e.g., "Romanian", "English", "Spanish", "French", etc.).
+
+Text: "{text}"
+
+Language:"""
+
+
+LEGACY = {"fix": legacy_fix, "rewrite": legacy_rewrite, "detect": legacy_detect}
+
+
+def legacy_payload(mode, text, language):
+    return {"contents": [{"parts": [{"text": LEGACY[mode](text, language)}]}]}
+
+
+def new_payload(mode, text, language):
+    return build_payload(mode, text, None if mode == "detect" else language)
+
+
+def estimated_tokens(payload):
+    texts = [part["text"] for content in payload["contents"] for part in content["parts"]]
+    texts += [part["text"] for part in payload.get("systemInstruction", {}).get("parts", [])]
+    return sum(estimate_tokens(text) for text in texts)
+
+
+def counted_tokens(session, api_key, payload):
+    body = {"generateContentRequest": {"model": f"models/{MODEL}",
+                                       **{k: v for k, v in payload.items() if k != "generationConfig"}}}
+    response = session.post(f"{COUNT_TOKENS_URL}?key={api_key}", json=body, timeout=15)
+    response.raise_for_status()
+    return response.json()["totalTokens"]
+
+
+def compare_tokens(samples, count):
+    print(f"{'mode':<10}{'legacy/request':>16}{'now/request':>14}{'saved':>9}{'saved %':>9}")
+    for mode in ("fix", "rewrite", "detect"):
+        legacy = [count(legacy_payload(mode, text, language)) for language, text in samples]
+        new = [count(new_payload(mode, text, language)) for language, text in samples]
+        legacy_mean = statistics.mean(legacy)
+        new_mean = statistics.mean(new)
+        saved = legacy_mean - new_mean
+        print(f"{mode:<10}{legacy_mean:>16.1f}{new_mean:>14.1f}{saved:>9.1f}{saved / legacy_mean:>9.0%}")
+
+
+def legacy_cleanup(response_text, language):
+    corrected = response_text.replace(f"Corrected text in {language}:", "").strip()
+    corrected = corrected.replace("Corrected text:", "").strip()
+    if corrected.startswith('"') and corrected.endswith('"'):
+        corrected = corrected[1:-1]
+    return corrected
+
+
+def compare_parsing(samples, repeat):
+    legacy_answers = [(f'Corrected text in {language}: "{text}"', language) for language, text in samples]
+    json_answers = [json.dumps({"text": text}) for _, text in samples]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for answer, language in legacy_answers:
+            legacy_cleanup(answer, language)
+    legacy_us = (time.perf_counter() - started) / (repeat * len(samples)) * 1e6
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for answer in json_answers:
+            parse_response("fix", answer)
+    json_us = (time.perf_counter() - started) / (repeat * len(samples)) * 1e6
+
+    print(f"\nAnswer clean-up per response: str.replace chain {legacy_us:.2f} us, "
+          f"json.loads {json_us:.2f} us")
+    print("(the JSON answer also cannot leak labels or quotes into the pasted text)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skip-api", action="store_true", help="use local token estimates only")
+    parser.add_argument("--repeat", type=int, default=2000, help="parsing iterations per sample")
+    args = parser.parse_args()
+
+    samples = load_samples(os.path.join(ROOT, "test_scenarios.md"))
+    print(f"{len(samples)} samples from test_scenarios.md, mean text size "
+          f"{statistics.mean(estimate_tokens(text) for _, text in samples):.1f} tokens (estimated)\n")
+
+    api_key = None
+    if not args.skip_api:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
+        api_key = os.getenv("GEMINI_API_KEY")
+
+    if api_key:
+        import requests
+        with requests.Session() as session:
+            print("Input tokens from countTokens:")
+            compare_tokens(samples, lambda payload: counted_tokens(session, api_key, payload))
+    else:
+        print("Input tokens (local estimate; set GEMINI_API_KEY for exact counts):")
+        compare_tokens(samples, estimated_tokens)
+
+    compare_parsing(samples, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
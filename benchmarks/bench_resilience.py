@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Exercise the Gemini retry policy and circuit breaker against a faulty fake server
+
+Runs GeminiTransport against benchmarks/fake_gemini.py through four scenarios
+and prints success rates and call latencies:
+
+  flaky        a share of requests return 503; compares retries on and off
+  rate-limit   every failure is a 429 with Retry-After, which must be honoured
+  outage       every request fails; the breaker must open and calls fail fast
+  recovery     the server heals; after the cool-down one probe closes the breaker
+
+Exits with status 1 if any scenario's expectation does not hold.
+
+Usage:
+    python benchmarks/bench_resilience.py [--calls 200] [--fail-rate 0.2]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_gemini import FakeGeminiServer, FaultPlan  # noqa: E402
+from gemini_client import GeminiTransport  # noqa: E402
+from resilience import OPEN, CircuitBreaker, CircuitOpenError, RetryPolicy  # noqa: E402
+
+PAYLOAD = {"contents": [{"parts": [{"text": "Helo wrld"}]}]}
+
+
+def make_transport(server, max_attempts=3, failure_threshold=5, reset_timeout=1.0):
+    return GeminiTransport(
+        server.model_url(),
+        retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.01, max_delay=2.0),
+        breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout),
+    )
+
+
+def call(transport, url):
+    """(succeeded, seconds, outcome) for one POST"""
+    started = time.perf_counter()
+    try:
+        response = transport.post(url, json=PAYLOAD, timeout=5)
+        outcome = response.status_code
+        response.close()
+    except CircuitOpenError:
+        outcome = "open"
+    except Exception as e:
+        outcome = type(e).__name__
+    return outcome == 200, time.perf_counter() - started, outcome
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(label, results):
+    succeeded = sum(1 for ok, _, _ in results if ok)
+    times = [seconds * 1000 for _, seconds, _ in results]
+    print(f"  {label:<26}{succeeded:>5}/{len(results):<5}{succeeded / len(results):>8.1%}"
+          f"{statistics.median(times):>10.1f}{percentile(times, 0.95):>10.1f}")
+    return succeeded / len(results)
+
+
+def scenario_flaky(server, calls, fail_rate):
+    print(f"\nflaky: {fail_rate:.0%} of requests return 503")
+    print(f"  {'':<26}{'ok':>11}{'rate':>8}{'p50 ms':>10}{'p95 ms':>10}")
+    server.plan.update(fail_rate=fail_rate, status=503, retry_after=None, outage=0)
+    # A threshold above the run length keeps the breaker out of this comparison
+    without = make_transport(server, max_attempts=1, failure_threshold=calls + 1)
+    with_retries = make_transport(server, max_attempts=3, failure_threshold=calls + 1)
+    url = server.model_url()
+    rate_without = report("no retries", [call(without, url) for _ in range(calls)])
+    rate_with = report("3 attempts, backoff", [call(with_retries, url) for _ in range(calls)])
+    for transport in (without, with_retries):
+        transport.close()
+    expected = 1 - fail_rate ** 3
+    return rate_with > rate_without and rate_with >= expected - 0.05
+
+
+def scenario_rate_limit(server):
+    print("\nrate-limit: one 429 with Retry-After: 1, then success")
+    server.plan.update(fail_rate=0.0, status=429, retry_after=1, outage=1)
+    transport = make_transport(server)
+    ok, seconds, outcome = call(transport, server.model_url())
+    transport.close()
+    print(f"  status {outcome} after {seconds * 1000:.0f} ms, retries: {transport.retries}")
+    return ok and seconds >= 1.0
+
+
+def scenario_outage(server, calls):
+    print("\noutage: every request returns 503")
+    server.plan.update(fail_rate=0.0, status=503, retry_after=None, outage=10 ** 9)
+    transport = make_transport(server, failure_threshold=5, reset_timeout=1.0)
+    url = server.model_url()
+    before = server.plan.requests
+    results = [call(transport, url) for _ in range(calls)]
+    sent = server.plan.requests - before
+    rejected = sum(1 for _, _, outcome in results if outcome == "open")
+    open_times = [seconds * 1000 for _, seconds, outcome in results if outcome == "open"]
+    print(f"  {calls} calls sent {sent} requests; {rejected} rejected by the open breaker")
+    if open_times:
+        print(f"  fail-fast call: median {statistics.median(open_times) * 1000:.0f} us")
+    return transport, transport.breaker.state == OPEN and sent <= 6 and rejected >= calls - 2
+
+
+def scenario_recovery(server, transport):
+    print("\nrecovery: server healthy again")
+    server.plan.update(outage=0)
+    time.sleep(transport.breaker.reset_timeout)
+    ok, seconds, outcome = call(transport, server.model_url())
+    state = transport.breaker.state
+    print(f"  probe status {outcome} in {seconds * 1000:.1f} ms; breaker {state}")
+    transport.close()
+    return ok and state != OPEN
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="calls per measured run")
+    parser.add_argument("--fail-rate", type=float, default=0.2, help="503 share in the flaky scenario")
+    args = parser.parse_args()
+
+    server = FakeGeminiServer(plan=FaultPlan(seed=1)).start()
+    try:
+        checks = {"flaky": scenario_flaky(server, args.calls, args.fail_rate),
+                  "rate-limit": scenario_rate_limit(server)}
+        transport, checks["outage"] = scenario_outage(server, args.calls)
+        checks["recovery"] = scenario_recovery(server, transport)
+    finally:
+        server.stop()
+
+    print()
+    for name, passed in checks.items():
+        print(f"{name:<12}{'OK' if passed else 'FAIL'}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Load test for the local correction service against a fake Gemini backend
+
+Starts benchmarks/fake_gemini.py with a fixed response latency and the TypoFix
+server (typofix_server.py) in-process on free ports, with a throwaway
+correction cache, then has N client threads send /fix, /rewrite and /detect
+requests over keep-alive connections. A share of requests repeats texts seen
+before (--repeat-ratio), as editors re-checking the same paragraph do.
+
+Reports requests per second, client-side latency percentiles, HTTP status
+counts and how many requests actually reached the Gemini backend.
+
+Usage:
+    python benchmarks/bench_server.py [--clients 32] [--requests 50] [--workers 16]
+                                      [--latency-ms 200] [--repeat-ratio 0.3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests  # noqa: E402
+
+from correction_cache import CorrectionCache  # noqa: E402
+from fake_gemini import FakeGeminiServer, FaultPlan  # noqa: E402
+from typofix_server import CorrectionService, build_engine, make_server  # noqa: E402
+
+MODEL = "gemini-1.5-flash-latest"
+ENDPOINTS = ("fix", "fix", "rewrite", "detect")
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def client(base_url, client_id, count, repeat_ratio, seed, results):
+    rng = random.Random(seed + client_id)
+    with requests.Session() as session:
+        for number in range(count):
+            if number and rng.random() < repeat_ratio:
+                # A text this client already sent, so the server may answer from its cache
+                text_id = rng.randrange(number)
+            else:
+                text_id = number
+            text = f"Teh quick brown fox {client_id}-{text_id} jumps over the lazy dog and recieves a leter."
+            endpoint = ENDPOINTS[text_id % len(ENDPOINTS)]
+            started = time.perf_counter()
+            try:
+                response = session.post(f"{base_url}/{endpoint}", json={"text": text}, timeout=60)
+                status = response.status_code
+            except requests.exceptions.RequestException:
+                status = "error"
+            results.append((status, (time.perf_counter() - started) * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent client connections")
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--workers", type=int, default=16, help="server worker pool size")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="fake Gemini response time")
+    parser.add_argument("--repeat-ratio", type=float, default=0.3, help="share of repeated texts")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    backend = FakeGeminiServer(plan=FaultPlan(latency_ms=args.latency_ms)).start()
+    api_base = f"{backend.base_url}/v1beta"
+    with tempfile.TemporaryDirectory() as cache_dir:
+        engine = build_engine("fake-key", MODEL, api_base, args.workers,
+                              cache=CorrectionCache(cache_dir=cache_dir))
+        service = CorrectionService(engine, workers=args.workers)
+        server = make_server(service, port=0)
+        server_thread = threading.Thread(target=server.serve_forever, name="typofix-server", daemon=True)
+        server_thread.start()
+        base_url = f"http://127.0.0.1:{server.port}"
+
+        results = []
+        total = args.clients * args.requests
+        print(f"{args.clients} clients x {args.requests} requests, {args.workers} server workers, "
+              f"{args.latency_ms:.0f} ms Gemini latency, {args.repeat_ratio:.0%} repeated texts")
+        backend_before = backend.plan.requests
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=args.clients) as pool:
+                for client_id in range(args.clients):
+                    pool.submit(client, base_url, client_id, args.requests, args.repeat_ratio,
+                                args.seed, results)
+            elapsed = time.perf_counter() - started
+            health = requests.get(f"{base_url}/health", timeout=5).json()
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+            engine.close()
+            backend.stop()
+
+    times = sorted(ms for status, ms in results if status == 200)
+    statuses = Counter(str(status) for status, _ in results)
+    print(f"\n{total} requests in {elapsed:.2f} s: {len(results) / elapsed:.1f} requests/s")
+    if times:
+        print(f"{'latency ms':<12}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'mean':>9}")
+        print(f"{'200 OK':<12}{percentile(times, 0.50):>9.1f}{percentile(times, 0.95):>9.1f}"
+              f"{percentile(times, 0.99):>9.1f}{times[-1]:>9.1f}{statistics.mean(times):>9.1f}")
+    print(f"Status codes: {dict(sorted(statuses.items()))}")
+    print(f"Gemini backend requests: {backend.plan.requests - backend_before} "
+          f"(coalescing: {health['gemini']}), cache hits {health['cache']['hits']}, "
+          f"misses {health['cache']['misses']}")
+    return 0 if statuses.get("200") == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
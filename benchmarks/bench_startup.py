@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Startup import-cost report with a regression threshold
+
+Imports the target module (``app`` by default) in fresh interpreters with
+``python -X importtime``, takes the median of each module's self and cumulative
+time across runs, and prints the most expensive modules. Exits with status 1
+when the target's cumulative import time exceeds the budget, or when a module
+regresses past the tolerance against a saved baseline.
+
+Importing ``app`` does not start the GUI, so this measures exactly the work
+done before ``TypoFixApp`` is constructed. Run it on the target platform
+(``app`` imports Windows-only modules).
+
+Usage:
+    python benchmarks/bench_startup.py [--module app] [--runs 7] [--budget-ms 250]
+    python benchmarks/bench_startup.py --save-baseline startup_baseline.json
+    python benchmarks/bench_startup.py --baseline startup_baseline.json --tolerance 25
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+# Modules whose baseline cost is too small to compare meaningfully
+MIN_COMPARE_US = 2000
+
+
+def run_once(module):
+    """
+    Return ({module: (self_us, cumulative_us, depth)}, direct_imports) for one fresh import.
+
+    -X importtime prints children before their parent, so the target's direct
+    imports are the depth-1 lines since the previous top-level line.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or ["(no output)"]
+        raise RuntimeError(f"'import {module}' failed: {tail[0]}")
+    timings = {}
+    children = []
+    direct = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        name = name.strip()
+        depth = len(indent) // 2
+        timings[name] = (int(self_us), int(cumulative_us), depth)
+        if depth == 1:
+            children.append(name)
+        elif depth == 0:
+            if name == module:
+                direct = children
+            children = []
+    return timings, direct
+
+
+def measure(module, runs):
+    """Median self/cumulative microseconds per module across runs"""
+    runs_output = [run_once(module) for _ in range(runs)]
+    samples = [timings for timings, _ in runs_output]
+    direct = set().union(*(names for _, names in runs_output))
+    names = set().union(*samples)
+    report = {}
+    for name in names:
+        present = [sample[name] for sample in samples if name in sample]
+        report[name] = {
+            "self_us": int(statistics.median(t[0] for t in present)),
+            "cumulative_us": int(statistics.median(t[1] for t in present)),
+            "depth": min(t[2] for t in present),
+            "direct": name in direct,
+        }
+    return report
+
+
+def print_report(module, report, top):
+    target = report.get(module)
+    print(f"'import {module}': {target['cumulative_us'] / 1000:.1f} ms cumulative "
+          f"({len(report)} modules)")
+
+    direct = sorted((name for name, row in report.items() if row["direct"]),
+                    key=lambda name: -report[name]["cumulative_us"])
+    print(f"\nDirect imports of {module} by cumulative cost:")
+    print(f"{'module':<40}{'cumulative ms':>15}{'self ms':>10}")
+    for name in direct[:top]:
+        row = report[name]
+        print(f"{name:<40}{row['cumulative_us'] / 1000:>15.1f}{row['self_us'] / 1000:>10.1f}")
+
+    print("\nMost expensive modules by self time:")
+    print(f"{'module':<40}{'self ms':>10}")
+    for name in sorted(report, key=lambda n: -report[n]["self_us"])[:top]:
+        print(f"{name:<40}{report[name]['self_us'] / 1000:>10.1f}")
+
+
+def compare(report, baseline, tolerance):
+    """Modules whose cumulative time grew more than tolerance percent over the baseline"""
+    regressions = []
+    for name, row in report.items():
+        before = baseline.get(name)
+        if before is None:
+            if row["direct"] and row["cumulative_us"] >= MIN_COMPARE_US:
+                regressions.append((name, 0, row["cumulative_us"]))
+            continue
+        if before["cumulative_us"] < MIN_COMPARE_US:
+            continue
+        if row["cumulative_us"] > before["cumulative_us"] * (1 + tolerance / 100):
+            regressions.append((name, before["cumulative_us"], row["cumulative_us"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreter runs")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--budget-ms", type=float, default=250.0,
+                        help="fail if the module's cumulative import time exceeds this")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=25.0,
+                        help="allowed per-module growth over the baseline, in percent")
+    parser.add_argument("--save-baseline", help="write this run's report as JSON")
+    args = parser.parse_args()
+
+    try:
+        report = measure(args.module, args.runs)
+    except RuntimeError as e:
+        print(e)
+        return 2
+    print_report(args.module, report, args.top)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    failed = False
+    total_ms = report[args.module]["cumulative_us"] / 1000
+    if total_ms > args.budget_ms:
+        print(f"\nFAIL: {total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    else:
+        print(f"\nOK: {total_ms:.1f} ms within the {args.budget_ms:.0f} ms budget")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for name, before, after in sorted(regressions, key=lambda r: r[1] - r[2]):
+            label = "new import" if not before else f"{before / 1000:.1f} ms ->"
+            print(f"REGRESSION: {name}: {label} {after / 1000:.1f} ms")
+        if regressions:
+            failed = True
+        else:
+            print(f"No module regressed more than {args.tolerance:.0f}% against {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
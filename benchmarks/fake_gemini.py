@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Local fake of the Gemini generateContent API with fault injection
+
+Answers ``generateContent`` and ``streamGenerateContent?alt=sse`` in the real
+response shape, echoing the last text part of the request back (as the
+requested JSON object when the request uses JSON mode). Faults can be
+injected per request: a fixed outage (the next N requests fail), a random
+failure rate, the failing status code, a ``Retry-After`` header and extra
+latency. The plan can be changed while the server runs, so one server can
+walk a client through failure and recovery.
+
+Used by bench_resilience.py; also runnable on its own for manual testing:
+
+Usage:
+    python benchmarks/fake_gemini.py [--port 8765] [--latency-ms 50]
+        [--fail-rate 0.2] [--status 503] [--retry-after 1]
+
+Point the app at it by replacing the API host with http://127.0.0.1:<port>.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+FAKE_LANGUAGE = "English"
+
+
+class FaultPlan:
+    """What the next requests should experience; thread-safe and changeable at runtime"""
+
+    def __init__(self, latency_ms=0.0, fail_rate=0.0, status=503, retry_after=None, seed=None):
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.latency_ms = latency_ms
+        self.fail_rate = fail_rate
+        self.status = status
+        self.retry_after = retry_after
+        self.outage = 0
+        self.requests = 0
+        self.faults = 0
+
+    def update(self, **changes):
+        with self._lock:
+            for name, value in changes.items():
+                if not hasattr(self, name) or name.startswith("_"):
+                    raise AttributeError(name)
+                setattr(self, name, value)
+
+    def next(self):
+        """(status or None for success, retry_after, latency seconds) for one request"""
+        with self._lock:
+            self.requests += 1
+            failing = self.outage > 0 or (self.fail_rate and self._rng.random() < self.fail_rate)
+            if self.outage > 0:
+                self.outage -= 1
+            if failing:
+                self.faults += 1
+                return self.status, self.retry_after, self.latency_ms / 1000
+            return None, None, self.latency_ms / 1000
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass  # Quiet: benchmarks print their own report
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        status, retry_after, latency = self.server.plan.next()
+        if latency:
+            time.sleep(latency)
+        if status is not None:
+            self._send_json(status, {"error": {"code": status, "message": "Injected fault"}},
+                            retry_after)
+            return
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"code": 400, "message": "Invalid JSON payload"}})
+            return
+        text = _answer(payload, self.server.respond(_last_text(payload)))
+        if ":streamGenerateContent" in self.path:
+            self._send_stream(text)
+        else:
+            self._send_json(200, _response(text))
+
+    def _send_json(self, status, payload, retry_after=None):
+        # Raw UTF-8 like the real API, so clients that decode it wrongly show up here
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if retry_after is not None:
+            self.send_header("Retry-After", str(retry_after))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, text):
+        # Split into a few SSE events so clients see partial text
+        pieces = [text[i:i + 16] for i in range(0, len(text), 16)] or [""]
+        data = b"".join(b"data: " + json.dumps(_response(piece), ensure_ascii=False).encode("utf-8") + b"\r\n\r\n"
+                        for piece in pieces)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _last_text(payload):
+    parts = [part.get("text", "") for content in payload.get("contents", [])
+             for part in content.get("parts", [])]
+    return parts[-1] if parts else ""
+
+
+def _answer(payload, text):
+    """Wrap the answer in the requested JSON schema (JSON mode), else return it as-is"""
+    config = payload.get("generationConfig", {})
+    if config.get("responseMimeType") != "application/json":
+        return text
+    if text.startswith("Language: "):
+        text = text.split("\n\n", 1)[-1]  # The prompt layer's user turn
+    fields = config.get("responseSchema", {}).get("properties") or {"text": None}
+    return json.dumps({field: FAKE_LANGUAGE if field == "language" else text for field in fields},
+                      ensure_ascii=False)
+
+
+def _response(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                            "finishReason": "STOP"}]}
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, plan=None, respond=None):
+        super().__init__(("127.0.0.1", port), FakeGeminiHandler)
+        self.plan = plan or FaultPlan()
+        # respond(request_text) -> response text; echoes by default
+        self.respond = respond or (lambda text: text)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def model_url(self, model="gemini-1.5-flash-latest", method="generateContent"):
+        return f"{self.base_url}/v1beta/models/{model}:{method}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-gemini", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--status", type=int, default=503, help="status code of injected failures")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with failures")
+    args = parser.parse_args()
+
+    plan = FaultPlan(args.latency_ms, args.fail_rate, args.status, args.retry_after)
+    server = FakeGeminiServer(args.port, plan)
+    print(f"Fake Gemini listening on {server.model_url()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{plan.requests} requests, {plan.faults} injected faults")
+
+
+if __name__ == "__main__":
+    main()
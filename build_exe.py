@@ -24,7 +24,10 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[
-        # No external data files - everything embedded
+        # Word-frequency dictionaries for the offline corrector
+        ('dictionaries', 'dictionaries'),
+        # Prerendered tray icon (see generate_tray_icon.py)
+        ('assets', 'assets'),
     ],
     hiddenimports=[
         'pystray',
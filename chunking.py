@@ -0,0 +1,171 @@
+"""
+Split large selections into paragraph/sentence chunks, correct them in parallel and reassemble
+"""
+
+import math
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+# A chunk's leading and trailing whitespace is kept locally and never sent to the API,
+# so "".join(prefix + body + suffix) reproduces the original text exactly
+Chunk = namedtuple("Chunk", ["prefix", "body", "suffix"])
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+_SENTENCE_END = re.compile(r"(?<=[.!?…。！？])[\"')\]»”’]*\s+")
+_WORD = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def estimate_tokens(text):
+    """Rough local token estimate (~4 characters per token, at least one per word/symbol)"""
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / 4), math.ceil(len(_WORD.findall(text)) * 0.75))
+
+
+def _split_keep_separators(text, pattern):
+    """Split text into pieces, each carrying the separator that follows it"""
+    pieces = []
+    start = 0
+    for match in pattern.finditer(text):
+        pieces.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+
+def _split_oversized(piece, max_tokens):
+    """Break a single paragraph that exceeds the budget at sentence, then word boundaries"""
+    if estimate_tokens(piece) <= max_tokens:
+        return [piece]
+    units = []
+    for sentence in _split_keep_separators(piece, _SENTENCE_END):
+        if estimate_tokens(sentence) <= max_tokens:
+            units.append(sentence)
+            continue
+        # A single enormous sentence: fall back to whitespace boundaries; the first
+        # word also carries any leading whitespace so none of it is lost
+        current = ""
+        for word in re.findall(r"\s*\S+\s*", sentence) or [sentence]:
+            if current and estimate_tokens(current + word) > max_tokens:
+                units.append(current)
+                current = ""
+            current += word
+        if current:
+            units.append(current)
+    return units
+
+
+def split_into_chunks(text, max_tokens):
+    """
+    Split text into chunks of at most ~max_tokens, breaking at paragraphs first and
+    sentences second.
+
+    Returns:
+        List of Chunk tuples whose concatenation equals the original text
+    """
+    units = []
+    for paragraph in _split_keep_separators(text, _PARAGRAPH_BREAK):
+        units.extend(_split_oversized(paragraph, max_tokens))
+
+    # Greedily pack consecutive units into chunks within the budget
+    packed = []
+    current = ""
+    for unit in units:
+        if current and estimate_tokens(current + unit) > max_tokens:
+            packed.append(current)
+            current = ""
+        current += unit
+    if current:
+        packed.append(current)
+
+    chunks = []
+    for raw in packed:
+        body = raw.strip()
+        if not body:
+            # Whitespace-only piece: attach it to the previous chunk untouched
+            if chunks:
+                last = chunks[-1]
+                chunks[-1] = last._replace(suffix=last.suffix + raw)
+            else:
+                chunks.append(Chunk(raw, "", ""))
+            continue
+        start = raw.index(body)
+        chunks.append(Chunk(raw[:start], body, raw[start + len(body):]))
+    return chunks
+
+
+def assemble(chunks, bodies):
+    """Reassemble corrected bodies with each chunk's original surrounding whitespace"""
+    return "".join(chunk.prefix + body + chunk.suffix for chunk, body in zip(chunks, bodies))
+
+
+def correct_in_chunks(text, correct_chunk, max_tokens=300, max_parallel=4, on_partial=None):
+    """
+    Correct a large text by fanning its chunks out concurrently.
+
+    Args:
+        text: The full text to correct
+        correct_chunk: callable(body, on_partial) -> corrected body or None
+        max_tokens: Token budget per chunk
+        max_parallel: Maximum number of chunks in flight at once
+        on_partial: Optional callback receiving the reassembled text as chunks stream in
+
+    Returns:
+        The reassembled corrected text, or None if any chunk failed
+    """
+    chunks = split_into_chunks(text, max_tokens)
+    work = [i for i, chunk in enumerate(chunks) if chunk.body]
+    if len(work) <= 1:
+        return None if not work else _correct_single(chunks, work[0], correct_chunk, on_partial)
+
+    log.debug("Fanning out %s chunks (max %s in parallel)", len(work), max_parallel)
+    partials = [""] * len(chunks)
+    partial_lock = threading.Lock()
+
+    def chunk_partial(index):
+        if on_partial is None:
+            return None
+
+        def update(partial_text):
+            with partial_lock:
+                partials[index] = partial_text
+                snapshot = assemble(chunks, partials)
+            on_partial(snapshot)
+        return update
+
+    # A dedicated pool: the caller may itself be running on the app's worker pool
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(work)),
+                            thread_name_prefix="typofix-chunk") as pool:
+        futures = {i: pool.submit(correct_chunk, chunks[i].body, chunk_partial(i)) for i in work}
+        bodies = [chunk.body for chunk in chunks]
+        for i, future in futures.items():
+            result = future.result()
+            if result is None or not result.strip():
+                log.warning("Chunk %s/%s failed, aborting fan-out", i + 1, len(chunks))
+                for other in futures.values():
+                    other.cancel()
+                return None
+            bodies[i] = result.strip()
+    return assemble(chunks, bodies)
+
+
+def _correct_single(chunks, index, correct_chunk, on_partial):
+    """Correct the only non-empty chunk, keeping the surrounding whitespace"""
+    chunk = chunks[index]
+
+    def update(partial_text):
+        on_partial(chunk.prefix + partial_text + chunk.suffix)
+
+    result = correct_chunk(chunk.body, update if on_partial else None)
+    if result is None:
+        return None
+    bodies = [c.body for c in chunks]
+    bodies[index] = result.strip()
+    return assemble(chunks, bodies)
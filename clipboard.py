@@ -0,0 +1,140 @@
+"""
+Clipboard access for TypoFix with change detection instead of fixed delays
+
+A backend exposes a cheap change token (the Win32 clipboard sequence number, a
+content fingerprint, or a counter in the in-memory fake). Capturing a selection
+records the token, sends Ctrl+C and waits only until the token moves, with a
+deadline for applications that never answer.
+"""
+
+import sys
+import threading
+import time
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+# Poll interval while waiting for a change; GetClipboardSequenceNumber is a
+# cheap user32 call, so this can be much tighter than content polling
+SEQUENCE_POLL_SECONDS = 0.002
+CONTENT_POLL_SECONDS = 0.015
+
+# Upper bound for slow applications (Electron apps, remote desktops) to publish a copy
+DEFAULT_CAPTURE_TIMEOUT = 1.0
+
+
+class ClipboardBackend:
+    """Base class: read/write text and report a token that changes with the clipboard"""
+
+    poll_interval = CONTENT_POLL_SECONDS
+
+    def read(self):
+        raise NotImplementedError
+
+    def write(self, text):
+        raise NotImplementedError
+
+    def change_token(self):
+        raise NotImplementedError
+
+    def wait_for_change(self, token, timeout):
+        """Block until change_token() differs from token; True if it did before the deadline"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            if self.change_token() != token:
+                return True
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+
+
+class PyperclipClipboard(ClipboardBackend):
+    """Portable backend: detects changes by comparing clipboard contents"""
+
+    def __init__(self):
+        import pyperclip
+        self._pyperclip = pyperclip
+
+    def read(self):
+        return self._pyperclip.paste()
+
+    def write(self, text):
+        self._pyperclip.copy(text)
+
+    def change_token(self):
+        try:
+            return self._pyperclip.paste()
+        except Exception:
+            return None
+
+
+class Win32Clipboard(PyperclipClipboard):
+    """Windows backend: waits on the clipboard sequence number, which bumps on every change"""
+
+    poll_interval = SEQUENCE_POLL_SECONDS
+
+    def __init__(self):
+        super().__init__()
+        from ctypes import windll
+        self._sequence_number = windll.user32.GetClipboardSequenceNumber
+
+    def change_token(self):
+        return self._sequence_number()
+
+
+class MemoryClipboard(ClipboardBackend):
+    """In-memory fake for tests and benchmarks; waiters are woken by writes"""
+
+    def __init__(self, text=""):
+        self._text = text
+        self._sequence = 0
+        self._changed = threading.Condition()
+
+    def read(self):
+        with self._changed:
+            return self._text
+
+    def write(self, text):
+        with self._changed:
+            self._text = text
+            self._sequence += 1
+            self._changed.notify_all()
+
+    def change_token(self):
+        with self._changed:
+            return self._sequence
+
+    def wait_for_change(self, token, timeout):
+        with self._changed:
+            return self._changed.wait_for(lambda: self._sequence != token, timeout)
+
+
+def default_backend():
+    """Best available backend for this platform"""
+    if sys.platform == "win32":
+        try:
+            return Win32Clipboard()
+        except (ImportError, OSError, AttributeError) as e:
+            log.debug("Clipboard sequence number unavailable, polling contents: %s", e)
+    return PyperclipClipboard()
+
+
+def capture_copy(backend, send_copy, timeout=DEFAULT_CAPTURE_TIMEOUT):
+    """
+    Trigger a copy and read the clipboard as soon as it changes.
+
+    Args:
+        backend: ClipboardBackend to watch
+        send_copy: callable that sends the copy keystroke (e.g. Ctrl+C)
+        timeout: Maximum seconds to wait for the clipboard to change
+
+    Returns:
+        (text, changed); text is the current clipboard content even if the
+        deadline passed, changed tells whether a new copy was observed
+    """
+    token = backend.change_token()
+    send_copy()
+    changed = backend.wait_for_change(token, timeout)
+    return backend.read(), changed
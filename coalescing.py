@@ -0,0 +1,94 @@
+"""
+In-flight request coalescing for TypoFix's Gemini calls
+
+Identical requests that overlap in time share one network call: the first
+caller for a fingerprint runs it, later callers wait on the same future and get
+the same result (or exception). Streaming partials are fanned out to every
+waiter, and a caller that joins late is replayed the latest partial text.
+
+Nothing is kept once the call finishes; repeated requests after that are the
+correction cache's job.
+"""
+
+import threading
+from concurrent.futures import Future
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.future = Future()
+        self.listeners = []
+        self.last_partial = None
+
+
+class InFlightRequests:
+    """Share one in-flight future between concurrent calls with the same key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"sent": 0, "coalesced": 0}
+
+    def run(self, key, fetch, on_partial=None):
+        """
+        Return fetch(on_partial)'s result, joining an identical call already in flight.
+
+        Args:
+            key: Request fingerprint, e.g. ``make_cache_key(mode, model, language, text)``
+            fetch: callable(on_partial) performing the request
+            on_partial: Optional callback for streamed partial text
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _InFlightCall()
+                self.stats["sent"] += 1
+            else:
+                self.stats["coalesced"] += 1
+            if on_partial is not None:
+                call.listeners.append(on_partial)
+            last_partial = call.last_partial
+
+        if not leader:
+            log.debug("Joining in-flight request %s", key)
+            if on_partial is not None and last_partial is not None:
+                on_partial(last_partial)
+            return call.future.result()
+
+        # Only a streaming leader streams; followers joining a plain call get no partials
+        publish = None if on_partial is None else (lambda text: self._publish(call, text))
+        try:
+            result = fetch(publish)
+        except BaseException as e:
+            call.future.set_exception(e)
+            raise
+        else:
+            call.future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def _publish(self, call, text):
+        with self._lock:
+            call.last_partial = text
+            listeners = list(call.listeners)
+        for listener in listeners:
+            listener(text)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def summary(self):
+        """Human-readable coalescing counters"""
+        sent = self.stats["sent"]
+        coalesced = self.stats["coalesced"]
+        total = sent + coalesced
+        share = coalesced / total if total else 0.0
+        return f"{sent} sent, {coalesced} coalesced ({share:.0%} of {total} requests)"
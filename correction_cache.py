@@ -0,0 +1,215 @@
+"""
+Two-tier cache for TypoFix correction results: in-memory LRU + persistent on-disk store
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+
+def default_cache_dir():
+    """Per-user cache directory (%LOCALAPPDATA%\\TypoFix on Windows)"""
+    base = os.getenv("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "TypoFix")
+
+
+def normalize_text(text):
+    """Normalize text for cache lookups: NFC, Unix line endings, no outer whitespace"""
+    text = unicodedata.normalize("NFC", text)
+    return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+
+def make_cache_key(mode, model, language, text):
+    """Build the cache key from mode, model, language and a hash of the normalized text"""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{mode}|{model}|{language}|{digest}"
+
+
+class MemoryLRU:
+    """Thread-safe in-memory LRU mapping with a fixed number of entries"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskStore:
+    """SQLite-backed store with zlib-compressed values, TTL and size-bounded eviction"""
+
+    def __init__(self, path, max_bytes=20 * 1024 * 1024, ttl_seconds=30 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed)")
+        self._purge_expired()
+
+    def get(self, key):
+        """Return (value, created) or None; ``created`` is the time the entry was stored"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        return zlib.decompress(value).decode("utf-8"), created
+
+    def put(self, key, value):
+        blob = zlib.compress(value.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._evict_over_budget()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.execute("VACUUM")
+
+    def total_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _purge_expired(self):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM results WHERE created < ?", (time.time() - self.ttl_seconds,)
+            )
+
+    def _evict_over_budget(self):
+        """Drop least-recently-used rows until the store fits in max_bytes (lock held)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM results ORDER BY accessed").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+
+class CorrectionCache:
+    """Memory LRU in front of a persistent DiskStore; disk hits are promoted to memory"""
+
+    def __init__(self, cache_dir=None, memory_entries=256, max_disk_bytes=20 * 1024 * 1024,
+                 ttl_seconds=30 * 24 * 3600):
+        self.memory = MemoryLRU(memory_entries)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.disk = None
+        path = os.path.join(cache_dir or default_cache_dir(), "corrections.sqlite3")
+        try:
+            self.disk = DiskStore(path, max_bytes=max_disk_bytes, ttl_seconds=ttl_seconds)
+        except (OSError, sqlite3.Error) as e:
+            # Keep working with the memory tier only
+            log.debug("Persistent correction cache unavailable: %s", e)
+
+    def get(self, mode, model, language, text):
+        """Return the cached result or None"""
+        key = make_cache_key(mode, model, language, text)
+        entry = self.memory.get(key)
+        if entry is not None:
+            value, created = entry
+            if time.time() - created <= self.ttl_seconds:
+                self.hits += 1
+                return value
+        if self.disk is not None:
+            try:
+                entry = self.disk.get(key)
+            except sqlite3.Error as e:
+                log.warning("Correction cache read error: %s", e)
+                entry = None
+            if entry is not None:
+                # Keep the stored age, so reads never extend an entry past its TTL
+                self.memory.put(key, entry)
+                self.hits += 1
+                return entry[0]
+        self.misses += 1
+        return None
+
+    def put(self, mode, model, language, text, result):
+        """Store a result in both tiers"""
+        key = make_cache_key(mode, model, language, text)
+        self.memory.put(key, (result, time.time()))
+        if self.disk is not None:
+            try:
+                self.disk.put(key, result)
+            except sqlite3.Error as e:
+                log.warning("Correction cache write error: %s", e)
+
+    def clear(self):
+        """Empty both tiers"""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
@@ -0,0 +1,368 @@
+"""
+GUI-free correction engine for TypoFix
+
+Language detection, Fix, Rewrite and the combined Fix + Rewrite request, with
+the offline language identifier and spelling corrector, the correction cache,
+in-flight request coalescing and chunking of large texts. ``TypoFixApp`` and
+the batch command line (``typofix_batch.py``) both drive one of these; nothing
+here touches Tk, the clipboard or the keyboard.
+"""
+
+import time
+
+from chunking import correct_in_chunks, estimate_tokens
+from coalescing import InFlightRequests
+from correction_cache import CorrectionCache, make_cache_key
+from gemini_client import (GeminiTransport, detect_language_remote, extract_response_text,
+                           stream_generate_content)
+from language_id import LanguageIdentifier
+from latency import LatencyTracker
+from lazy_import import LazyModule
+from local_corrector import LocalCorrector
+from log import get_logger
+from prompts import build_payload, parse_response, streamed_field
+from resilience import CircuitOpenError
+
+log = get_logger(__name__)
+
+requests = LazyModule("requests")
+
+DEFAULT_MODEL = "gemini-1.5-flash-latest"
+DEFAULT_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+
+class CorrectionEngine:
+    """Detection, Fix and Rewrite against Gemini, with local fast paths and caching"""
+
+    def __init__(self, api_key, model=DEFAULT_MODEL, api_base=DEFAULT_API_BASE, transport=None,
+                 cache=None, language_identifier=None, local_corrector=None, latency=None):
+        self.api_key = api_key
+        self.model = model
+        self.generate_url = f"{api_base}/models/{model}:generateContent"
+        self.stream_url = f"{api_base}/models/{model}:streamGenerateContent"
+        # Stream responses when the caller wants partial text (widget preview)
+        self.streaming_enabled = True
+        self.last_stream_timing = None
+
+        # Shared keep-alive transport so requests don't pay a fresh TCP/TLS handshake
+        self.transport = transport or GeminiTransport(self.generate_url)
+
+        # Offline language identifier; Gemini is only asked when it isn't confident
+        self.language_identifier = language_identifier or LanguageIdentifier()
+
+        # Fix/Rewrite results are cached in memory and on disk, so repeated text skips the API
+        self.cache = cache if cache is not None else CorrectionCache()
+        # Identical requests already in flight share one API call instead of sending another
+        self.in_flight = InFlightRequests()
+
+        # Large texts are split at paragraph/sentence boundaries and corrected in parallel
+        self.chunk_max_tokens = 300
+        self.chunk_max_parallel = 4
+
+        # Offline spelling corrector used as an instant path for plain typos
+        self.local_corrector = local_corrector or LocalCorrector()
+
+        self.latency = latency or LatencyTracker()
+
+    def available(self):
+        """False while Gemini calls are failing fast (circuit breaker open)"""
+        return self.transport.available()
+
+    def close(self):
+        """Release pooled connections and flush the correction cache"""
+        self.transport.close()
+        self.cache.close()
+
+    def detect_language(self, text):
+        """Detect the language of the input text, locally when confident enough"""
+        language, confidence = self.language_identifier.identify(text)
+        if confidence >= self.language_identifier.confidence_threshold:
+            log.debug("Detected language locally: '%s' (confidence: %.2f)", language, confidence)
+            return language
+
+        cached_language = self.cache.get("detect", self.model, "", text)
+        if cached_language:
+            log.debug("Detected language from cache: '%s'", cached_language)
+            return cached_language
+
+        if not self.transport.available():
+            log.debug("Gemini unavailable, using local language guess '%s'", language)
+            return language
+
+        log.debug("Local language confidence %.2f below threshold, asking Gemini", confidence)
+        api_url = f"{self.generate_url}?key={self.api_key}"
+        detected_language = self.in_flight.run(
+            make_cache_key("detect", self.model, "", text),
+            lambda _: detect_language_remote(self.transport, api_url, text),
+        )
+        if detected_language != "Unknown":
+            self.cache.put("detect", self.model, "", text, detected_language)
+        return detected_language
+
+    def fix(self, text_to_correct, on_partial=None, language=None):
+        """
+        Fix typos, spelling and grammar in the text; returns the corrected text or None.
+
+        ``language`` skips detection when the caller has already detected it.
+        """
+        log.debug("Fix requested for: '%s'", text_to_correct)
+        
+        # First detect the language, unless the caller already has
+        detected_language = language
+        if detected_language is None:
+            with self.latency.span("language_detection", "fix"):
+                detected_language = self.detect_language(text_to_correct)
+        log.debug("Language detected as: %s", detected_language)
+        
+        cached_result = self.cache.get("fix", self.model, detected_language, text_to_correct)
+        if cached_result is not None:
+            log.debug("Correction cache hit - skipping API request")
+            return cached_result
+        
+        # While Gemini keeps failing, answer from the offline corrector instead of waiting
+        if not self.transport.available():
+            return self.offline_fix(text_to_correct)
+        
+        request_key = make_cache_key("fix", self.model, detected_language, text_to_correct)
+        return self.in_flight.run(
+            request_key,
+            lambda partial: self._fetch_fix(text_to_correct, detected_language, partial),
+            on_partial,
+        )
+
+    def rewrite(self, text_to_rewrite, on_partial=None, language=None):
+        """
+        Rewrite the text for clarity and flow; returns the rewritten text or None.
+
+        ``language`` skips detection when the caller has already detected it.
+        """
+        log.debug("Rewrite requested for: '%s'", text_to_rewrite)
+        
+        # First detect the language, unless the caller already has
+        detected_language = language
+        if detected_language is None:
+            with self.latency.span("language_detection", "rewrite"):
+                detected_language = self.detect_language(text_to_rewrite)
+        log.debug("Language detected as: %s", detected_language)
+        
+        cached_result = self.cache.get("rewrite", self.model, detected_language, text_to_rewrite)
+        if cached_result is not None:
+            log.debug("Correction cache hit - skipping API request")
+            return cached_result
+        
+        # Rewrite has no offline engine, so fail fast while Gemini keeps failing
+        if not self.transport.available():
+            log.info("Gemini is unavailable - Rewrite needs the API (retrying in %.0f s).",
+                     self.transport.breaker.retry_in())
+            return None
+        
+        request_key = make_cache_key("rewrite", self.model, detected_language, text_to_rewrite)
+        return self.in_flight.run(
+            request_key,
+            lambda partial: self._fetch_rewrite(text_to_rewrite, detected_language, partial),
+            on_partial,
+        )
+
+    def fix_and_rewrite(self, text):
+        """
+        Fetch Fix and Rewrite candidates plus the language in one request.
+
+        Returns {"language", "fix", "rewrite"} or None; results are also stored in
+        the correction cache under the detected language.
+        """
+        language, confidence = self.language_identifier.identify(text)
+        if confidence < self.language_identifier.confidence_threshold:
+            language = self.cache.get("detect", self.model, "", text)
+        if language:
+            cached_fix = self.cache.get("fix", self.model, language, text)
+            cached_rewrite = self.cache.get("rewrite", self.model, language, text)
+            if cached_fix is not None and cached_rewrite is not None:
+                log.debug("Combined request answered from the correction cache")
+                return {"language": language, "fix": cached_fix, "rewrite": cached_rewrite}
+        
+        if not self.transport.available():
+            return None
+        
+        return self.in_flight.run(
+            make_cache_key("combined", self.model, language or "", text),
+            lambda _: self._fetch_combined(text, language),
+        )
+
+    def local_fix_candidate(self, text):
+        """Return (corrected_text, confidence) from the offline corrector, or (None, 0.0)"""
+        language, language_confidence = self.language_identifier.identify(text)
+        if not self.local_corrector.supports(language):
+            return None, 0.0
+        
+        corrected_text, confidence = self.local_corrector.correct(text, language)
+        if corrected_text is None or corrected_text == text:
+            # No spelling errors found; only Gemini can catch grammar problems
+            return None, 0.0
+        # An uncertain language means an uncertain choice of dictionary
+        confidence *= min(1.0, language_confidence / self.language_identifier.confidence_threshold)
+        log.debug("Local fix confidence: %.2f (threshold: %.2f)", confidence, self.local_corrector.confidence_threshold)
+        return corrected_text, confidence
+
+    def offline_fix(self, text):
+        """
+        Local correction used while the circuit breaker is open (not cached as a Gemini result).
+
+        Returns None when the corrector found nothing or is below its confidence threshold.
+        """
+        corrected_text, confidence = self.local_fix_candidate(text)
+        if corrected_text is None:
+            log.info("Gemini is unavailable and the offline corrector found nothing to fix.")
+            return None
+        if confidence < self.local_corrector.confidence_threshold:
+            # Failing fast beats returning a doubtful guess as if it were a correction
+            log.info("Gemini is unavailable and the offline correction is not confident (%.2f).", confidence)
+            return None
+        log.info("Gemini is unavailable - using the offline correction.")
+        return corrected_text
+
+    def _fetch_fix(self, text_to_correct, detected_language, on_partial=None):
+        """Send the fix request(s) for a cache miss and cache the result"""
+        call_started = time.perf_counter()
+        if estimate_tokens(text_to_correct) > self.chunk_max_tokens:
+            corrected_text = correct_in_chunks(
+                text_to_correct,
+                lambda chunk, chunk_partial: self._request_fix(chunk, detected_language, chunk_partial),
+                max_tokens=self.chunk_max_tokens,
+                max_parallel=self.chunk_max_parallel,
+                on_partial=on_partial,
+            )
+        else:
+            corrected_text = self._request_fix(text_to_correct, detected_language, on_partial)
+        self.latency.record("correction_call", time.perf_counter() - call_started, "fix")
+        
+        if corrected_text and corrected_text.strip():
+            self.cache.put("fix", self.model, detected_language, text_to_correct, corrected_text)
+        return corrected_text
+
+    def _request_fix(self, text_to_correct, detected_language, on_partial=None):
+        """Send a single fix request for text whose language is already known"""
+        payload = build_payload("fix", text_to_correct, detected_language)
+        log.debug("Making fix API request...")
+        response_text = self._generate_text(payload, self._preview_field(on_partial), mode="fix")
+        corrected_text = parse_response("fix", response_text)
+        log.debug("Final corrected text: '%s'", corrected_text)
+        return corrected_text
+
+    def _fetch_rewrite(self, text_to_rewrite, detected_language, on_partial=None):
+        """Send the rewrite request(s) for a cache miss and cache the result"""
+        call_started = time.perf_counter()
+        if estimate_tokens(text_to_rewrite) > self.chunk_max_tokens:
+            rewritten_text = correct_in_chunks(
+                text_to_rewrite,
+                lambda chunk, chunk_partial: self._request_rewrite(chunk, detected_language, chunk_partial),
+                max_tokens=self.chunk_max_tokens,
+                max_parallel=self.chunk_max_parallel,
+                on_partial=on_partial,
+            )
+        else:
+            rewritten_text = self._request_rewrite(text_to_rewrite, detected_language, on_partial)
+        self.latency.record("correction_call", time.perf_counter() - call_started, "rewrite")
+        
+        if rewritten_text and rewritten_text.strip():
+            self.cache.put("rewrite", self.model, detected_language, text_to_rewrite, rewritten_text)
+        return rewritten_text
+
+    def _request_rewrite(self, text_to_rewrite, detected_language, on_partial=None):
+        """Send a single rewrite request for text whose language is already known"""
+        payload = build_payload("rewrite", text_to_rewrite, detected_language)
+        log.debug("Making rewrite API request...")
+        response_text = self._generate_text(payload, self._preview_field(on_partial), mode="rewrite")
+        rewritten_text = parse_response("rewrite", response_text)
+        log.debug("Final rewritten text: '%s'", rewritten_text)
+        return rewritten_text
+
+    def _fetch_combined(self, text, language_hint=None):
+        """Send the combined request and cache its candidates"""
+        call_started = time.perf_counter()
+        candidates = self._request_combined(text, language_hint)
+        self.latency.record("correction_call", time.perf_counter() - call_started, "combined")
+        if candidates is None:
+            return None
+        
+        language = candidates["language"]
+        if not language_hint:
+            self.cache.put("detect", self.model, "", text, language)
+        self.cache.put("fix", self.model, language, text, candidates["fix"])
+        self.cache.put("rewrite", self.model, language, text, candidates["rewrite"])
+        return candidates
+
+    def _request_combined(self, text, language_hint=None):
+        """Ask for the corrected and rewritten text and the language as one JSON object"""
+        payload = build_payload("combined", text, language_hint)
+        log.debug("Making combined fix/rewrite API request...")
+        candidates = parse_response("combined", self._generate_text(payload, mode="combined"))
+        if candidates is None:
+            return None
+        if language_hint:
+            candidates["language"] = language_hint
+        log.debug("Combined candidates (%s): fix '%s', rewrite '%s'",
+                  candidates["language"], candidates["fix"], candidates["rewrite"])
+        return candidates
+
+    def _preview_field(self, on_partial, field="text"):
+        """Adapt a preview callback to streamed JSON: pass on the decoded field so far"""
+        if on_partial is None:
+            return None
+        
+        def preview(partial_json):
+            partial_text = streamed_field(partial_json, field)
+            if partial_text:
+                on_partial(partial_text)
+        return preview
+
+    def _generate_text(self, payload, on_partial=None, mode=""):
+        """Send a generation request and return the raw response text, or None on failure"""
+        headers = {
+            "Content-Type": "application/json"
+        }
+        
+        try:
+            if self.streaming_enabled and on_partial is not None:
+                api_url = f"{self.stream_url}?alt=sse&key={self.api_key}"
+                text, first_token_seconds, total_seconds = stream_generate_content(
+                    self.transport, api_url, payload, headers, timeout=30, on_text=on_partial
+                )
+                self.last_stream_timing = (first_token_seconds, total_seconds)
+                if first_token_seconds is not None:
+                    self.latency.record("first_token", first_token_seconds, mode)
+                    log.debug("Stream timing - first token: %.0f ms, total: %.0f ms", first_token_seconds * 1000, total_seconds * 1000)
+                return text.strip() if text else None
+            
+            api_url = f"{self.generate_url}?key={self.api_key}"
+            response = self.transport.post(api_url, json=payload, headers=headers, timeout=30)
+            log.debug("Response status code: %s", response.status_code)
+            
+            if response.status_code != 200:
+                log.warning("API error - Status: %s", response.status_code)
+                log.warning("API error - Response: %s", response.text)
+                return None
+            
+            response_data = response.json()
+            log.debug("Response data keys: %s", list(response_data.keys()))
+            
+            text = extract_response_text(response_data)
+            if text is None:
+                log.warning("Failed to extract text from Gemini API response")
+                return None
+            return text.strip()
+            
+        except CircuitOpenError as e:
+            log.info("Skipping Gemini request: %s", e)
+            return None
+        except requests.exceptions.Timeout:
+            log.debug("API request timed out")
+            return None
+        except requests.exceptions.ConnectionError:
+            log.warning("API connection error")
+            return None
+        except requests.exceptions.RequestException as e:
+            log.warning("API request error: %s", e)
+            return None
+        except Exception as e:
+            log.warning("Unexpected error during API call: %s", e)
+            return None
@@ -0,0 +1,256 @@
+"""
+Shared HTTP transport and request helpers for TypoFix's Gemini API calls
+"""
+
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from lazy_import import LazyModule
+from log import get_logger
+from prompts import build_payload, parse_response
+from resilience import RETRYABLE_STATUS, CircuitBreaker, RetryPolicy, parse_retry_after
+
+log = get_logger(__name__)
+
+# requests (and urllib3/ssl behind it) is imported on first use, off the startup path
+requests = LazyModule("requests")
+
+
+class GeminiTransport:
+    """
+    Pooled, keep-alive HTTP transport that keeps a warm connection to Gemini.
+
+    Every POST goes through the retry policy and the circuit breaker, so all
+    Gemini calls (detection, fix, rewrite, streaming) share one failure view.
+    """
+
+    def __init__(self, base_url, pool_size=8, idle_rewarm_seconds=240, warmup_timeout=5,
+                 retry_policy=None, breaker=None, sleep=time.sleep):
+        parts = urlsplit(base_url)
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+        self.idle_rewarm_seconds = idle_rewarm_seconds
+        self.warmup_timeout = warmup_timeout
+        self.pool_size = pool_size
+        self.last_used = 0.0
+        self._lock = threading.Lock()
+        self._session_lock = threading.Lock()
+        self._session = None
+        self._stop_event = threading.Event()
+        self._keepalive_thread = None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self.retries = 0
+
+    def available(self):
+        """False while the circuit breaker is rejecting calls"""
+        return self.breaker.available()
+
+    @property
+    def session(self):
+        """The shared requests.Session, created on first use (normally by the warm-up thread)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        # One session per app: connections are reused across detection, fix and rewrite
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                                                max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        })
+        return session
+
+    def post(self, url, **kwargs):
+        """
+        POST through the pooled session with retries and the circuit breaker.
+
+        Connection failures and retryable statuses (429, 5xx) are retried with
+        backoff; the last retryable response is returned as-is so callers keep
+        their status handling. Read timeouts are not retried, since another full
+        timeout would only double the wait. Raises CircuitOpenError while the
+        breaker is open.
+        """
+        policy = self.retry_policy
+        attempt = 1
+        while True:
+            self.breaker.before_call()
+            self._touch()
+            try:
+                response = self.session.post(url, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                # Includes ConnectTimeout: nothing reached the server
+                self.breaker.record_failure()
+                if attempt >= policy.max_attempts or not self.breaker.available():
+                    raise
+                delay = policy.delay(attempt)
+                log.debug("Gemini connection failed (%s), retry %s in %.2f s", e, attempt, delay)
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    # Any other answer, 4xx included, means the service is up
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = policy.delay(attempt, retry_after)
+                if (attempt >= policy.max_attempts or delay > policy.max_delay
+                        or not self.breaker.available()):
+                    return response
+                response.close()
+                log.debug("Gemini returned %s, retry %s in %.2f s", response.status_code, attempt, delay)
+            finally:
+                self._touch()
+            self.retries += 1
+            attempt += 1
+            self._sleep(delay)
+
+    def warm_up(self):
+        """Open (or re-open) a TCP+TLS connection to the API host ahead of use"""
+        started = time.perf_counter()
+        try:
+            # Any response completes the handshake; the status code is irrelevant
+            response = self.session.head(self.origin, timeout=self.warmup_timeout)
+            response.close()
+            self._touch()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            log.debug("Gemini connection warmed up in %.0f ms", elapsed_ms)
+            return True
+        except requests.exceptions.RequestException as e:
+            log.warning("Gemini warm-up failed: %s", e)
+            return False
+
+    def start(self):
+        """Warm up in the background and keep the pool warm after idle periods"""
+        if self._keepalive_thread and self._keepalive_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._keepalive_thread = threading.Thread(target=self._keepalive_loop, daemon=True)
+        self._keepalive_thread.start()
+
+    def close(self):
+        """Stop the keep-alive thread and release pooled connections"""
+        self._stop_event.set()
+        if self._session is not None:
+            self._session.close()
+
+    def idle_seconds(self):
+        with self._lock:
+            if not self.last_used:
+                return float("inf")
+            return time.monotonic() - self.last_used
+
+    def _touch(self):
+        with self._lock:
+            self.last_used = time.monotonic()
+
+    def _keepalive_loop(self):
+        self.warm_up()
+        # Servers drop idle keep-alive sockets after a few minutes, so re-open
+        # the connection before the next hotkey instead of during it
+        check_interval = max(1, self.idle_rewarm_seconds // 4)
+        while not self._stop_event.wait(check_interval):
+            if self.idle_seconds() >= self.idle_rewarm_seconds:
+                self.warm_up()
+
+
+def detect_language_remote(transport, api_url, text):
+    """Detect the language of the input text using the Gemini API"""
+    log.debug("Detecting language for text: '%s...'", text[:50])
+    payload = build_payload("detect", text)
+
+    try:
+        response = transport.post(api_url, json=payload, timeout=15)
+        
+        if response.status_code != 200:
+            log.warning("Language detection API error - Status: %s", response.status_code)
+            return "Unknown"
+        
+        detected_language = parse_response("detect", extract_response_text(response.json()))
+        if detected_language:
+            log.debug("Detected language: '%s'", detected_language)
+            return detected_language
+        
+        log.warning("Could not detect language, defaulting to Unknown")
+        return "Unknown"
+        
+    except Exception as e:
+        log.warning("Language detection error: %s", e)
+        return "Unknown"
+
+
+def extract_response_text(response_data):
+    """Return the concatenated text parts of the first candidate, or None"""
+    candidates = response_data.get('candidates') or []
+    if not candidates:
+        return None
+    parts = candidates[0].get('content', {}).get('parts') or []
+    texts = [part['text'] for part in parts if 'text' in part]
+    if not texts:
+        return None
+    return "".join(texts)
+
+
+def stream_generate_content(transport, api_url, payload, headers=None, timeout=30, on_text=None):
+    """
+    Call streamGenerateContent (server-sent events) and assemble the response.
+
+    Args:
+        transport: GeminiTransport used for the request
+        api_url: streamGenerateContent URL including ``alt=sse`` and the API key
+        payload: Request body, same shape as for generateContent
+        on_text: Optional callback receiving the accumulated text after each chunk
+
+    Returns:
+        (text, first_token_seconds, total_seconds); text is None on failure
+    """
+    started = time.perf_counter()
+    first_token_seconds = None
+    chunks = []
+    response = transport.post(api_url, json=payload, headers=headers, timeout=timeout, stream=True)
+    try:
+        if response.status_code != 200:
+            log.warning("Streaming API error - Status: %s", response.status_code)
+            log.warning("Streaming API error - Response: %s", response.text)
+            return None, None, time.perf_counter() - started
+
+        # SSE is always UTF-8; without a charset requests would fall back to ISO-8859-1
+        response.encoding = "utf-8"
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            # SSE frames look like "data: {...}"; blank lines separate events
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if not data:
+                continue
+            try:
+                chunk_text = extract_response_text(json.loads(data))
+            except ValueError:
+                log.debug("Skipping malformed stream chunk: '%s'", data[:80])
+                continue
+            if not chunk_text:
+                continue
+            if first_token_seconds is None:
+                first_token_seconds = time.perf_counter() - started
+            chunks.append(chunk_text)
+            if on_text:
+                on_text("".join(chunks))
+    finally:
+        response.close()
+
+    total_seconds = time.perf_counter() - started
+    if not chunks:
+        log.debug("Stream finished without any text")
+        return None, first_token_seconds, total_seconds
+    return "".join(chunks), first_token_seconds, total_seconds
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Render the TypoFix tray icon (a white "T" on green, 64x64) to assets/tray_icon.png
+
+The app loads this file at startup instead of drawing the icon with PIL fonts.
+Re-run after changing the design; it needs no third-party packages.
+
+Usage:
+    python generate_tray_icon.py [output_path]
+"""
+
+import os
+import struct
+import sys
+import zlib
+
+SIZE = 64
+BACKGROUND = (76, 175, 80, 255)  # Green
+FOREGROUND = (255, 255, 255, 255)  # White
+
+# The "T" as (x1, y1, x2, y2) rectangles, end-exclusive: crossbar and stem
+GLYPH = [
+    (18, 16, 46, 22),
+    (29, 16, 35, 49),
+]
+
+
+def render():
+    """Rows of RGBA pixels"""
+    rows = []
+    for y in range(SIZE):
+        row = []
+        for x in range(SIZE):
+            inside = any(x1 <= x < x2 and y1 <= y < y2 for x1, y1, x2, y2 in GLYPH)
+            row.append(FOREGROUND if inside else BACKGROUND)
+        rows.append(row)
+    return rows
+
+
+def encode_png(rows):
+    """Minimal RGBA PNG encoder"""
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    height = len(rows)
+    width = len(rows[0])
+    raw = b"".join(b"\x00" + b"".join(bytes(pixel) for pixel in row) for row in rows)
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw, 9)) + chunk(b"IEND", b""))
+
+
+def main():
+    root = os.path.dirname(os.path.abspath(__file__))
+    output = sys.argv[1] if len(sys.argv) > 1 else os.path.join(root, "assets", "tray_icon.png")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "wb") as f:
+        f.write(encode_png(render()))
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Table-driven chord matching for TypoFix's global hotkeys
+
+Key events are normalized to small integer codes (Windows virtual-key numbers,
+independent of pynput) and matched against a precomputed table keyed by
+``modifier_mask << 16 | key_code``, so each keystroke costs one dict lookup
+however many chords are configured.
+
+Chords are configured in ``hotkeys.json`` in the per-user TypoFix directory:
+
+    {"ctrl+alt+t": "widget", "shift+c": "widget", "ctrl+alt+f": "fix"}
+
+Actions: ``widget`` shows the Fix/Rewrite widget, ``fix`` and ``rewrite``
+correct the selection directly without showing it.
+"""
+
+import json
+import os
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+ACTIONS = ("widget", "fix", "rewrite")
+
+DEFAULT_BINDINGS = {
+    "ctrl+alt+t": "widget",
+    "shift+c": "widget",
+}
+
+MOD_CTRL = 1
+MOD_ALT = 2
+MOD_SHIFT = 4
+MOD_WIN = 8
+
+# Codes for characters without a virtual-key equivalent live above the VK range
+CHAR_BASE = 0x100
+
+# pynput Key names -> virtual-key codes
+SPECIAL_KEYS = {
+    "shift": 0x10, "shift_l": 0xA0, "shift_r": 0xA1,
+    "ctrl": 0x11, "ctrl_l": 0xA2, "ctrl_r": 0xA3,
+    "alt": 0x12, "alt_l": 0xA4, "alt_r": 0xA5, "alt_gr": 0xA5,
+    "cmd": 0x5B, "cmd_l": 0x5B, "cmd_r": 0x5C,
+    "backspace": 0x08, "tab": 0x09, "enter": 0x0D, "esc": 0x1B, "space": 0x20,
+    "page_up": 0x21, "page_down": 0x22, "end": 0x23, "home": 0x24,
+    "left": 0x25, "up": 0x26, "right": 0x27, "down": 0x28,
+    "insert": 0x2D, "delete": 0x2E, "pause": 0x13, "caps_lock": 0x14,
+    "print_screen": 0x2C, "scroll_lock": 0x91, "num_lock": 0x90, "menu": 0x5D,
+}
+SPECIAL_KEYS.update({f"f{n}": 0x6F + n for n in range(1, 25)})
+
+MODIFIER_BITS = {
+    0x10: MOD_SHIFT, 0xA0: MOD_SHIFT, 0xA1: MOD_SHIFT,
+    0x11: MOD_CTRL, 0xA2: MOD_CTRL, 0xA3: MOD_CTRL,
+    0x12: MOD_ALT, 0xA4: MOD_ALT, 0xA5: MOD_ALT,
+    0x5B: MOD_WIN, 0x5C: MOD_WIN,
+}
+
+# Names accepted in chord strings
+_MODIFIER_NAMES = {
+    "ctrl": MOD_CTRL, "control": MOD_CTRL,
+    "alt": MOD_ALT, "option": MOD_ALT,
+    "shift": MOD_SHIFT,
+    "win": MOD_WIN, "cmd": MOD_WIN, "super": MOD_WIN,
+}
+_KEY_ALIASES = {"return": "enter", "escape": "esc", "del": "delete", "ins": "insert"}
+
+
+def char_code(char):
+    """Code for a single typed character"""
+    if char.isascii() and char.isalnum():
+        return ord(char.upper())  # letters and digits share their VK codes
+    return CHAR_BASE + ord(char)
+
+
+def key_code(key):
+    """Normalize a pynput Key/KeyCode (or anything shaped like one) to an integer code"""
+    name = getattr(key, "name", None)
+    if name is not None:
+        return SPECIAL_KEYS.get(name, 0)
+    char = getattr(key, "char", None)
+    # With Ctrl held Windows reports control characters ('\x14' for T), so fall back to vk
+    if char and len(char) == 1 and char.isprintable():
+        return char_code(char)
+    return getattr(key, "vk", None) or 0
+
+
+def parse_chord(chord):
+    """
+    Parse a chord string such as "ctrl+alt+t" into (modifier_mask, key_code).
+
+    Raises:
+        ValueError: if the chord has no key, several keys or an unknown key name
+    """
+    mask = 0
+    code = None
+    for part in chord.lower().replace(" ", "").split("+"):
+        if not part:
+            raise ValueError(f"Empty key in chord '{chord}'")
+        if part in _MODIFIER_NAMES:
+            mask |= _MODIFIER_NAMES[part]
+            continue
+        if code is not None:
+            raise ValueError(f"Chord '{chord}' has more than one non-modifier key")
+        part = _KEY_ALIASES.get(part, part)
+        if part in SPECIAL_KEYS:
+            code = SPECIAL_KEYS[part]
+        elif len(part) == 1:
+            code = char_code(part)
+        else:
+            raise ValueError(f"Unknown key '{part}' in chord '{chord}'")
+    if code is None:
+        raise ValueError(f"Chord '{chord}' has no non-modifier key")
+    return mask, code
+
+
+class ChordMatcher:
+    """Tracks held modifiers as a bitmask and maps (mask, key) to an action in O(1)"""
+
+    __slots__ = ("mask", "_table", "_chords")
+
+    def __init__(self, bindings):
+        self.mask = 0
+        self._table = {}
+        self._chords = {}
+        for chord, action in bindings.items():
+            mask, code = parse_chord(chord)
+            self._table[(mask << 16) | code] = action
+            self._chords[chord] = action
+
+    def press(self, code):
+        """Feed a key press; returns the bound action or None"""
+        bit = MODIFIER_BITS.get(code)
+        if bit:
+            self.mask |= bit
+            return None
+        return self._table.get((self.mask << 16) | code)
+
+    def release(self, code):
+        bit = MODIFIER_BITS.get(code)
+        if bit:
+            self.mask &= ~bit
+
+    def reset(self):
+        """Forget held modifiers, e.g. after releases were swallowed by simulated input"""
+        self.mask = 0
+
+    def chords(self):
+        """Configured chord strings mapped to their actions"""
+        return dict(self._chords)
+
+
+def load_bindings(path):
+    """
+    Read chord bindings from a JSON file, writing the defaults if it doesn't exist.
+
+    Invalid entries are skipped with a warning; if none are usable the defaults apply.
+    """
+    if not os.path.exists(path):
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(DEFAULT_BINDINGS, f, indent=2)
+        except OSError as e:
+            log.warning("Could not write default hotkeys to %s: %s", path, e)
+        return dict(DEFAULT_BINDINGS)
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            configured = json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning("Could not read %s, using default hotkeys: %s", path, e)
+        return dict(DEFAULT_BINDINGS)
+    if not isinstance(configured, dict):
+        log.warning("%s must map chords to actions, using default hotkeys", path)
+        return dict(DEFAULT_BINDINGS)
+
+    bindings = {}
+    for chord, action in configured.items():
+        if action not in ACTIONS:
+            log.warning("Ignoring hotkey '%s': unknown action '%s'", chord, action)
+            continue
+        try:
+            parse_chord(chord)
+        except ValueError as e:
+            log.warning("Ignoring hotkey: %s", e)
+            continue
+        bindings[chord] = action
+    return bindings or dict(DEFAULT_BINDINGS)
@@ -0,0 +1,291 @@
+"""
+Offline language identification for TypoFix using character n-gram profiles
+"""
+
+import math
+import re
+import threading
+import unicodedata
+
+# Minimum confidence for trusting the local result instead of asking Gemini
+DEFAULT_CONFIDENCE_THRESHOLD = 0.85
+
+NGRAM_ORDERS = (1, 2, 3)
+# Cap on the number of n-grams counted as independent evidence, so long texts
+# don't become absurdly over-confident under the naive independence assumption
+MAX_EVIDENCE_NGRAMS = 20
+# Texts with fewer letters than this get proportionally less confidence
+MIN_RELIABLE_LETTERS = 10
+# Overlapping 1-3 grams are far from independent: a short text counts as about one
+# n-gram of evidence per two letters, so a couple of foreign words ("Ciao bella,
+# I miss you") can't make it look confidently foreign
+EVIDENCE_PER_LETTER = 0.5
+# Long texts are identified from this many characters, taken as evenly spaced
+# windows; the evidence cap above makes the rest of the text redundant
+MAX_SAMPLE_CHARS = 2000
+SAMPLE_WINDOWS = 4
+SMOOTHING = 0.5
+
+# Bundled training text: common words and phrases with each language's
+# characteristic letters and diacritics. Language names match what the
+# Gemini prompts expect ("English", "Spanish", ...).
+SEED_CORPORA = {
+    "English": """
+        the of and to in is you that it he was for on are as with his they at be
+        this have from or one had by word but not what all were we when your can
+        said there use an each which she do how their if will up other about out
+        many then them these so some her would make like him into time has look
+        two more write go see number no way could people my than first water been
+        call who oil its now find long down day did get come made may part this
+        hello how are you doing today i am writing to follow up on our meeting
+        thank you for your help please let me know if you have any questions
+        we should meet next week to review the results and the next steps
+        the children were playing outside while their parents were cooking dinner
+        this report describes the changes that we made to the service last month
+        every morning she walks to the station and reads the news on her phone
+        should would could there their through though thought which while where
+        """,
+    "Spanish": """
+        el la de que y a en un ser se no haber por con su para como estar tener le
+        lo todo pero más hacer o poder decir este ir otro ese la si me ya ver porque
+        dar cuando él muy sin vez mucho saber qué sobre mi alguno mismo yo también
+        hasta año dos querer entre así primero desde grande eso ni nos llegar pasar
+        tiempo ella sí día uno bien poco deber entonces poner cosa tanto hombre
+        parecer nuestro tan donde ahora parte después vida quedar siempre creer
+        hablar llevar dejar nada cada seguir menos nuevo encontrar algo solo
+        hola cómo estás espero que todo vaya bien por favor gracias
+        estamos trabajando en el proyecto y necesitamos tu ayuda con la información
+        buenos días señor cómo está usted la reunión será mañana en la oficina
+        el niño pequeño quiere aprender español con sus compañeros de la escuela
+        """,
+    "French": """
+        le de un être et à il avoir ne je son que se qui ce dans en du elle au
+        pour pas que vous par sur faire plus dire me on mon lui nous comme mais
+        pouvoir avec tout y aller voir en bien où sans tu ou leur homme si deux
+        mari moi vouloir te femme venir quand grand celui si notre devoir là jour
+        prendre même votre tout rien petit encore aussi quelque dont tout mer trouver
+        donner temps ça peu même falloir sous parler alors sentir savoir
+        bonjour comment allez-vous je vous écris au sujet de notre rendez-vous merci
+        nous avons travaillé sur le projet et nous espérons que cela vous plaira
+        c'est une très belle journée aujourd'hui je vais à la plage avec mes amis
+        l'été dernier nous sommes allés en vacances à la mer près de la forêt
+        est-ce que vous pouvez m'envoyer le document avant la réunion de demain
+        """,
+    "German": """
+        der die und in den von zu das mit sich des auf für ist im dem nicht ein
+        eine als auch es an werden aus er hat dass sie nach wird bei einer um am
+        sind noch wie einem über einen so zum war haben nur oder aber vor zur bis
+        mehr durch man sein wurde sei ins kann schon wenn ihr mir dann jetzt
+        guten tag wie geht es ihnen ich schreibe wegen unseres termins am montag
+        wir müssen das projekt bis nächste woche fertigstellen und überprüfen
+        ich möchte ihnen für ihre hilfe danken und freue mich auf unser gespräch
+        die straße ist heute sehr schön und die kinder spielen im großen garten
+        können sie mir bitte die unterlagen schicken damit ich sie lesen kann
+        zwischen während gegenüber natürlich wirklich schließlich übrigens
+        """,
+    "Romanian": """
+        și în de la a pe cu nu se că o un din este pentru mai care au sunt ce
+        fi am al lui ca sau dar după fost foarte acest această acum când dacă
+        bună ziua ce mai faci eu sunt bine mulțumesc pentru ajutorul tău
+        vreau să corectez acest text în limba română fără să îl traduc
+        proiectul nostru trebuie să fie gata până săptămâna viitoare
+        copiii se joacă în grădină iar părinții lor stau la masă și vorbesc
+        aș dori să știu dacă putem să ne întâlnim mâine dimineață la birou
+        țara noastră este frumoasă și oamenii sunt foarte primitori
+        întotdeauna încă niciodată deoarece împreună înainte pentru că
+        """,
+    "Italian": """
+        il di che e la per un in è non una sono mi ho lo ma ha le si con ti cosa
+        da se no io come del questo qui bene hai tu sei ci gli della mio più
+        anche solo quando così era lei perché fatto fare tutto niente tutti
+        ciao come stai io sto bene grazie per il tuo aiuto con questo testo
+        vorrei correggere questo documento prima della riunione di domani
+        il progetto deve essere completato entro la prossima settimana
+        siamo andati al mare con gli amici e abbiamo mangiato la pizza
+        questa città è molto bella e la gente è gentile e simpatica
+        perciò però già città università può qualità attività
+        """,
+    "Portuguese": """
+        de a o que e do da em um para é com não uma os no se na por mais as dos
+        como mas foi ao ele das tem à seu sua ou ser quando muito há nos já está
+        eu também só pelo pela até isso ela entre era depois sem mesmo aos ter
+        olá tudo bem obrigado pela sua ajuda com este texto em português
+        gostaria de corrigir este documento antes da reunião de amanhã
+        o projeto precisa ser concluído até a próxima semana
+        nós fomos à praia com os nossos amigos e comemos peixe
+        a informação está disponível na página da organização
+        você não pode esquecer que não são questões fáceis então
+        """,
+    "Dutch": """
+        de en van ik te dat die in een hij het niet zijn is was op aan met als voor
+        had er maar om hem dan zou of wat mijn men dit zo door over ze zich bij ook
+        tot je mij uit der daar haar naar heb hoe heeft hebben deze u want nog
+        hallo hoe gaat het met jou ik wil deze tekst graag verbeteren
+        het project moet volgende week klaar zijn en we hebben jouw hulp nodig
+        de kinderen spelen in de tuin terwijl de ouders koffie drinken
+        kunt u mij alstublieft de documenten sturen voor de vergadering
+        goedemorgen bedankt voor uw bericht wij nemen zo snel mogelijk contact op
+        """,
+}
+
+# Scripts that identify a single language on their own. Cyrillic and Han are
+# shared by several languages, so they get a lower confidence and usually
+# defer to Gemini.
+SCRIPT_LANGUAGES = (
+    ("GREEK", "Greek", 0.95),
+    ("HANGUL", "Korean", 0.98),
+    ("HIRAGANA", "Japanese", 0.98),
+    ("KATAKANA", "Japanese", 0.98),
+    ("ARABIC", "Arabic", 0.85),
+    ("HEBREW", "Hebrew", 0.95),
+    ("THAI", "Thai", 0.98),
+    ("DEVANAGARI", "Hindi", 0.85),
+    ("CJK", "Chinese", 0.80),
+    ("CYRILLIC", "Russian", 0.60),
+)
+
+_NON_LETTERS = re.compile(r"[^\w']+|[\d_]+")
+
+
+def _normalize(text):
+    """Lowercase and collapse everything that isn't a letter into single spaces"""
+    text = unicodedata.normalize("NFC", text.lower())
+    return " ".join(_NON_LETTERS.sub(" ", text).split())
+
+
+def _ngrams(text):
+    """Yield character n-grams of each word, padded with spaces at the edges"""
+    for word in text.split():
+        padded = f" {word} "
+        for n in NGRAM_ORDERS:
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram != " ":
+                    yield gram
+
+
+def _sample(text):
+    """Whole words from evenly spaced windows of a long text, or the text itself"""
+    if len(text) <= MAX_SAMPLE_CHARS:
+        return text
+    size = MAX_SAMPLE_CHARS // SAMPLE_WINDOWS
+    step = (len(text) - size) // (SAMPLE_WINDOWS - 1)
+    windows = []
+    for start in range(0, step * SAMPLE_WINDOWS, step):
+        # Drop the words cut off at either edge of the window
+        words = text[start:start + size].split()[1:-1]
+        windows.append(" ".join(words))
+    return "\n".join(windows)
+
+
+class LanguageIdentifier:
+    """Naive Bayes classifier over character 1-3 grams, built from bundled seed text"""
+
+    def __init__(self, corpora=None, confidence_threshold=DEFAULT_CONFIDENCE_THRESHOLD):
+        self.corpora = corpora or SEED_CORPORA
+        self.confidence_threshold = confidence_threshold
+        self.languages = list(self.corpora)
+        self._profiles = None
+        self._unseen = None
+        self._lock = threading.Lock()
+
+    def _build_profiles(self):
+        vocabulary = set()
+        counts = {}
+        for language, corpus in self.corpora.items():
+            language_counts = {}
+            for gram in _ngrams(_normalize(corpus)):
+                language_counts[gram] = language_counts.get(gram, 0) + 1
+            counts[language] = language_counts
+            vocabulary.update(language_counts)
+
+        profiles = {}
+        unseen = {}
+        vocabulary_size = len(vocabulary)
+        for language, language_counts in counts.items():
+            total = sum(language_counts.values()) + SMOOTHING * vocabulary_size
+            profiles[language] = {
+                gram: math.log((count + SMOOTHING) / total)
+                for gram, count in language_counts.items()
+            }
+            unseen[language] = math.log(SMOOTHING / total)
+        self._profiles = profiles
+        self._unseen = unseen
+
+    def _ensure_profiles(self):
+        if self._profiles is None:
+            with self._lock:
+                if self._profiles is None:
+                    self._build_profiles()
+
+    def _detect_script(self, text):
+        """Return (language, confidence) when a non-Latin script dominates the text"""
+        letters = [ch for ch in text if ch.isalpha()]
+        if not letters:
+            return None
+        script_counts = {}
+        for ch in letters:
+            if ch.isascii():
+                continue
+            name = unicodedata.name(ch, "")
+            for script, language, confidence in SCRIPT_LANGUAGES:
+                if name.startswith(script):
+                    key = (language, confidence)
+                    script_counts[key] = script_counts.get(key, 0) + 1
+                    break
+        if not script_counts:
+            return None
+        # Japanese text mixes kana with Han characters
+        japanese = sum(c for (lang, _), c in script_counts.items() if lang == "Japanese")
+        if japanese:
+            return "Japanese", 0.98
+        (language, confidence), count = max(script_counts.items(), key=lambda item: item[1])
+        if count * 2 < len(letters):
+            return None
+        return language, confidence
+
+    def identify(self, text):
+        """
+        Identify the language of the text.
+
+        Returns:
+            (language_name, confidence) where confidence is in [0, 1]
+        """
+        if not text or not text.strip():
+            return "Unknown", 0.0
+
+        text = _sample(text)
+        script_result = self._detect_script(text)
+        if script_result:
+            return script_result
+
+        self._ensure_profiles()
+        normalized = _normalize(text)
+        grams = list(_ngrams(normalized))
+        if not grams:
+            return "Unknown", 0.0
+
+        scores = {}
+        for language in self.languages:
+            profile = self._profiles[language]
+            unseen = self._unseen[language]
+            scores[language] = sum(profile.get(gram, unseen) for gram in grams)
+
+        # Posterior over languages with the evidence scaled to the text's length and
+        # capped (see EVIDENCE_PER_LETTER and MAX_EVIDENCE_NGRAMS)
+        letters = len(normalized) - normalized.count(" ")
+        evidence = min(MAX_EVIDENCE_NGRAMS, letters * EVIDENCE_PER_LETTER)
+        weight = min(1.0, evidence / len(grams))
+        best = max(scores.values())
+        exps = {lang: math.exp((score - best) * weight) for lang, score in scores.items()}
+        total = sum(exps.values())
+        language = max(exps, key=exps.get)
+        length_factor = min(1.0, letters / MIN_RELIABLE_LETTERS)
+        return language, exps[language] / total * length_factor
+
+    def detect(self, text):
+        """Return the language name if confident enough, otherwise None"""
+        language, confidence = self.identify(text)
+        if confidence >= self.confidence_threshold:
+            return language
+        return None
@@ -0,0 +1,172 @@
+"""
+Low-overhead latency tracing for the hotkey-to-paste pipeline
+
+Each (stage, mode) pair gets an HDR-style histogram: log-linear buckets with a
+fixed relative error, so recording is O(1), memory is bounded and percentiles
+stay accurate from microseconds to minutes.
+"""
+
+import json
+import os
+import threading
+import time
+
+# Each power of two is split into 2**(SUB_BUCKET_BITS - 1) linear sub-buckets,
+# giving ~3% worst-case relative error
+SUB_BUCKET_BITS = 6
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF_BITS = SUB_BUCKET_BITS - 1
+
+
+def _bucket_index(value):
+    """Map a non-negative integer (microseconds) to its log-linear bucket"""
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << SUB_BUCKET_HALF_BITS) + (value >> shift)
+
+
+def _bucket_value(index):
+    """Upper bound of the values that map to a bucket"""
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift = (index >> SUB_BUCKET_HALF_BITS) - 1
+    mantissa = index - (shift << SUB_BUCKET_HALF_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """HDR-style histogram of durations in microseconds"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, micros):
+        micros = max(0, int(micros))
+        index = _bucket_index(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+
+    def percentile(self, pct):
+        """Value (microseconds) at or below which pct percent of samples fall"""
+        if not self.count:
+            return 0
+        target = max(1, int(round(pct / 100 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(_bucket_value(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class _Span:
+    __slots__ = ("tracker", "stage", "mode", "started")
+
+    def __init__(self, tracker, stage, mode):
+        self.tracker = tracker
+        self.stage = stage
+        self.mode = mode
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracker.record_ns(self.stage, time.perf_counter_ns() - self.started, self.mode)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class LatencyTracker:
+    """Per-stage, per-mode latency histograms with JSON-lines export"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def span(self, stage, mode=""):
+        """Context manager timing a block of code"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, mode)
+
+    def record(self, stage, seconds, mode=""):
+        """Record a duration measured elsewhere (in seconds)"""
+        if self.enabled:
+            self.record_ns(stage, int(seconds * 1e9), mode)
+
+    def record_ns(self, stage, nanoseconds, mode=""):
+        key = (stage, mode)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.record(nanoseconds // 1000)
+
+    def snapshot(self):
+        """List of per-(stage, mode) summaries in milliseconds"""
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return [
+                {
+                    "stage": stage,
+                    "mode": mode,
+                    "count": histogram.count,
+                    "mean_ms": round(histogram.mean() / 1000, 3),
+                    "p50_ms": round(histogram.percentile(50) / 1000, 3),
+                    "p95_ms": round(histogram.percentile(95) / 1000, 3),
+                    "p99_ms": round(histogram.percentile(99) / 1000, 3),
+                    "max_ms": round(histogram.max / 1000, 3),
+                }
+                for (stage, mode), histogram in items
+            ]
+
+    def summary_text(self):
+        """Plain-text table for display in a dialog"""
+        rows = self.snapshot()
+        if not rows:
+            return "No latency samples recorded yet."
+        lines = [f"{'Stage':<22}{'Mode':<9}{'N':>5}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)"]
+        for row in rows:
+            lines.append(
+                f"{row['stage']:<22}{row['mode'] or '-':<9}{row['count']:>5}"
+                f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+    def export_jsonl(self, path):
+        """Append one JSON line per (stage, mode) histogram summary"""
+        exported_at = time.time()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for row in self.snapshot():
+                row["exported_at"] = exported_at
+                row["session_started_at"] = self.started_at
+                f.write(json.dumps(row) + "\n")
+        return path
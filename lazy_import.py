@@ -0,0 +1,59 @@
+"""
+Deferred module imports for faster TypoFix startup
+
+``LazyModule("pyautogui")`` stands in for the module and imports it on first
+attribute access, so call sites keep their ``pyautogui.hotkey(...)`` form while
+the import cost moves off the startup path. ``preload`` imports a set of lazy
+modules ahead of time, typically from a background thread right after the
+hotkey listener is live.
+"""
+
+import importlib
+import threading
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first use (thread-safe)"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attribute):
+        # Only called for names not set in __init__, i.e. the module's own attributes
+        return getattr(self.load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def preload(*modules):
+    """Import lazy modules (or module names) now; failures are logged, not raised"""
+    for module in modules:
+        name = module._name if isinstance(module, LazyModule) else module
+        try:
+            if isinstance(module, LazyModule):
+                module.load()
+            else:
+                importlib.import_module(module)
+        except Exception as e:
+            log.debug("Preloading %s failed: %s", name, e)
@@ -0,0 +1,390 @@
+"""
+Offline typo correction for TypoFix using symmetric-delete (SymSpell-style) candidate lookup
+
+Dictionaries are plain "<word> <count>" text files in ``dictionaries/``. On first
+use each one is compiled into a compact binary file in the user cache directory
+and memory-mapped, so lookups page in only the parts of the index they touch.
+
+Binary layout (little-endian):
+    header   : magic b"TFD2", u32 max_edit_distance, u32 prefix_length,
+               u32 word_count, u32 delete_count, u32 strings_size
+    offsets  : u32[word_count + 1]  byte offsets of each word in the strings blob
+    counts   : u32[word_count]      word frequencies
+    hashes   : u64[delete_count]    sorted hashes of delete variants (low ID_BITS zero)
+    word_ids : u32[delete_count]    word id for each hash entry
+    strings  : UTF-8 words, concatenated
+
+Compilation packs each (hash, word id) pair into one u64 kept in compact arrays
+bucketed by the top hash bits, so only one bucket at a time is sorted as Python
+objects and peak memory stays a small multiple of the output size.
+"""
+
+import bisect
+import hashlib
+from array import array
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+
+from correction_cache import default_cache_dir
+from log import get_logger
+
+log = get_logger(__name__)
+
+MAGIC = b"TFD2"
+HEADER = struct.Struct("<4s5I")
+MAX_EDIT_DISTANCE = 2
+# Low hash bits hold the word id while compiling; lookups verify every candidate,
+# so the remaining 44 hash bits only need to keep collisions rare
+ID_BITS = 20
+ID_MASK = (1 << ID_BITS) - 1
+HASH_MASK = ((1 << 64) - 1) ^ ID_MASK
+BUCKET_SHIFT = 58  # 64 sort buckets by the top hash bits
+PREFIX_LENGTH = 7
+
+# Minimum overall confidence for pasting the local result without asking Gemini
+DEFAULT_CONFIDENCE_THRESHOLD = 0.80
+
+# Below this many words a dictionary misses too many valid words for any
+# out-of-vocabulary word to be confidently called a typo
+MIN_CONFIDENT_WORDS = 20000
+
+# Highest confidence for a word that parses as an inflection but is also one edit
+# from a dictionary word; kept below the threshold
+INFLECTION_CONFIDENCE_CAP = 0.6
+
+# Suffixes that turn a known word into a valid form of it: (suffix, stem endings to try)
+_INFLECTIONS = (
+    ("'s", ("",)), ("ies", ("y",)), ("ied", ("y",)), ("es", ("", "e")), ("s", ("",)),
+    ("ed", ("", "e")), ("d", ("",)), ("ing", ("", "e")), ("er", ("", "e")),
+    ("est", ("", "e")), ("ly", ("", "le")), ("ness", ("",)),
+)
+
+# Language names as returned by language_id, mapped to dictionary file names
+DICTIONARY_LANGUAGES = {
+    "English": "en",
+}
+
+_TOKEN = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?|\s+|.", re.UNICODE)
+_SENTENCE_END = frozenset(".!?…")
+
+
+def dictionary_source_dir():
+    """Bundled dictionaries, also inside a PyInstaller one-file build"""
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, "dictionaries")
+
+
+def _hash(text):
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & HASH_MASK
+
+
+def _file_magic(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC))
+
+
+def _write_little_endian(f, values):
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(f)
+
+
+def _deletes(word, max_distance):
+    """All strings reachable from word by deleting up to max_distance characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        next_frontier -= results
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment (Damerau-Levenshtein) distance, or max_distance + 1 if larger"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+def compile_dictionary(source_path, target_path, max_distance=MAX_EDIT_DISTANCE,
+                       prefix_length=PREFIX_LENGTH):
+    """Compile a "<word> <count>" text dictionary into the memory-mappable binary format"""
+    counts = {}
+    with open(source_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            word, _, count = line.strip().rpartition(" ")
+            word = word.lower()
+            counts[word] = counts.get(word, 0) + int(count)
+
+    words = sorted(counts, key=lambda w: -counts[w])
+    if len(words) > ID_MASK + 1:
+        raise ValueError(f"Dictionary has more than {ID_MASK + 1} words: {source_path}")
+    # Packed hash | word_id values, bucketed by top bits so each bucket sorts on its own
+    buckets = [array("Q") for _ in range(1 << (64 - BUCKET_SHIFT))]
+    for word_id, word in enumerate(words):
+        for variant in _deletes(word[:prefix_length], max_distance):
+            packed = _hash(variant) | word_id
+            buckets[packed >> BUCKET_SHIFT].append(packed)
+    delete_count = sum(len(bucket) for bucket in buckets)
+
+    encoded = [word.encode("utf-8") for word in words]
+    offsets = array("I", [0])
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+    strings = b"".join(encoded)
+
+    os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+    temp_path = target_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, max_distance, prefix_length, len(words), delete_count, len(strings)))
+        _write_little_endian(f, offsets)
+        _write_little_endian(f, array("I", (min(counts[w], 0xFFFFFFFF) for w in words)))
+        for index, bucket in enumerate(buckets):
+            buckets[index] = bucket = array("Q", sorted(bucket))
+            _write_little_endian(f, array("Q", (packed & HASH_MASK for packed in bucket)))
+        for bucket in buckets:
+            _write_little_endian(f, array("I", (packed & ID_MASK for packed in bucket)))
+        f.write(strings)
+    os.replace(temp_path, target_path)
+
+
+class SymSpellDictionary:
+    """Read-only view over a compiled dictionary file through mmap"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.max_distance, self.prefix_length, word_count, delete_count, strings_size = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a TypoFix dictionary: {path}")
+
+        view = memoryview(self._map)
+        position = HEADER.size
+        self._offsets = view[position:position + 4 * (word_count + 1)].cast("I")
+        position += 4 * (word_count + 1)
+        self._counts = view[position:position + 4 * word_count].cast("I")
+        position += 4 * word_count
+        self._hashes = view[position:position + 8 * delete_count].cast("Q")
+        position += 8 * delete_count
+        self._word_ids = view[position:position + 4 * delete_count].cast("I")
+        position += 4 * delete_count
+        self._strings_start = position
+        self.word_count = word_count
+
+    def word(self, word_id):
+        start = self._strings_start + self._offsets[word_id]
+        end = self._strings_start + self._offsets[word_id + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def count(self, word_id):
+        return self._counts[word_id]
+
+    def _ids_for(self, variant):
+        key = _hash(variant)
+        index = bisect.bisect_left(self._hashes, key)
+        while index < len(self._hashes) and self._hashes[index] == key:
+            yield self._word_ids[index]
+            index += 1
+
+    def frequency(self, word):
+        """Frequency of an exact dictionary word, or 0 if it isn't known"""
+        for word_id in self._ids_for(word[:self.prefix_length]):
+            if self.word(word_id) == word:
+                return self.count(word_id)
+        return 0
+
+    def lookup(self, word, max_distance=None):
+        """
+        Suggest dictionary words close to the input.
+
+        Returns:
+            List of (word, distance, count) sorted by distance, then by frequency
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        prefix = word[:self.prefix_length]
+        seen = set()
+        suggestions = []
+        for variant in _deletes(prefix, max_distance):
+            for word_id in self._ids_for(variant):
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+                candidate = self.word(word_id)
+                distance = edit_distance(word, candidate, max_distance)
+                if distance <= max_distance:
+                    suggestions.append((candidate, distance, self.count(word_id)))
+        suggestions.sort(key=lambda s: (s[1], -s[2]))
+        return suggestions
+
+
+def _match_case(original, replacement):
+    if original.isupper() and len(original) > 1:
+        return replacement.upper()
+    if original[:1].isupper():
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
+
+
+class LocalCorrector:
+    """Instant word-level typo correction with a confidence score"""
+
+    def __init__(self, cache_dir=None, confidence_threshold=DEFAULT_CONFIDENCE_THRESHOLD):
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), "dictionaries")
+        self.confidence_threshold = confidence_threshold
+        self._dictionaries = {}
+        self._lock = threading.Lock()
+
+    def supports(self, language):
+        return language in DICTIONARY_LANGUAGES
+
+    def preload(self, language):
+        """Compile/map a language's dictionary ahead of the first correction"""
+        return self._dictionary(language) is not None
+
+    def ready(self, language):
+        """True once a language's dictionary has been loaded (or failed to), without waiting"""
+        return DICTIONARY_LANGUAGES.get(language) in self._dictionaries
+
+    def _dictionary(self, language):
+        """Load (compiling on first use) the dictionary for a language, or None"""
+        code = DICTIONARY_LANGUAGES.get(language)
+        if code is None:
+            return None
+        with self._lock:
+            if code in self._dictionaries:
+                return self._dictionaries[code]
+            source = os.path.join(dictionary_source_dir(), f"{code}.txt")
+            target = os.path.join(self.cache_dir, f"{code}.tfd")
+            dictionary = None
+            try:
+                if (not os.path.exists(target)
+                        or os.path.getmtime(target) < os.path.getmtime(source)
+                        or _file_magic(target) != MAGIC):
+                    log.debug("Compiling %s dictionary to %s", language, target)
+                    compile_dictionary(source, target)
+                dictionary = SymSpellDictionary(target)
+            except (OSError, ValueError, struct.error) as e:
+                log.warning("Could not load %s dictionary: %s", language, e)
+            self._dictionaries[code] = dictionary
+            return dictionary
+
+    def correct(self, text, language):
+        """
+        Correct misspelled words in the text.
+
+        Returns:
+            (corrected_text, confidence) or (None, 0.0) if the language isn't supported
+        """
+        dictionary = self._dictionary(language)
+        if dictionary is None:
+            return None, 0.0
+
+        pieces = []
+        confidence = 1.0
+        sentence_start = True
+        for token in _TOKEN.findall(text):
+            if not token[0].isalpha():
+                pieces.append(token)
+                if token in _SENTENCE_END or "\n" in token:
+                    sentence_start = True
+                continue
+            corrected, token_confidence = self._correct_word(dictionary, token, sentence_start)
+            sentence_start = False
+            pieces.append(corrected)
+            confidence = min(confidence, token_confidence)
+        return "".join(pieces), confidence
+
+    def _correct_word(self, dictionary, token, sentence_start=False):
+        """Return (replacement, confidence) for a single word token"""
+        lowered = token.lower()
+        if dictionary.frequency(lowered):
+            return token, 1.0
+        if token.isupper() and len(token) > 1:
+            return token, 0.9  # acronyms such as API or JSON
+        if token[:1].isupper() and not sentence_start:
+            return token, 0.9  # names such as Zoom or Rex are never "corrected"
+        suggestions = dictionary.lookup(lowered)
+        looks_inflected = _is_inflection(dictionary, lowered)
+        if looks_inflected and not any(distance == 1 for _, distance, _ in suggestions):
+            return token, 0.9  # a valid form of a known word, e.g. logs or zoomed
+        if not suggestions:
+            # Probably a name or a word we don't know: let Gemini decide
+            return token, 0.3
+
+        # An unknown word may be a valid word the dictionary lacks, so only a single
+        # edit towards a clearly dominant, common word is trusted locally
+        best_word, best_distance, best_count = suggestions[0]
+        if best_distance > 1 or dictionary.word_count < MIN_CONFIDENT_WORDS:
+            confidence = 0.5
+        elif len(lowered) <= 3 and not _is_transposition(lowered, best_word):
+            confidence = 0.6  # short words have many valid neighbours (ok, dev, npm)
+        else:
+            confidence = 0.95
+        rivals = [count for _, distance, count in suggestions[1:] if distance == best_distance]
+        if rivals:
+            # Ambiguous: scale by how dominant the best candidate is
+            confidence *= best_count / (best_count + rivals[0])
+        if looks_inflected:
+            # Stem plus suffix, yet one edit from a real word (stoped, runing, tets):
+            # it may be a typo or a form the dictionary lacks, so Gemini decides
+            confidence = min(confidence, INFLECTION_CONFIDENCE_CAP)
+        return _match_case(token, best_word), confidence
+
+
+def _is_inflection(dictionary, word):
+    """True if word is a known word plus a regular suffix (logs, parked, zooming)"""
+    for suffix, endings in _INFLECTIONS:
+        if not word.endswith(suffix):
+            continue
+        stem = word[:-len(suffix)]
+        if len(stem) < 3:
+            continue
+        candidates = [stem + ending for ending in endings]
+        if len(stem) > 3 and stem[-1] == stem[-2]:
+            candidates.append(stem[:-1])  # stopped, running
+        if any(dictionary.frequency(candidate) for candidate in candidates):
+            return True
+    return False
+
+
+def _is_transposition(word, candidate):
+    """True if candidate is word with two adjacent letters swapped (teh -> the)"""
+    if len(word) != len(candidate):
+        return False
+    differences = [i for i, (a, b) in enumerate(zip(word, candidate)) if a != b]
+    return (len(differences) == 2 and differences[1] == differences[0] + 1
+            and word[differences[0]] == candidate[differences[1]]
+            and word[differences[1]] == candidate[differences[0]])
@@ -0,0 +1,160 @@
+"""
+Asynchronous, level-gated logging for TypoFix
+
+Modules log through ``get_logger(__name__)`` with %-style arguments, so a
+disabled level costs one integer comparison and no string formatting. Enabled
+records are put on a bounded queue without being formatted; a background
+listener formats them (shortening large payloads such as captured text) and
+writes them to a rotating file in the per-user TypoFix folder, and to the
+console when one is attached.
+
+The level comes from the TYPOFIX_LOG_LEVEL environment variable (default INFO).
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOGGER_NAME = "typofix"
+LOG_FILE_NAME = "typofix.log"
+DEFAULT_LEVEL = "INFO"
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(threadName)s %(name)s: %(message)s"
+
+QUEUE_SIZE = 10000
+MAX_FILE_BYTES = 2 * 1024 * 1024
+BACKUP_COUNT = 3
+
+# Longest string argument written out in full; longer ones keep their head and length
+MAX_ARG_CHARS = 200
+
+_listener = None
+_queue_handler = None
+
+
+def get_logger(name=None):
+    """Logger under the TypoFix hierarchy, e.g. get_logger(__name__)"""
+    if not name or name == "__main__":
+        return logging.getLogger(LOGGER_NAME)
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def shorten(value, limit=MAX_ARG_CHARS):
+    """Truncate long strings, noting the original length"""
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]}... [{len(value)} chars]"
+    return value
+
+
+class TruncatingFormatter(logging.Formatter):
+    """Formatter that shortens oversized string arguments before interpolating them"""
+
+    def format(self, record):
+        # RotatingFileHandler formats once to check the size, so only shorten once
+        if not getattr(record, "shortened", False):
+            record.shortened = True
+            self._shorten_payload(record)
+        return super().format(record)
+
+    @staticmethod
+    def _shorten_payload(record):
+        if isinstance(record.args, tuple):
+            record.args = tuple(shorten(arg) for arg in record.args)
+        elif isinstance(record.args, dict):
+            record.args = {key: shorten(value) for key, value in record.args.items()}
+        elif isinstance(record.msg, str) and not record.args:
+            record.msg = shorten(record.msg, MAX_ARG_CHARS * 4)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread without formatting them.
+
+    When the queue is full the record is dropped and counted instead of
+    blocking the caller (which may be the keyboard hook).
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread; only exception text is
+        # captured here, because the traceback is gone by the time it runs
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(log_dir, level=None, console=True):
+    """
+    Start the background log writer (idempotent).
+
+    Args:
+        log_dir: Directory for the rotating log file
+        level: Level name or number; defaults to TYPOFIX_LOG_LEVEL or INFO
+        console: Also write to stderr when the process has one
+
+    Returns:
+        Path of the log file, or None if only the console is available
+    """
+    global _listener, _queue_handler
+    root = logging.getLogger(LOGGER_NAME)
+    level = level or os.getenv("TYPOFIX_LOG_LEVEL", DEFAULT_LEVEL)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    if _listener is not None:
+        return _log_path(log_dir)
+
+    formatter = TruncatingFormatter(LOG_FORMAT)
+    handlers = []
+    path = _log_path(log_dir)
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=MAX_FILE_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8"
+        )
+        handlers.append(file_handler)
+    except OSError as e:
+        path = None
+        if sys.stderr is not None:
+            sys.stderr.write(f"TypoFix: could not open log file: {e}\n")
+    # Windowed (PyInstaller) builds have no console streams
+    if console and sys.stderr is not None:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(QUEUE_SIZE))
+    root.addHandler(_queue_handler)
+    root.propagate = False
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers,
+                                               respect_handler_level=True)
+    _listener.start()
+    return path
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    logging.getLogger(LOGGER_NAME).removeHandler(_queue_handler)
+    if _queue_handler.dropped and sys.stderr is not None:
+        sys.stderr.write(f"TypoFix: {_queue_handler.dropped} log records dropped\n")
+    _listener = None
+    _queue_handler = None
+
+
+def _log_path(log_dir):
+    return os.path.join(log_dir, LOG_FILE_NAME)
@@ -0,0 +1,204 @@
+"""
+Cached monitor layout and widget placement for TypoFix
+
+Displays are enumerated once and indexed by x-range so "which monitor contains
+this point" is a bisect plus a check of the few monitors sharing that column.
+The layout is re-enumerated only when a cheap display fingerprint changes
+(monitor count and virtual-screen bounds on Windows) or, as a fallback for
+changes the fingerprint can't see such as a moved taskbar, after a TTL.
+
+Enumeration and fingerprint functions are injectable, so placement can be
+exercised with synthetic layouts.
+"""
+
+import bisect
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+# Full monitor rectangle plus its work area (the part not covered by taskbars)
+Monitor = namedtuple("Monitor", ["x", "y", "width", "height",
+                                 "work_x", "work_y", "work_width", "work_height",
+                                 "is_primary"])
+
+DEFAULT_TTL_SECONDS = 60
+# Gap kept between the widget and the work-area edges, and below the selection
+EDGE_MARGIN = 10
+GAP_ABOVE = 20
+GAP_BELOW = 25
+
+
+def make_monitor(x, y, width, height, work=None, is_primary=False):
+    """Build a Monitor; the work area defaults to the full bounds"""
+    work_x, work_y, work_width, work_height = work or (x, y, width, height)
+    return Monitor(x, y, width, height, work_x, work_y, work_width, work_height, is_primary)
+
+
+def _enumerate_win32():
+    import win32api
+    monitors = []
+    for handle, _, _ in win32api.EnumDisplayMonitors():
+        info = win32api.GetMonitorInfo(handle)
+        left, top, right, bottom = info["Monitor"]
+        work_left, work_top, work_right, work_bottom = info["Work"]
+        monitors.append(make_monitor(
+            left, top, right - left, bottom - top,
+            (work_left, work_top, work_right - work_left, work_bottom - work_top),
+            bool(info.get("Flags", 0) & 1),  # MONITORINFOF_PRIMARY
+        ))
+    return monitors
+
+
+def _enumerate_screeninfo():
+    from screeninfo import get_monitors
+    return [make_monitor(m.x, m.y, m.width, m.height, is_primary=bool(getattr(m, "is_primary", False)))
+            for m in get_monitors()]
+
+
+def enumerate_monitors():
+    """Current monitors with work areas (Win32), falling back to screeninfo bounds"""
+    if sys.platform == "win32":
+        try:
+            return _enumerate_win32()
+        except Exception as e:
+            log.debug("Win32 monitor enumeration failed, using screeninfo: %s", e)
+    return _enumerate_screeninfo()
+
+
+def display_fingerprint():
+    """Cheap value that changes when monitors are added, removed or rearranged"""
+    if sys.platform != "win32":
+        return None
+    from ctypes import windll
+    metrics = windll.user32.GetSystemMetrics
+    # SM_CMONITORS, SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN
+    return tuple(metrics(index) for index in (80, 76, 77, 78, 79))
+
+
+class MonitorLayout:
+    """Monitor topology cache answering point-to-monitor queries from a precomputed index"""
+
+    def __init__(self, enumerate_fn=enumerate_monitors, fingerprint_fn=display_fingerprint,
+                 ttl_seconds=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self._enumerate = enumerate_fn
+        self._fingerprint = fingerprint_fn
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._monitors = ()
+        self._edges = []
+        self._columns = []
+        self._loaded_at = None
+        self._loaded_fingerprint = None
+        self.refreshes = 0
+
+    def invalidate(self):
+        """Force re-enumeration on the next query (e.g. after WM_DISPLAYCHANGE)"""
+        with self._lock:
+            self._loaded_at = None
+
+    def monitors(self):
+        with self._lock:
+            self._ensure_fresh()
+            return list(self._monitors)
+
+    def monitor_at(self, x, y):
+        """Monitor containing the point, else the nearest one; None if no monitors are known"""
+        with self._lock:
+            self._ensure_fresh()
+            if not self._monitors:
+                return None
+            column = bisect.bisect_right(self._edges, x) - 1
+            if 0 <= column < len(self._columns):
+                for monitor in self._columns[column]:
+                    if monitor.y <= y < monitor.y + monitor.height:
+                        return monitor
+            return min(self._monitors, key=lambda m: _distance_squared(m, x, y))
+
+    def place(self, anchor_x, anchor_y, width, height):
+        """Top-left position for a width x height widget above (or below) the anchor point"""
+        monitor = self.monitor_at(anchor_x, anchor_y)
+        if monitor is None:
+            return anchor_x - width // 2, anchor_y - height - GAP_ABOVE
+        return place_widget(monitor, anchor_x, anchor_y, width, height)
+
+    def _ensure_fresh(self):
+        """Re-enumerate when the fingerprint changed or the TTL expired (lock held)"""
+        now = self._clock()
+        if self._loaded_at is not None and now - self._loaded_at < self.ttl_seconds:
+            fingerprint = self._current_fingerprint()
+            if fingerprint == self._loaded_fingerprint:
+                return
+        else:
+            fingerprint = self._current_fingerprint()
+        try:
+            monitors = self._enumerate()
+        except Exception as e:
+            log.warning("Could not enumerate monitors: %s", e)
+            if self._monitors:
+                return
+            monitors = []
+        self._index(monitors)
+        self._loaded_at = now
+        self._loaded_fingerprint = fingerprint
+        self.refreshes += 1
+        log.debug("Monitor layout refreshed: %s monitor(s)", len(monitors))
+
+    def _current_fingerprint(self):
+        if self._fingerprint is None:
+            return None
+        try:
+            return self._fingerprint()
+        except Exception:
+            return None
+
+    def _index(self, monitors):
+        """Split the x axis at every monitor edge; each column lists the monitors spanning it"""
+        self._monitors = tuple(monitors)
+        edges = sorted({edge for m in monitors for edge in (m.x, m.x + m.width)})
+        columns = []
+        for left in edges[:-1]:
+            columns.append(tuple(m for m in monitors if m.x <= left < m.x + m.width))
+        self._edges = edges[:-1]
+        self._columns = columns
+
+
+def _distance_squared(monitor, x, y):
+    dx = max(monitor.x - x, 0, x - (monitor.x + monitor.width - 1))
+    dy = max(monitor.y - y, 0, y - (monitor.y + monitor.height - 1))
+    return dx * dx + dy * dy
+
+
+def place_widget(monitor, anchor_x, anchor_y, width, height):
+    """
+    Position a widget centred above the anchor, kept inside the monitor's work area.
+
+    Falls back to below the anchor when there is no room above.
+    """
+    left = monitor.work_x
+    top = monitor.work_y
+    right = monitor.work_x + monitor.work_width
+    bottom = monitor.work_y + monitor.work_height
+
+    pos_x = anchor_x - width // 2  # Center horizontally on selection
+    pos_y = anchor_y - height - GAP_ABOVE  # Position above the selection
+
+    # Adjust position to keep widget fully on screen
+    if pos_x + width > right:
+        pos_x = right - width - EDGE_MARGIN
+    if pos_x < left:
+        pos_x = left + EDGE_MARGIN
+
+    # For Y position, if there's no room above, show below
+    if pos_y < top + EDGE_MARGIN:
+        pos_y = anchor_y + GAP_BELOW
+
+    # Final bounds check for Y
+    if pos_y + height > bottom:
+        pos_y = bottom - height - EDGE_MARGIN
+    return pos_x, pos_y
@@ -0,0 +1,135 @@
+"""
+Prompt layer for TypoFix's Gemini requests
+
+Each mode's fixed requirements live in a ``systemInstruction`` that is
+byte-identical across requests; the user turn carries only the language and the
+text. Answers are requested as JSON (``responseMimeType`` plus a schema), so a
+response is parsed with one ``json.loads`` instead of stripping labels and
+quotes, and streamed JSON can still be previewed with ``streamed_field``.
+"""
+
+import json
+import re
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+# Explicit context caching (cachedContents) is deliberately not used: these
+# instructions are roughly 30-130 tokens, far below the smallest prefix the API
+# will cache (32,768 tokens for the 1.5 models), so a cache could not even be
+# created. Keeping each instruction byte-identical across requests still leaves
+# the prefix eligible for implicit caching on models that do it automatically.
+
+FIX_INSTRUCTION = """You correct text for the user.
+- Fix only spelling errors, typos and obvious grammar mistakes.
+- Write in the language given in the request; never translate.
+- Preserve the meaning, style, tone and formatting (line breaks, paragraphs) exactly.
+- If there are no errors, return the text unchanged.
+Answer as JSON: {"text": corrected text}."""
+
+REWRITE_INSTRUCTION = """You rewrite text for the user.
+- Improve word placement, sentence structure and logical flow only.
+- Write in the language given in the request; never translate.
+- Keep ALL information and meaning; add or remove nothing.
+- Keep the formatting (paragraphs, line breaks), style and tone.
+- If the text is already well structured, change it minimally.
+Answer as JSON: {"text": rewritten text}."""
+
+COMBINED_INSTRUCTION = """You produce two versions of the user's text, both in its own language; never translate.
+- "fixed": fix only spelling errors, typos and obvious grammar mistakes; preserve meaning, style, tone and formatting; unchanged if there are no errors.
+- "rewritten": improve word placement, sentence structure and logical flow; keep all information, formatting, style and tone; add or remove nothing.
+- "language": the language of the text, named in English (e.g. "Romanian").
+Answer as JSON with these three fields."""
+
+DETECT_INSTRUCTION = """Identify the language of the user's text.
+Answer as JSON: {"language": language name in English, e.g. "Romanian"}."""
+
+
+def _object_schema(*fields):
+    return {
+        "type": "OBJECT",
+        "properties": {field: {"type": "STRING"} for field in fields},
+        "required": list(fields),
+    }
+
+
+# mode -> (system instruction, response schema)
+MODES = {
+    "fix": (FIX_INSTRUCTION, _object_schema("text")),
+    "rewrite": (REWRITE_INSTRUCTION, _object_schema("text")),
+    "combined": (COMBINED_INSTRUCTION, _object_schema("language", "fixed", "rewritten")),
+    "detect": (DETECT_INSTRUCTION, _object_schema("language")),
+}
+
+
+def user_message(text, language=None):
+    """The per-request part of a prompt: the language (when known) and the text"""
+    if language:
+        return f"Language: {language}\n\n{text}"
+    return text
+
+
+def build_payload(mode, text, language=None):
+    """generateContent request body for a mode"""
+    instruction, schema = MODES[mode]
+    return {
+        "systemInstruction": {"parts": [{"text": instruction}]},
+        "contents": [{"role": "user", "parts": [{"text": user_message(text, language)}]}],
+        "generationConfig": {
+            "responseMimeType": "application/json",
+            "responseSchema": schema,
+        },
+    }
+
+
+def parse_response(mode, response_text):
+    """
+    Decode a JSON answer in one pass.
+
+    Returns the text for fix/rewrite, the language name for detect, a
+    {"language", "fix", "rewrite"} dict for combined, or None if the answer
+    is missing, malformed or empty.
+    """
+    if not response_text:
+        return None
+    try:
+        data = json.loads(response_text, strict=False)
+        if mode == "combined":
+            result = {"language": data["language"].strip(), "fix": data["fixed"].strip(),
+                      "rewrite": data["rewritten"].strip()}
+            return result if all(result.values()) else None
+        value = data["language" if mode == "detect" else "text"].strip()
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        log.warning("Could not parse %s response: %s", mode, e)
+        return None
+    return value or None
+
+
+# Body of a JSON string up to its closing quote or the end of what has arrived;
+# a trailing lone backslash is left out
+_STRING_BODY = re.compile(r'(?:[^"\\]|\\.)*')
+
+
+def streamed_field(partial_json, field="text"):
+    """
+    Decoded value of a string field in a JSON document that is still streaming in.
+
+    Used to preview ``{"text": "Partial answ`` as ``Partial answ``; returns ""
+    until the field's value has started.
+    """
+    key = partial_json.find(f'"{field}"')
+    if key < 0:
+        return ""
+    colon = partial_json.find(":", key + len(field) + 2)
+    quote = partial_json.find('"', colon + 1) if colon >= 0 else -1
+    if quote < 0:
+        return ""
+    body = _STRING_BODY.match(partial_json, quote + 1).group()
+    while body:
+        try:
+            return json.loads(f'"{body}"', strict=False)
+        except ValueError:
+            # Cut inside a \uXXXX escape: drop it until the rest arrives
+            body = body[:body.rfind("\\")]
+    return ""
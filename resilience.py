@@ -0,0 +1,162 @@
+"""
+Retry and circuit-breaker policy for TypoFix's Gemini calls
+
+Transient failures (connection errors, 429 and 5xx responses) are retried with
+capped exponential backoff and full jitter, honouring ``Retry-After`` when the
+server sends one. Repeated failures open a circuit breaker: while it is open,
+calls fail at once with ``CircuitOpenError`` instead of each waiting for a
+timeout, and after a cool-down a single probe decides whether to close it again.
+
+Both classes take an injectable clock/random source so they can be driven
+deterministically.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+# Statuses worth retrying: timeouts, rate limiting and server-side failures
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open"""
+
+    def __init__(self, retry_in):
+        super().__init__(f"Gemini circuit breaker is open (next probe in {retry_in:.0f} s)")
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment is None:
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, moment.timestamp() - now)
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts=3, base_delay=0.25, max_delay=4.0, rng=random.random):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Seconds to sleep before retry number ``attempt`` (1-based).
+
+        A server-provided Retry-After wins over the backoff; the caller decides
+        whether a Retry-After beyond max_delay is worth waiting for.
+        """
+        if retry_after is not None:
+            return retry_after
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling * self._rng()
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: calls pass; ``failure_threshold`` consecutive failures open it.
+    open: calls are rejected until ``reset_timeout`` has passed.
+    half-open: one probe call passes; success closes, failure re-opens.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.stats = {"opened": 0, "rejected": 0, "failures": 0, "successes": 0}
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def available(self):
+        """True when a call would be let through now (does not claim the probe)"""
+        with self._lock:
+            state = self._current_state()
+            return state == CLOSED or (state == HALF_OPEN and not self._probe_in_flight)
+
+    def retry_in(self):
+        """Seconds until the next probe is allowed (0 unless open)"""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def before_call(self):
+        """Claim permission for a call; raises CircuitOpenError when it must not be sent"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self.stats["rejected"] += 1
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - self._clock())
+        raise CircuitOpenError(retry_in)
+
+    def record_success(self):
+        with self._lock:
+            self.stats["successes"] += 1
+            if self._state != CLOSED:
+                log.info("Gemini circuit breaker closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.stats["failures"] += 1
+            self._failures += 1
+            state = self._current_state()
+            if state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if state != OPEN:
+                    self.stats["opened"] += 1
+                    log.warning("Gemini circuit breaker opened after %s failure(s); failing fast for %.0f s",
+                                self._failures, self.reset_timeout)
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def _current_state(self):
+        """State with the open -> half-open transition applied (lock held)"""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
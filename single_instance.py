@@ -0,0 +1,189 @@
+"""
+Single-instance guard for TypoFix with a local IPC hand-off
+
+The first instance takes an exclusive lock on ``instance.lock`` in the per-user
+TypoFix folder and listens on a loopback socket, publishing its port and a
+random token in ``instance.json``. A later launch fails to take the lock,
+forwards its command (show instructions, correct the clipboard, quit) to the
+running instance and exits, so only one keyboard hook and one widget ever exist.
+
+The lock is held by the open file handle, so the OS releases it if the running
+instance crashes; a leftover ``instance.json`` is never trusted on its own.
+"""
+
+import json
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+
+from log import get_logger
+
+log = get_logger(__name__)
+
+LOCK_FILE = "instance.lock"
+STATE_FILE = "instance.json"
+
+# Commands a second launch can forward to the running instance
+COMMANDS = ("show", "correct", "quit", "ping")
+
+CONNECT_TIMEOUT = 0.5
+# How long a second launch waits for a starting instance to begin listening
+STARTUP_WAIT_SECONDS = 5.0
+STARTUP_POLL_SECONDS = 0.05
+MAX_MESSAGE_BYTES = 4096
+
+
+def _try_lock(handle):
+    """Take a non-blocking exclusive lock on an open file; False if another process holds it"""
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class InstanceGuard:
+    """Exclusive per-user instance lock plus the loopback command channel"""
+
+    def __init__(self, state_dir):
+        self.state_dir = state_dir
+        self.lock_path = os.path.join(state_dir, LOCK_FILE)
+        self.state_path = os.path.join(state_dir, STATE_FILE)
+        self._lock_handle = None
+        self._server = None
+        self._token = None
+        self._handler = None
+
+    @property
+    def is_primary(self):
+        return self._lock_handle is not None
+
+    def acquire(self):
+        """Become the running instance; False when another instance holds the lock"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        handle = open(self.lock_path, "a+b")
+        if not _try_lock(handle):
+            handle.close()
+            return False
+        self._lock_handle = handle
+        return True
+
+    def serve(self, handler):
+        """
+        Accept forwarded commands on a loopback socket and pass them to handler.
+
+        handler(command) runs on the IPC thread and returns a short reply string.
+        """
+        if not self.is_primary:
+            raise RuntimeError("serve() needs the instance lock")
+        self._handler = handler
+        self._token = secrets.token_hex(16)
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(4)
+        self._server = server
+        port = server.getsockname()[1]
+
+        # Write-then-rename so a second launch never reads a half-written file
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "port": port, "token": self._token}, f)
+        os.replace(temp_path, self.state_path)
+
+        threading.Thread(target=self._accept_loop, name="typofix-ipc", daemon=True).start()
+        log.debug("Instance channel listening on 127.0.0.1:%s", port)
+
+    def _accept_loop(self):
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return  # Closed
+            with connection:
+                try:
+                    self._serve_connection(connection)
+                except (OSError, ValueError) as e:
+                    log.debug("Dropped instance message: %s", e)
+
+    def _serve_connection(self, connection):
+        connection.settimeout(CONNECT_TIMEOUT)
+        message = json.loads(_read_line(connection))
+        if not secrets.compare_digest(str(message.get("token", "")), self._token):
+            _send_line(connection, {"ok": False, "error": "bad token"})
+            return
+        command = message.get("command")
+        if command not in COMMANDS:
+            _send_line(connection, {"ok": False, "error": f"unknown command {command!r}"})
+            return
+        log.info("Received '%s' from another TypoFix launch", command)
+        reply = "pong" if command == "ping" else self._handler(command)
+        _send_line(connection, {"ok": True, "reply": reply})
+
+    def forward(self, command, wait_seconds=STARTUP_WAIT_SECONDS):
+        """
+        Send a command to the running instance and return its reply.
+
+        Waits up to wait_seconds for an instance that is still starting to publish
+        its port. Raises OSError when no instance answers.
+        """
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown command: {command}")
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            try:
+                return self._send(command)
+            except (OSError, ValueError) as e:
+                if time.monotonic() >= deadline:
+                    raise OSError(f"No running TypoFix instance answered: {e}") from e
+                time.sleep(STARTUP_POLL_SECONDS)
+
+    def _send(self, command):
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        with socket.create_connection(("127.0.0.1", state["port"]), timeout=CONNECT_TIMEOUT) as connection:
+            _send_line(connection, {"token": state["token"], "command": command})
+            reply = json.loads(_read_line(connection))
+        if not reply.get("ok"):
+            raise ValueError(reply.get("error", "rejected"))
+        return reply.get("reply", "")
+
+    def close(self):
+        """Stop listening and release the lock (the running instance is shutting down)"""
+        if self._server is not None:
+            try:
+                self._server.close()
+            except OSError:
+                pass
+            self._server = None
+            try:
+                os.remove(self.state_path)
+            except OSError:
+                pass
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
+
+
+def _send_line(connection, message):
+    connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _read_line(connection):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = connection.recv(MAX_MESSAGE_BYTES)
+        if not chunk:
+            break
+        data += chunk
+        if len(data) > MAX_MESSAGE_BYTES:
+            raise ValueError("Message too long")
+    return data.decode("utf-8")
@@ -0,0 +1,37 @@
+import pytest
+
+from chunking import correct_in_chunks, split_into_chunks
+
+
+def identity(body, on_partial=None):
+    return body
+
+
+PARAGRAPH = "Teh quick brown fox jumps over the lazy dog. " * 12
+
+ROUND_TRIP_TEXTS = {
+    "indented-long-sentence": "\n    " + " ".join(["word"] * 500),
+    "tab-and-trailing-newlines": "  \t" + " ".join(["word"] * 500) + "\n\n",
+    "paragraphs": f"\n\n{PARAGRAPH}\n\n\n   {PARAGRAPH}\r\n\r\n\t{PARAGRAPH}  ",
+    "single-huge-word": "   " + "x" * 4000 + "   ",
+    "huge-leading-whitespace": " " * 2000 + "tail",
+}
+
+
+@pytest.mark.parametrize("text", ROUND_TRIP_TEXTS.values(), ids=ROUND_TRIP_TEXTS.keys())
+def test_chunks_concatenate_to_the_original(text):
+    chunks = split_into_chunks(text, 50)
+    assert "".join(chunk.prefix + chunk.body + chunk.suffix for chunk in chunks) == text
+
+
+@pytest.mark.parametrize("text", ROUND_TRIP_TEXTS.values(), ids=ROUND_TRIP_TEXTS.keys())
+def test_identity_correction_keeps_whitespace(text):
+    assert correct_in_chunks(text, identity, max_tokens=300) == text
+    assert correct_in_chunks(text, identity, max_tokens=50, max_parallel=2) == text
+
+
+def test_failed_chunk_fails_the_whole_text():
+    def failing(body, on_partial=None):
+        return None if "fox" in body else body
+
+    assert correct_in_chunks(PARAGRAPH + "\n\nno animals here", failing, max_tokens=40) is None
@@ -0,0 +1,42 @@
+import threading
+import time
+
+from clipboard import MemoryClipboard, capture_copy
+
+
+def delayed_write(clipboard, text, delay=0.05):
+    """A send_copy that publishes the copy later, like a slow application"""
+    def send_copy():
+        threading.Timer(delay, clipboard.write, (text,)).start()
+    return send_copy
+
+
+def test_capture_returns_as_soon_as_the_clipboard_changes():
+    clipboard = MemoryClipboard("old")
+    started = time.perf_counter()
+    text, changed = capture_copy(clipboard, delayed_write(clipboard, "selected text"), timeout=5)
+    assert (text, changed) == ("selected text", True)
+    assert time.perf_counter() - started < 1
+
+
+def test_capture_reports_no_change_when_the_deadline_expires():
+    clipboard = MemoryClipboard("old")
+    started = time.perf_counter()
+    text, changed = capture_copy(clipboard, lambda: None, timeout=0.1)
+    assert (text, changed) == ("old", False)
+    assert time.perf_counter() - started >= 0.1
+
+
+def test_copying_the_same_text_again_counts_as_a_change():
+    clipboard = MemoryClipboard("same text")
+    text, changed = capture_copy(clipboard, delayed_write(clipboard, "same text"), timeout=5)
+    assert (text, changed) == ("same text", True)
+
+
+def test_wait_for_change_compares_against_the_given_token():
+    clipboard = MemoryClipboard()
+    token = clipboard.change_token()
+    assert not clipboard.wait_for_change(token, 0.01)
+    clipboard.write("copied")
+    assert clipboard.wait_for_change(token, 0)
+    assert not clipboard.wait_for_change(clipboard.change_token(), 0.01)
@@ -0,0 +1,34 @@
+import pytest
+
+from language_id import MAX_SAMPLE_CHARS, LanguageIdentifier, _sample
+
+
+@pytest.fixture(scope="module")
+def identifier():
+    return LanguageIdentifier()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Hello how are you", "English"),
+    ("Gracias por tu ayuda", "Spanish"),
+    ("Ich bin müde heute", "German"),
+    ("Bonjor, j'ai besoins d'aide pour corriger ce texte.", "French"),
+])
+def test_short_single_language_texts_are_confident(identifier, text, expected):
+    assert identifier.detect(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Ciao bella, I miss you",
+    "I love pizza and pasta",
+])
+def test_short_mixed_texts_are_left_to_gemini(identifier, text):
+    assert identifier.detect(text) is None
+
+
+def test_long_texts_are_scored_from_a_bounded_sample(identifier):
+    text = "Das ist ein langer Text über das Wetter und die Straße. " * 20000
+    sample = _sample(text)
+    assert len(sample) <= MAX_SAMPLE_CHARS
+    assert sample.split() and set(sample.split()) <= set(text.split())
+    assert identifier.detect(text) == "German"
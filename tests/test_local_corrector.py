@@ -0,0 +1,57 @@
+import pytest
+
+from local_corrector import LocalCorrector
+
+
+@pytest.fixture(scope="module")
+def corrector(tmp_path_factory):
+    corrector = LocalCorrector(cache_dir=str(tmp_path_factory.mktemp("cache")))
+    assert corrector.preload("English")
+    return corrector
+
+
+@pytest.mark.parametrize("text", [
+    "Check the logs.",
+    "Join the Zoom call.",
+    "I love my dog Rex.",
+    "The cart was parked near the barn.",
+    "She zoomed in and texted me.",
+])
+def test_valid_words_names_and_inflections_are_left_alone(corrector, text):
+    assert corrector.correct(text, "English") == (text, 1.0)
+
+
+@pytest.mark.parametrize("text", [
+    "Push it to the repo and update the config.",
+    "ok, the dev env is fine",
+    "Wich one is beter?",
+])
+def test_unknown_words_are_not_confident(corrector, text):
+    _, confidence = corrector.correct(text, "English")
+    assert confidence < corrector.confidence_threshold
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Teh quick brown fox.", "The quick brown fox."),
+    ("Definately seperate the enviroment.", "Definitely separate the environment."),
+])
+def test_plain_typos_are_fixed_confidently(corrector, text, expected):
+    corrected, confidence = corrector.correct(text, "English")
+    assert corrected == expected
+    assert confidence >= corrector.confidence_threshold
+
+
+@pytest.mark.parametrize("word", ["tets", "stoped", "runing", "useing", "begining"])
+def test_inflection_lookalikes_one_edit_from_a_word_are_not_confident(corrector, word):
+    _, confidence = corrector.correct(f"The {word} went well.", "English")
+    assert confidence < corrector.confidence_threshold
+
+
+@pytest.mark.parametrize("text", [
+    "Thsi is a tets of the sytem.",
+    "Teh man stoped runing.",
+    "We are useing teh new sistem.",
+])
+def test_sentences_with_inflection_lookalikes_go_to_gemini(corrector, text):
+    _, confidence = corrector.correct(text, "English")
+    assert confidence < corrector.confidence_threshold
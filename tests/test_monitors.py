@@ -0,0 +1,98 @@
+from monitors import EDGE_MARGIN, GAP_ABOVE, GAP_BELOW, MonitorLayout, make_monitor, place_widget
+
+# Primary 1920x1080 with a 40 px taskbar at the bottom; a secondary monitor to the
+# left and slightly higher (negative origin) with a 60 px taskbar on its left edge
+PRIMARY = make_monitor(0, 0, 1920, 1080, work=(0, 0, 1920, 1040), is_primary=True)
+SECONDARY = make_monitor(-1280, -200, 1280, 1024, work=(-1220, -200, 1220, 1024))
+WIDTH, HEIGHT = 300, 60
+
+
+class FakeDisplays:
+    """Injectable enumeration, fingerprint and clock for MonitorLayout"""
+
+    def __init__(self, monitors):
+        self.monitors = list(monitors)
+        self.fingerprint = 1
+        self.now = 0.0
+        self.enumerations = 0
+
+    def enumerate(self):
+        self.enumerations += 1
+        return list(self.monitors)
+
+    def layout(self, ttl_seconds=60):
+        return MonitorLayout(self.enumerate, lambda: self.fingerprint, ttl_seconds, lambda: self.now)
+
+
+def test_widget_is_centred_above_the_anchor_when_it_fits():
+    assert place_widget(PRIMARY, 960, 500, WIDTH, HEIGHT) == (960 - WIDTH // 2, 500 - HEIGHT - GAP_ABOVE)
+
+
+def test_widget_is_clamped_to_the_right_work_area_edge():
+    x, _ = place_widget(PRIMARY, 1910, 500, WIDTH, HEIGHT)
+    assert x == 1920 - WIDTH - EDGE_MARGIN
+
+
+def test_widget_stays_off_the_left_taskbar_of_a_negative_origin_monitor():
+    x, y = place_widget(SECONDARY, -1270, 300, WIDTH, HEIGHT)
+    assert x == -1220 + EDGE_MARGIN
+    assert y == 300 - HEIGHT - GAP_ABOVE
+
+
+def test_widget_goes_below_the_anchor_at_the_top_of_a_negative_origin_monitor():
+    _, y = place_widget(SECONDARY, -600, -190, WIDTH, HEIGHT)
+    assert y == -190 + GAP_BELOW
+
+
+def test_widget_is_kept_above_the_bottom_taskbar():
+    # Anchor inside the taskbar strip: the widget must end above the work area's bottom
+    _, y = place_widget(PRIMARY, 960, 1070, WIDTH, HEIGHT)
+    assert y == 1040 - HEIGHT - EDGE_MARGIN
+    assert y + HEIGHT <= 1040
+
+
+def test_layout_places_on_the_monitor_under_the_anchor():
+    layout = FakeDisplays([PRIMARY, SECONDARY]).layout()
+    assert layout.monitor_at(-10, -150) == SECONDARY
+    assert layout.monitor_at(10, 10) == PRIMARY
+    assert layout.place(-1270, 300, WIDTH, HEIGHT)[0] == -1220 + EDGE_MARGIN
+
+
+def test_point_outside_every_monitor_uses_the_nearest_one():
+    layout = FakeDisplays([PRIMARY, SECONDARY]).layout()
+    assert layout.monitor_at(2500, 500) == PRIMARY
+    assert layout.monitor_at(-2000, 0) == SECONDARY
+
+
+def test_layout_is_reused_while_the_fingerprint_is_unchanged():
+    displays = FakeDisplays([PRIMARY])
+    layout = displays.layout()
+    for _ in range(5):
+        layout.monitor_at(10, 10)
+    assert displays.enumerations == 1
+
+
+def test_layout_is_re_enumerated_when_the_fingerprint_changes():
+    displays = FakeDisplays([PRIMARY])
+    layout = displays.layout()
+    assert layout.monitor_at(-10, -150) == PRIMARY
+
+    displays.monitors.append(SECONDARY)
+    displays.fingerprint = 2
+    assert layout.monitor_at(-10, -150) == SECONDARY
+    assert displays.enumerations == 2
+
+
+def test_layout_is_re_enumerated_when_the_ttl_expires():
+    displays = FakeDisplays([PRIMARY])
+    layout = displays.layout(ttl_seconds=60)
+    layout.monitors()
+
+    # A moved taskbar does not change the fingerprint
+    moved_taskbar = make_monitor(0, 0, 1920, 1080, work=(0, 40, 1920, 1040), is_primary=True)
+    displays.monitors = [moved_taskbar]
+    displays.now = 59.0
+    assert layout.monitors() == [PRIMARY]
+    displays.now = 60.0
+    assert layout.monitors() == [moved_taskbar]
+    assert displays.enumerations == 2
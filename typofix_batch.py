@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Headless batch correction with the TypoFix engine
+
+Reads documents from files, glob patterns or stdin, corrects them concurrently
+and streams one JSON line per document as soon as it finishes (completion
+order, identified by "id"). With --checkpoint, the ids of finished documents
+are recorded and skipped on the next run, so an interrupted batch resumes where
+it stopped. A failed document is not recorded and is retried on resume; to keep
+one record per id in the appended output, failures are then only reported on
+stderr, not written as error records. If the process dies between writing a
+record and recording its id, that document is written again on resume, so
+readers should let the last record for an id win.
+
+Input units:
+    default        each file (or all of stdin) is one document, id = path ("-" for stdin)
+    --lines        each non-empty line is a document, id = "path:line"
+    --jsonl-input  each line is {"text": ..., "id": optional}, id defaults to "path:line"
+
+Output records:
+    {"id", "mode", "language", "result", "changed", "seconds", "error"}
+    --mode both answers with "fix" and "rewrite" instead of "result"
+
+Usage:
+    python typofix_batch.py docs/*.md --mode fix -o fixed.jsonl --checkpoint fixed.ckpt
+    python typofix_batch.py "notes/**/*.txt" --lines --concurrency 16
+    cat comments.jsonl | python typofix_batch.py --jsonl-input --mode both
+
+The API key comes from --api-key or GEMINI_API_KEY (a .env file is read when
+python-dotenv is installed). Throughput is reported on stderr at the end.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from chunking import estimate_tokens
+from correction_cache import default_cache_dir
+from engine import DEFAULT_API_BASE, DEFAULT_MODEL, CorrectionEngine
+from gemini_client import GeminiTransport
+from log import get_logger, setup_logging, shutdown_logging
+
+log = get_logger(__name__)
+
+MODES = ("fix", "rewrite", "both", "detect")
+
+
+def expand_inputs(patterns):
+    """Paths for the given files and glob patterns, in order; "-" stands for stdin"""
+    paths = []
+    for pattern in patterns or ["-"]:
+        if pattern == "-" or not glob.has_magic(pattern):
+            paths.append(pattern)
+            continue
+        matches = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        if not matches:
+            log.warning("No files match %s", pattern)
+        paths.extend(matches)
+    return paths
+
+
+def _open_input(path):
+    if path == "-":
+        return sys.stdin
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def read_documents(paths, unit="file"):
+    """Yield (id, text) pairs lazily, so stdin and large inputs are streamed"""
+    for path in paths:
+        try:
+            source = _open_input(path)
+        except OSError as e:
+            log.warning("Cannot read %s: %s", path, e)
+            continue
+        try:
+            if unit == "file":
+                yield path, source.read()
+                continue
+            for line_number, line in enumerate(source, 1):
+                line = line.rstrip("\r\n")
+                if not line.strip():
+                    continue
+                if unit == "lines":
+                    yield f"{path}:{line_number}", line
+                    continue
+                try:
+                    record = json.loads(line)
+                    yield str(record.get("id", f"{path}:{line_number}")), record["text"]
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    log.warning("Skipping malformed record %s:%s: %s", path, line_number, e)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+
+class Checkpoint:
+    """Append-only file of finished document ids (one JSON string per line)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.done.add(json.loads(line))
+                    except ValueError:
+                        pass  # A line cut short by the interruption
+        self._file = open(path, "a", encoding="utf-8") if path else None
+
+    def __contains__(self, document_id):
+        return document_id in self.done
+
+    def add(self, document_id):
+        if self._file is None:
+            return
+        self._file.write(json.dumps(document_id) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def correct_document(engine, mode, text, local_first=False):
+    """The mode-specific fields of an output record; raises RuntimeError on failure"""
+    if mode == "both":
+        # The combined request reports the language itself, so nothing is detected up front
+        candidates = None
+        if estimate_tokens(text) <= engine.chunk_max_tokens:
+            candidates = engine.fix_and_rewrite(text)
+        if candidates is None:
+            # Large texts (and failed combined requests) take the chunked per-mode path
+            language = engine.detect_language(text)
+            candidates = {"language": language, "fix": engine.fix(text, language=language),
+                          "rewrite": engine.rewrite(text, language=language)}
+        if not candidates["fix"] or not candidates["rewrite"]:
+            raise RuntimeError("no result from the API")
+        return {"language": candidates["language"], "fix": candidates["fix"],
+                "rewrite": candidates["rewrite"],
+                "changed": candidates["fix"] != text.strip() or candidates["rewrite"] != text.strip()}
+
+    # Detected once and handed to Fix/Rewrite (an "Unknown" answer is not cached)
+    language = engine.detect_language(text)
+    if mode == "detect":
+        return {"language": language, "result": language}
+
+    result = None
+    if mode == "fix" and local_first:
+        local_text, confidence = engine.local_fix_candidate(text)
+        if local_text is not None and confidence >= engine.local_corrector.confidence_threshold:
+            result = local_text
+    if result is None:
+        if mode == "fix":
+            result = engine.fix(text, language=language)
+        else:
+            result = engine.rewrite(text, language=language)
+    if not result:
+        raise RuntimeError("no result from the API")
+    return {"language": language, "result": result, "changed": result != text.strip()}
+
+
+class BatchRunner:
+    """Runs documents through the engine under a concurrency limit and writes records"""
+
+    def __init__(self, engine, mode, output, checkpoint, concurrency=8, local_first=False):
+        self.engine = engine
+        self.mode = mode
+        self.output = output
+        self.checkpoint = checkpoint
+        self.local_first = local_first
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="typofix-batch")
+        # Bounds queued work too, so a large stdin is not read ahead into memory
+        self.slots = threading.BoundedSemaphore(concurrency * 2)
+        self.write_lock = threading.Lock()
+        self.stats = {"done": 0, "failed": 0, "skipped": 0, "characters": 0}
+
+    def run(self, documents):
+        started = time.perf_counter()
+        try:
+            for document_id, text in documents:
+                if document_id in self.checkpoint:
+                    self.stats["skipped"] += 1
+                    continue
+                self.slots.acquire()
+                future = self.executor.submit(self._process, document_id, text)
+                future.add_done_callback(lambda _: self.slots.release())
+        except KeyboardInterrupt:
+            log.warning("Interrupted - finishing documents in progress")
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            self.executor.shutdown(wait=True)
+            self.elapsed = time.perf_counter() - started
+
+    def _process(self, document_id, text):
+        started = time.perf_counter()
+        record = {"id": document_id, "mode": self.mode}
+        try:
+            record.update(correct_document(self.engine, self.mode, text, self.local_first))
+            record["error"] = None
+        except Exception as e:
+            record["error"] = str(e) or type(e).__name__
+        record["seconds"] = round(time.perf_counter() - started, 3)
+
+        with self.write_lock:
+            if record["error"] is not None and self.checkpoint.path:
+                # Retried on resume; an error record now would sit next to the later success
+                log.warning("Document %s failed (retried on resume): %s", document_id, record["error"])
+                self.stats["failed"] += 1
+                return
+            self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.output.flush()
+            if record["error"] is None:
+                # Only after the record is written: a crash here repeats it, never loses it
+                self.checkpoint.add(document_id)
+                self.stats["done"] += 1
+                self.stats["characters"] += len(text)
+            else:
+                self.stats["failed"] += 1
+
+    def summary(self):
+        elapsed = max(getattr(self, "elapsed", 0.0), 1e-9)
+        stats = self.stats
+        return (f"{stats['done']} documents in {elapsed:.1f} s "
+                f"({stats['done'] / elapsed:.2f} docs/s, {stats['characters'] / elapsed:,.0f} chars/s); "
+                f"{stats['failed']} failed, {stats['skipped']} skipped from checkpoint; "
+                f"Gemini requests: {self.engine.in_flight.summary()}")
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", help="files or glob patterns ('-' or nothing for stdin)")
+    parser.add_argument("--mode", choices=MODES, default="fix")
+    unit = parser.add_mutually_exclusive_group()
+    unit.add_argument("--lines", dest="unit", action="store_const", const="lines",
+                      help="treat every non-empty line as a document")
+    unit.add_argument("--jsonl-input", dest="unit", action="store_const", const="jsonl",
+                      help='read {"id", "text"} records, one per line')
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--checkpoint", help="record finished ids here and skip them on resume")
+    parser.add_argument("--concurrency", type=int, default=8, help="documents processed at once")
+    parser.add_argument("--local-first", action="store_true",
+                        help="use confident offline corrections for Fix without calling Gemini")
+    parser.add_argument("--api-key", help="Gemini API key (default: GEMINI_API_KEY)")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--api-base", default=DEFAULT_API_BASE, help=argparse.SUPPRESS)
+    parser.add_argument("-v", "--verbose", action="store_true", help="log progress details to stderr")
+    parser.set_defaults(unit="file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    level = "DEBUG" if args.verbose else os.getenv("TYPOFIX_LOG_LEVEL", "WARNING")
+    setup_logging(default_cache_dir(), level=level)
+
+    if not args.api_key:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
+    api_key = args.api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        sys.stderr.write("No API key: pass --api-key or set GEMINI_API_KEY\n")
+        return 2
+
+    generate_url = f"{args.api_base}/models/{args.model}:generateContent"
+    transport = GeminiTransport(generate_url, pool_size=max(8, args.concurrency))
+    engine = CorrectionEngine(api_key, model=args.model, api_base=args.api_base, transport=transport)
+
+    checkpoint = Checkpoint(args.checkpoint)
+    if args.output:
+        # Resuming appends to the records written before the interruption
+        output = open(args.output, "a" if args.checkpoint else "w", encoding="utf-8")
+    else:
+        output = sys.stdout
+    runner = BatchRunner(engine, args.mode, output, checkpoint, max(1, args.concurrency),
+                         args.local_first)
+    status = 0
+    try:
+        runner.run(read_documents(expand_inputs(args.inputs), args.unit))
+    except KeyboardInterrupt:
+        status = 130
+    finally:
+        sys.stderr.write(runner.summary() + "\n")
+        checkpoint.close()
+        if output is not sys.stdout:
+            output.close()
+        engine.close()
+        shutdown_logging()
+    if status == 0 and runner.stats["failed"]:
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
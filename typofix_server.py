@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Local HTTP correction service
+
+Runs one warm TypoFix engine (pooled Gemini transport, correction cache,
+offline language identifier and corrector, request coalescing) behind a small
+Flask app on localhost, so editors, scripts and browser extensions on the
+machine share it instead of each starting their own.
+
+Endpoints (JSON in, JSON out):
+    POST /fix       {"text": ...} -> {"result", "language", "changed", "seconds"}
+    POST /rewrite   {"text": ...} -> {"result", "language", "changed", "seconds"}
+    POST /detect    {"text": ...} -> {"language", "seconds"}
+    GET  /health    breaker state, queue, cache and Gemini request counters
+
+Requests are handed to a fixed worker pool; when it and its queue are full the
+service answers 503 with Retry-After instead of queueing without bound. Errors
+are {"error": message} with 400 (bad input), 401 (bad token), 403 (non-local Host),
+502 (no result), 503 (overloaded or Gemini unavailable) or 504 (timed out).
+
+Usage:
+    python typofix_server.py [--port 8787] [--workers 8] [--token SECRET]
+    curl -s localhost:8787/fix -H "Content-Type: application/json" -d '{"text": "Teh fox"}'
+
+The API key comes from --api-key or GEMINI_API_KEY (a .env file is read when
+python-dotenv is installed). Requires Flask.
+"""
+
+import argparse
+import hmac
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from correction_cache import default_cache_dir
+from engine import DEFAULT_API_BASE, DEFAULT_MODEL, CorrectionEngine
+from gemini_client import GeminiTransport
+from log import get_logger, setup_logging, shutdown_logging
+from typofix_batch import correct_document
+
+log = get_logger(__name__)
+
+MODES = ("fix", "rewrite", "detect")
+DEFAULT_PORT = 8787
+MAX_TEXT_CHARS = 100_000
+LOOPBACK_ADDRESSES = ("127.0.0.1", "localhost", "::1")
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+
+
+class ServiceError(Exception):
+    """A request that cannot be answered, with its HTTP status"""
+
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CorrectionService:
+    """A CorrectionEngine behind a bounded worker pool, shared by all HTTP requests"""
+
+    def __init__(self, engine, workers=8, max_pending=None, request_timeout=60.0, local_first=False):
+        self.engine = engine
+        self.request_timeout = request_timeout
+        self.local_first = local_first
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="typofix-server")
+        # Running plus queued requests; beyond this, callers are told to back off
+        self.capacity = max_pending or workers * 4
+        self.slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.stats = {"answered": 0, "rejected": 0, "timed_out": 0, "failed": 0}
+
+    def correct(self, mode, text):
+        """Run one request on the pool and wait for it; raises ServiceError"""
+        if not self.slots.acquire(blocking=False):
+            self._count("rejected")
+            raise ServiceError(503, "server busy", retry_after=1)
+        started = time.perf_counter()
+        future = self.executor.submit(correct_document, self.engine, mode, text, self.local_first)
+        # A timed-out request keeps its slot until the engine call actually finishes
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            record = future.result(timeout=self.request_timeout)
+        except FutureTimeoutError:
+            self._count("timed_out")
+            raise ServiceError(504, "correction timed out")
+        except RuntimeError as e:
+            self._count("failed")
+            if not self.engine.available():
+                retry_in = self.engine.transport.breaker.retry_in()
+                raise ServiceError(503, "Gemini is unavailable", retry_after=max(1, math.ceil(retry_in)))
+            raise ServiceError(502, str(e))
+        self._count("answered")
+        if mode == "detect":
+            record = {"language": record["language"]}
+        record["seconds"] = round(time.perf_counter() - started, 3)
+        return record
+
+    def health(self):
+        engine = self.engine
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            "status": "ok" if engine.available() else "degraded",
+            "breaker": engine.transport.breaker.state,
+            "capacity": self.capacity,
+            "in_flight": engine.in_flight.in_flight(),
+            "requests": stats,
+            "gemini": dict(engine.in_flight.stats),
+            "cache": {"hits": engine.cache.hits, "misses": engine.cache.misses},
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+
+def _read_text(request):
+    # Only JSON bodies are accepted: a web page cannot send one cross-origin without
+    # a CORS preflight, which this service never approves
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        raise ServiceError(400, 'expected a JSON object like {"text": ...}')
+    text = body.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise ServiceError(400, '"text" must be a non-empty string')
+    if len(text) > MAX_TEXT_CHARS:
+        raise ServiceError(400, f'"text" is longer than {MAX_TEXT_CHARS} characters')
+    return text
+
+
+def create_app(service, token=None, local_only=True):
+    """
+    Flask app exposing the service.
+
+    ``token`` enables bearer authentication; ``local_only`` rejects requests
+    whose Host header is not a loopback name.
+    """
+    from flask import Flask, jsonify, request
+
+    app = Flask("typofix")
+    app.config["MAX_CONTENT_LENGTH"] = MAX_TEXT_CHARS * 4 + 1024
+
+    def error_response(error):
+        response = jsonify(error=str(error))
+        response.status_code = error.status
+        if error.retry_after is not None:
+            response.headers["Retry-After"] = str(error.retry_after)
+        return response
+
+    app.register_error_handler(ServiceError, error_response)
+
+    @app.before_request
+    def check_caller():
+        # Host check defeats DNS rebinding from web pages that resolve to 127.0.0.1
+        host = request.host
+        if not host.endswith("]"):
+            host = host.rsplit(":", 1)[0]
+        if local_only and host not in LOCAL_HOSTS:
+            raise ServiceError(403, "only local requests are served")
+        if token is not None:
+            supplied = request.headers.get("Authorization", "")
+            if not hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+                raise ServiceError(401, "missing or wrong bearer token")
+
+    def endpoint(mode):
+        def handle():
+            return jsonify(service.correct(mode, _read_text(request)))
+        handle.__name__ = mode
+        return handle
+
+    for mode in MODES:
+        app.add_url_rule(f"/{mode}", view_func=endpoint(mode), methods=["POST"])
+
+    @app.get("/health")
+    def health():
+        return jsonify(service.health())
+
+    return app
+
+
+def make_server(service, host="127.0.0.1", port=DEFAULT_PORT, token=None):
+    """Threaded WSGI server for the app; port 0 picks a free port (see ``server.port``)"""
+    from werkzeug.serving import WSGIRequestHandler
+    from werkzeug.serving import make_server as make_wsgi_server
+
+    class RequestHandler(WSGIRequestHandler):
+        # Access lines go to the TypoFix log at debug level, not to stderr
+        def log_request(self, code="-", size="-"):
+            log.debug("%s %s -> %s", self.command, self.path, code)
+
+    app = create_app(service, token, local_only=host in LOOPBACK_ADDRESSES)
+    return make_wsgi_server(host, port, app, threaded=True, request_handler=RequestHandler)
+
+
+def build_engine(api_key, model=DEFAULT_MODEL, api_base=DEFAULT_API_BASE, workers=8, cache=None):
+    """Engine with a transport pool sized for the worker pool, warmed up before serving"""
+    transport = GeminiTransport(f"{api_base}/models/{model}:generateContent", pool_size=max(8, workers))
+    transport.start()
+    return CorrectionEngine(api_key, model=model, api_base=api_base, transport=transport, cache=cache)
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: loopback only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=8, help="requests corrected at once")
+    parser.add_argument("--max-pending", type=int, help="running plus queued requests (default: 4 x workers)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a request gets 504")
+    parser.add_argument("--token", default=os.getenv("TYPOFIX_SERVER_TOKEN"),
+                        help="require 'Authorization: Bearer TOKEN' (default: TYPOFIX_SERVER_TOKEN)")
+    parser.add_argument("--local-first", action="store_true",
+                        help="use confident offline corrections for Fix without calling Gemini")
+    parser.add_argument("--api-key", help="Gemini API key (default: GEMINI_API_KEY)")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--api-base", default=DEFAULT_API_BASE, help=argparse.SUPPRESS)
+    parser.add_argument("-v", "--verbose", action="store_true", help="log request details to stderr")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    level = "DEBUG" if args.verbose else os.getenv("TYPOFIX_LOG_LEVEL", "WARNING")
+    setup_logging(default_cache_dir(), level=level)
+
+    if not args.api_key:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass
+    api_key = args.api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        sys.stderr.write("No API key: pass --api-key or set GEMINI_API_KEY\n")
+        return 2
+    if args.host not in LOOPBACK_ADDRESSES:
+        sys.stderr.write(f"Warning: serving on {args.host}, not only on this machine\n")
+
+    workers = max(1, args.workers)
+    engine = build_engine(api_key, args.model, args.api_base, workers)
+    service = CorrectionService(engine, workers, args.max_pending, args.timeout, args.local_first)
+    try:
+        server = make_server(service, args.host, args.port, args.token)
+    except (ImportError, OSError) as e:
+        service.close()
+        engine.close()
+        if isinstance(e, ImportError):
+            sys.stderr.write("The server needs Flask: pip install flask\n")
+            return 2
+        sys.stderr.write(f"Cannot listen on {args.host}:{args.port}: {e}\n")
+        return 1
+
+    sys.stderr.write(f"TypoFix server listening on http://{args.host}:{server.port} "
+                     f"({workers} workers)\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        sys.stderr.write(f"Gemini requests: {engine.in_flight.summary()}\n")
+        engine.close()
+        shutdown_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Tk widgets used by TypoFix's floating UI
+"""
+
+import tkinter as tk
+
+
+class RoundedButton:
+    """
+    Canvas-drawn rounded button.
+
+    The shape is drawn once; hover and text changes only recolour or retext the
+    existing canvas items with itemconfigure, so a state change costs a handful
+    of Tk calls instead of rebuilding ~20 items.
+    """
+
+    def __init__(self, parent, text, command, bg_color, hover_color, text_color='white', width=80, height=35, corner_radius=8):
+        self.parent = parent
+        self.text = text
+        self.command = command
+        self.bg_color = bg_color
+        self.hover_color = hover_color
+        self.text_color = text_color
+        self.width = width
+        self.height = height
+        self.corner_radius = corner_radius
+        self.is_hovered = False
+        self.enabled = True
+
+        # Colours for both states are computed once
+        self.border_color = self._darken_color(bg_color, 0.2)
+        self.hover_border_color = self._darken_color(hover_color, 0.2)
+        self._drawn_hover = None
+
+        self.canvas = tk.Canvas(parent, width=width + 4, height=height + 4,
+                               highlightthickness=0, relief='flat', borderwidth=0)
+        # Try to match parent's transparent background
+        try:
+            self.canvas.configure(bg='black')
+        except:
+            self.canvas.configure(bg=parent.cget('bg'))
+
+        # Draw the button
+        self.draw_button()
+
+        # Bind events
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<Enter>', self.on_enter)
+        self.canvas.bind('<Leave>', self.on_leave)
+
+    def draw_button(self):
+        """Create all canvas items (once) and apply the current state"""
+        self.canvas.delete("all")
+        self._create_items()
+        self._drawn_hover = None
+        self._apply_state()
+
+    def _create_items(self):
+        # Button coordinates (leaving space for shadow)
+        x1, y1 = 2, 2
+        x2, y2 = self.width, self.height
+        r = self.corner_radius
+
+        # Shadow, hidden while hovered - make it more subtle
+        shadow_offset = 1
+        sx1, sy1 = x1 + shadow_offset, y1 + shadow_offset
+        sx2, sy2 = x2 + shadow_offset, y2 + shadow_offset
+        shadow_color = '#000000'  # Pure black for better contrast
+
+        # Shadow rectangles
+        self.canvas.create_rectangle(sx1 + r, sy1, sx2 - r, sy2, fill=shadow_color, outline='', width=0, tags='shadow')
+        self.canvas.create_rectangle(sx1, sy1 + r, sx2, sy2 - r, fill=shadow_color, outline='', width=0, tags='shadow')
+
+        # Shadow corners - use smaller radius for tighter shadow
+        shadow_r = r - 1
+        self.canvas.create_oval(sx1, sy1, sx1 + 2*shadow_r, sy1 + 2*shadow_r, fill=shadow_color, outline='', width=0, tags='shadow')
+        self.canvas.create_oval(sx2 - 2*shadow_r, sy1, sx2, sy1 + 2*shadow_r, fill=shadow_color, outline='', width=0, tags='shadow')
+        self.canvas.create_oval(sx1, sy2 - 2*shadow_r, sx1 + 2*shadow_r, sy2, fill=shadow_color, outline='', width=0, tags='shadow')
+        self.canvas.create_oval(sx2 - 2*shadow_r, sy2 - 2*shadow_r, sx2, sy2, fill=shadow_color, outline='', width=0, tags='shadow')
+
+        # Draw main button with anti-aliasing effect using multiple layers
+        # Base layer
+        self.canvas.create_rectangle(x1 + r, y1, x2 - r, y2, outline='', width=0, tags='body')
+        self.canvas.create_rectangle(x1, y1 + r, x2, y2 - r, outline='', width=0, tags='body')
+
+        # Perfect rounded corners using ovals
+        self.canvas.create_oval(x1, y1, x1 + 2*r, y1 + 2*r, outline='', width=0, tags='body')
+        self.canvas.create_oval(x2 - 2*r, y1, x2, y1 + 2*r, outline='', width=0, tags='body')
+        self.canvas.create_oval(x1, y2 - 2*r, x1 + 2*r, y2, outline='', width=0, tags='body')
+        self.canvas.create_oval(x2 - 2*r, y2 - 2*r, x2, y2, outline='', width=0, tags='body')
+
+        # Add subtle border for definition
+        border_width = 1
+
+        # Border rectangles
+        self.canvas.create_rectangle(x1 + r, y1, x2 - r, y1 + border_width, outline='', tags='border')
+        self.canvas.create_rectangle(x1 + r, y2 - border_width, x2 - r, y2, outline='', tags='border')
+        self.canvas.create_rectangle(x1, y1 + r, x1 + border_width, y2 - r, outline='', tags='border')
+        self.canvas.create_rectangle(x2 - border_width, y1 + r, x2, y2 - r, outline='', tags='border')
+
+        # Add text with better positioning
+        text_x = (x1 + x2) // 2
+        text_y = (y1 + y2) // 2
+
+        # Use better font with anti-aliasing
+        self.canvas.create_text(text_x, text_y, text=self.text,
+                               fill=self.text_color, font=('Segoe UI', 9, 'bold'), anchor='center',
+                               tags='label')
+
+    def _apply_state(self):
+        """Recolour the existing items for the hover state; no-op if already drawn that way"""
+        if self._drawn_hover is self.is_hovered:
+            return
+        if self.is_hovered:
+            self.canvas.itemconfigure('body', fill=self.hover_color)
+            self.canvas.itemconfigure('border', fill=self.hover_border_color)
+            self.canvas.itemconfigure('shadow', state='hidden')
+        else:
+            self.canvas.itemconfigure('body', fill=self.bg_color)
+            self.canvas.itemconfigure('border', fill=self.border_color)
+            self.canvas.itemconfigure('shadow', state='normal')
+        self._drawn_hover = self.is_hovered
+
+    def _darken_color(self, color, factor):
+        """Darken a hex color by a given factor"""
+        if color.startswith('#'):
+            color = color[1:]
+
+        r = int(color[0:2], 16)
+        g = int(color[2:4], 16)
+        b = int(color[4:6], 16)
+
+        r = max(0, int(r * (1 - factor)))
+        g = max(0, int(g * (1 - factor)))
+        b = max(0, int(b * (1 - factor)))
+
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self.canvas.itemconfigure('label', text=text)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.canvas.configure(cursor='hand2' if enabled and self.is_hovered else '')
+
+    def reset(self, text=None):
+        """Back to the idle state (enabled, not hovered) before the widget is reused"""
+        self.is_hovered = False
+        self.enabled = True
+        self.canvas.configure(cursor='')
+        if text is not None:
+            self.set_text(text)
+        self._apply_state()
+
+    def on_click(self, event):
+        if self.command and self.enabled:
+            self.command()
+
+    def on_enter(self, event):
+        self.is_hovered = True
+        self._apply_state()
+        if self.enabled:
+            self.canvas.configure(cursor='hand2')
+
+    def on_leave(self, event):
+        self.is_hovered = False
+        self._apply_state()
+        self.canvas.configure(cursor='')
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)